@@ -7,14 +7,37 @@ load_dotenv()
 
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/agentic_interviewer")
 
+# Connection pool / timeout tuning
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "5")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+    "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000")),
+    "retryWrites": os.getenv("MONGO_RETRY_WRITES", "true").lower() in ("1", "true", "yes"),
+}
+
+def create_client(uri: str = MONGODB_URI):
+    """
+    Build the Motor client. A `mongomock://` URI gives an in-process
+    stand-in (requires mongomock-motor) for local runs without a mongod.
+    """
+    if uri.startswith("mongomock://"):
+        from mongomock_motor import AsyncMongoMockClient
+        return AsyncMongoMockClient("mongodb://" + uri[len("mongomock://"):])
+    from app.services.metrics import METRICS_ENABLED, MongoCommandMetrics
+    listeners = [MongoCommandMetrics()] if METRICS_ENABLED else []
+    return AsyncIOMotorClient(uri, event_listeners=listeners, **MONGO_CLIENT_OPTIONS)
+
 class Database:
     client: AsyncIOMotorClient = None
     
     @classmethod
-    async def connect_db(cls):
-        """Connect to MongoDB"""
+    async def connect_db(cls, client=None):
+        """Connect to MongoDB (or adopt an already-built client)"""
         try:
-            cls.client = AsyncIOMotorClient(MONGODB_URI)
+            cls.client = client or create_client(MONGODB_URI)
             # Test connection
             await cls.client.admin.command('ping')
             print(f"✅ Connected to MongoDB: {MONGODB_URI}")
@@ -44,3 +67,15 @@ def get_candidates_collection():
 def get_interviews_collection():
     db = Database.get_database()
     return db["interviews"]
+
+def get_quiz_cache_collection():
+    db = Database.get_database()
+    return db["quiz_cache"]
+
+def get_quiz_items_collection():
+    db = Database.get_database()
+    return db["quiz_items"]
+
+def get_ingest_jobs_collection():
+    db = Database.get_database()
+    return db["ingest_jobs"]
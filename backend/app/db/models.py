@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from bson import ObjectId
 
@@ -22,6 +22,7 @@ class CandidateModel(BaseModel):
     domain: str
     resume_text: str
     resume_hash: str
+    skills: List[str] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
@@ -29,15 +30,29 @@ class CandidateModel(BaseModel):
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
 
+class EmotionStats(BaseModel):
+    n: int
+    min: float
+    mean: float
+    max: float
+
+class EmotionWindow(BaseModel):
+    """Downsampled emotion samples for one fixed time window (t = window start, epoch seconds)."""
+    t: float
+    labels: Dict[str, EmotionStats]
+
 class InterviewSessionModel(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
-    candidate_id: str
+    # Unset until the session is linked to a real candidate
+    candidate_id: Optional[str] = None
+    session_id: Optional[str] = None
     quiz_score: Optional[float] = None
     quiz_answers: Optional[list] = None
     interview_transcript: list = []
-    emotion_data: list = []
+    emotion_data: List[EmotionWindow] = []
     final_score: Optional[float] = None
     report: Optional[dict] = None
+    rolling_summary: Optional[dict] = None
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     
@@ -0,0 +1,352 @@
+from typing import Optional
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from datetime import datetime, timedelta
+from app.db.config import get_candidates_collection, get_interviews_collection, get_quiz_items_collection, get_ingest_jobs_collection
+
+# Fields returned by list/summary reads; resume_text is only fetched on demand
+CANDIDATE_SUMMARY = {"name": 1, "email": 1, "role": 1, "domain": 1, "resume_hash": 1, "created_at": 1}
+# Interview summaries leave out the unbounded transcript / emotion arrays
+INTERVIEW_SUMMARY = {"interview_transcript": 0, "emotion_data": 0}
+
+INDEXES = {
+    "candidates": [
+        # One candidate per resume file per role/domain; repeat uploads reuse it
+        ([("resume_hash", ASCENDING), ("role", ASCENDING), ("domain", ASCENDING)],
+         {"unique": True, "name": "resume_hash_role_domain_unique"}),
+        ([("role", ASCENDING), ("domain", ASCENDING), ("_id", DESCENDING)], {"name": "role_domain_id"}),
+        ([("created_at", DESCENDING)], {"name": "created_at"}),
+    ],
+    "interviews": [
+        ([("session_id", ASCENDING)], {"unique": True, "sparse": True, "name": "session_id_unique"}),
+        ([("candidate_id", ASCENDING), ("started_at", DESCENDING)], {"name": "candidate_started_at"}),
+    ],
+    "quiz_items": [
+        ([("domain", ASCENDING), ("skill", ASCENDING), ("difficulty", ASCENDING)], {"name": "domain_skill_difficulty"}),
+    ],
+}
+
+class DuplicateDataError(RuntimeError):
+    """A unique index cannot be built because the collection already holds duplicates."""
+
+
+async def ensure_indexes():
+    """
+    Create the indexes the API relies on (idempotent). A unique index that
+    existing duplicates prevent is fatal: without it the insert races it
+    guards against go undetected. Run dedupe_candidates.py, then restart.
+    """
+    collections = {
+        "candidates": get_candidates_collection,
+        "interviews": get_interviews_collection,
+        "quiz_items": get_quiz_items_collection,
+    }
+    for name, specs in INDEXES.items():
+        collection = collections[name]()
+        for keys, options in specs:
+            try:
+                await collection.create_index(keys, **options)
+            except OperationFailure as e:
+                if options.get("unique") and e.code == 11000:
+                    hint = (" Run python dedupe_candidates.py --dry-run to review them, then without --dry-run."
+                            if name == "candidates" else "")
+                    raise DuplicateDataError(
+                        f"Unique index {name}.{options['name']} cannot be built: the collection holds duplicates ({e}).{hint}"
+                    ) from e
+                print(f"⚠️ Could not create index {name}.{options['name']}: {e}")
+            except Exception as e:
+                print(f"⚠️ Could not create index {name}.{options['name']}: {e}")
+
+def _object_id(value) -> Optional[ObjectId]:
+    if isinstance(value, ObjectId):
+        return value
+    return ObjectId(value) if value and ObjectId.is_valid(value) else None
+
+def _stringify_id(doc: dict) -> dict:
+    doc["_id"] = str(doc["_id"])
+    return doc
+
+class CandidateRepository:
+    """Reads and writes on the candidates collection with narrow projections."""
+
+    @property
+    def collection(self):
+        return get_candidates_collection()
+
+    async def get(self, candidate_id, include_resume: bool = False) -> Optional[dict]:
+        oid = _object_id(candidate_id)
+        if oid is None:
+            return None
+        projection = None if include_resume else CANDIDATE_SUMMARY
+        return await self.collection.find_one({"_id": oid}, projection)
+
+    async def get_many(self, candidate_ids: list, projection: dict = None) -> dict:
+        """Returns {candidate_id: doc} for the given ids in one round trip."""
+        ids = [oid for oid in map(_object_id, candidate_ids) if oid is not None]
+        if not ids:
+            return {}
+        cursor = self.collection.find({"_id": {"$in": ids}}, projection or CANDIDATE_SUMMARY)
+        return {str(doc.pop("_id")): doc async for doc in cursor}
+
+    async def find_by_hash(self, resume_hash: str, role: str, domain: str) -> Optional[dict]:
+        return await self.collection.find_one(
+            {"resume_hash": resume_hash, "role": role, "domain": domain},
+            {"_id": 1}
+        )
+
+    async def resume_text_by_hash(self, resume_hash: str) -> Optional[str]:
+        """Extracted text of this resume file from any role/domain it was stored under."""
+        doc = await self.collection.find_one({"resume_hash": resume_hash}, {"resume_text": 1, "_id": 0})
+        return (doc or {}).get("resume_text")
+
+    async def existing_hashes(self, resume_hashes: list, role: str, domain: str) -> set:
+        """Which of these resume hashes are already stored for role/domain (one indexed query)."""
+        if not resume_hashes:
+            return set()
+        cursor = self.collection.find(
+            {"resume_hash": {"$in": list(resume_hashes)}, "role": role, "domain": domain},
+            {"resume_hash": 1, "_id": 0},
+        )
+        return {doc["resume_hash"] async for doc in cursor}
+
+    async def list(self, role: str = None, domain: str = None, limit: int = 50, after: str = None) -> dict:
+        """
+        Newest-first page of candidate summaries. Pass the returned
+        next_cursor as `after` for the next page (keyset on _id, no skip).
+        """
+        query = {}
+        if role:
+            query["role"] = role
+        if domain:
+            query["domain"] = domain
+        cursor_id = _object_id(after)
+        if cursor_id is not None:
+            query["_id"] = {"$lt": cursor_id}
+
+        cursor = self.collection.find(query, CANDIDATE_SUMMARY).sort("_id", DESCENDING).limit(limit + 1)
+        items = [_stringify_id(doc) async for doc in cursor]
+        next_cursor = items[limit - 1]["_id"] if len(items) > limit else None
+        return {"items": items[:limit], "next_cursor": next_cursor}
+
+    async def insert(self, doc: dict) -> str:
+        result = await self.collection.insert_one(doc)
+        return str(result.inserted_id)
+
+    async def duplicates(self) -> list:
+        """
+        Groups of candidates sharing resume_hash/role/domain (stored before the
+        unique index existed): [{"keep": oldest id, "remove": [other ids]}].
+        """
+        cursor = self.collection.aggregate([
+            {"$sort": {"_id": ASCENDING}},
+            {"$group": {"_id": {"resume_hash": "$resume_hash", "role": "$role", "domain": "$domain"},
+                        "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ], allowDiskUse=True)
+        return [{"keep": group["ids"][0], "remove": group["ids"][1:]} async for group in cursor]
+
+    async def remove_duplicates(self, groups: list) -> int:
+        """Deletes the extra candidates of each group, repointing their interviews at the kept one."""
+        removed = 0
+        for group in groups:
+            keep, remove = str(group["keep"]), group["remove"]
+            await get_interviews_collection().update_many(
+                {"candidate_id": {"$in": [str(oid) for oid in remove]}}, {"$set": {"candidate_id": keep}}
+            )
+            result = await self.collection.delete_many({"_id": {"$in": remove}})
+            removed += result.deleted_count
+        return removed
+
+    async def insert_many(self, docs: list) -> dict:
+        """
+        Unordered bulk insert. Duplicates (same resume/role/domain) are
+        skipped rather than failing the whole batch.
+        """
+        if not docs:
+            return {"inserted_ids": [], "duplicates": 0}
+        try:
+            result = await self.collection.insert_many(docs, ordered=False)
+            return {"inserted_ids": [str(i) for i in result.inserted_ids], "duplicates": 0}
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            failed = {err["index"] for err in errors}
+            # insert_many assigns _id client-side, so the survivors are known
+            inserted = [str(doc["_id"]) for i, doc in enumerate(docs) if i not in failed]
+            return {"inserted_ids": inserted, "duplicates": len(failed)}
+
+class InterviewRepository:
+    """Reads and writes on the interviews collection; transcripts are sliced, never pulled whole."""
+
+    @property
+    def collection(self):
+        return get_interviews_collection()
+
+    async def get(self, session_id: str, last_messages: int = 50) -> Optional[dict]:
+        projection = {"_id": 0, "emotion_data": 0}
+        if last_messages is not None:
+            # $slice with exclusions keeps every other field except the emotion windows
+            projection["interview_transcript"] = {"$slice": -last_messages}
+        return await self.collection.find_one({"session_id": session_id}, projection)
+
+    async def get_transcript(self, session_id: str, last_messages: int) -> list:
+        doc = await self.collection.find_one(
+            {"session_id": session_id},
+            {"interview_transcript": {"$slice": -last_messages}, "_id": 0},
+        )
+        return (doc or {}).get("interview_transcript") or []
+
+    async def list_for_candidate(self, candidate_id: str, limit: int = 20) -> list:
+        cursor = (
+            self.collection.find({"candidate_id": candidate_id}, INTERVIEW_SUMMARY)
+            .sort("started_at", DESCENDING)
+            .limit(limit)
+        )
+        return [_stringify_id(doc) async for doc in cursor]
+
+    async def append_transcripts(self, pending: dict):
+        """Appends {session_id: [messages]} for many sessions in one bulk_write."""
+        if not pending:
+            return
+        ops = [
+            UpdateOne(
+                {"session_id": session_id},
+                {
+                    "$push": {"interview_transcript": {"$each": messages}},
+                    "$setOnInsert": {"session_id": session_id},
+                },
+                upsert=True,
+            )
+            for session_id, messages in pending.items()
+        ]
+        await self.collection.bulk_write(ops, ordered=False)
+
+    async def append_emotion_windows(self, pending: dict):
+        """Appends {session_id: [emotion windows]} for many sessions in one bulk_write."""
+        if not pending:
+            return
+        ops = [
+            UpdateOne(
+                {"session_id": session_id},
+                {
+                    "$push": {"emotion_data": {"$each": windows}},
+                    "$setOnInsert": {"session_id": session_id},
+                },
+                upsert=True,
+            )
+            for session_id, windows in pending.items()
+        ]
+        await self.collection.bulk_write(ops, ordered=False)
+
+    async def get_emotion_windows(self, session_id: str) -> list:
+        doc = await self.collection.find_one({"session_id": session_id}, {"_id": 0, "emotion_data": 1})
+        return (doc or {}).get("emotion_data") or []
+
+    async def set_report(self, session_id: str, report: dict):
+        await self.collection.update_one(
+            {"session_id": session_id},
+            {"$set": {"report": report}},
+            upsert=True,
+        )
+
+    async def get_report_state(self, session_id: str) -> Optional[dict]:
+        return await self.collection.find_one(
+            {"session_id": session_id},
+            {"_id": 0, "report": 1, "rolling_summary": 1}
+        )
+
+    async def set_report_state(self, session_id: str, rolling_summary: dict, report: dict = None):
+        await self.collection.update_one(
+            {"session_id": session_id},
+            {
+                "$set": {"rolling_summary": rolling_summary, "report": report},
+            },
+            upsert=True,
+        )
+
+class QuizItemRepository:
+    """Question bank on the quiz_items collection, keyed by content hash and indexed by domain/skill/difficulty."""
+    PROJECTION = {"question": 1, "options": 1, "correct_index": 1, "skill": 1, "difficulty": 1}
+
+    @property
+    def collection(self):
+        return get_quiz_items_collection()
+
+    async def find(self, domain: str, skill: str, limit: int, difficulty: str = None, sample: bool = False) -> list:
+        """
+        Up to `limit` questions for a domain/skill (and difficulty). With
+        `sample`, a random draw from every match instead of the first ones.
+        """
+        query = {"domain": domain, "skill": skill}
+        if difficulty:
+            query["difficulty"] = difficulty
+        if sample:
+            cursor = self.collection.aggregate(
+                [{"$match": query}, {"$sample": {"size": limit}}, {"$project": self.PROJECTION}]
+            )
+        else:
+            cursor = self.collection.find(query, self.PROJECTION).limit(limit)
+        return [doc async for doc in cursor]
+
+    async def insert_many(self, items: list) -> int:
+        """Unordered insert; questions already in the bank (same _id) are skipped. Returns how many were added."""
+        if not items:
+            return 0
+        try:
+            result = await self.collection.insert_many(items, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            return len(items) - len(errors)
+
+class IngestJobRepository:
+    """
+    Checkpoints of bulk ingestion jobs. A running job is owned through a
+    lease that its process renews at every checkpoint; a job whose lease
+    ran out (crashed process) can be claimed and resumed by another.
+    """
+
+    @property
+    def collection(self):
+        return get_ingest_jobs_collection()
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": job_id})
+
+    async def create(self, doc: dict, owner: str, lease_seconds: float):
+        doc = {**doc, "owner": owner, "lease_until": datetime.utcnow() + timedelta(seconds=lease_seconds)}
+        await self.collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+
+    async def claim(self, job_id: str, owner: str, lease_seconds: float) -> Optional[dict]:
+        """Takes over a job that is not finished and whose lease has expired."""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"_id": job_id, "status": {"$ne": "completed"},
+             "$or": [{"lease_until": {"$lt": now}}, {"lease_until": None}, {"owner": owner}]},
+            {"$set": {"owner": owner, "lease_until": now + timedelta(seconds=lease_seconds), "status": "running"}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def checkpoint(self, job_id: str, owner: str, fields: dict, lease_seconds: float) -> bool:
+        """Saves progress and renews the lease; False if another process owns the job now."""
+        result = await self.collection.update_one(
+            {"_id": job_id, "owner": owner},
+            {"$set": {**fields, "lease_until": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+        )
+        return result.matched_count == 1
+
+    async def orphaned(self) -> list:
+        """Running jobs whose owner stopped renewing the lease."""
+        cursor = self.collection.find(
+            {"status": "running", "lease_until": {"$lt": datetime.utcnow()}}, {"_id": 1}
+        )
+        return [doc["_id"] async for doc in cursor]
+
+candidates = CandidateRepository()
+interviews = InterviewRepository()
+quiz_items = QuizItemRepository()
+ingest_jobs = IngestJobRepository()
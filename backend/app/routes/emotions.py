@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from app.services.emotion_telemetry import emotion_telemetry
+
+router = APIRouter()
+
+class EmotionBatch(BaseModel):
+    """Columnar batch of samples: timestamps (epoch seconds), labels and scores line up by index."""
+    session_id: str
+    timestamps: List[float] = Field(..., max_length=5000)
+    labels: List[str] = Field(..., max_length=5000)
+    scores: List[float] = Field(..., max_length=5000)
+
+class EmotionBatchResponse(BaseModel):
+    accepted: int
+    dropped: int
+
+class EmotionTimelinePoint(BaseModel):
+    t: float
+    labels: Dict[str, Dict[str, float]]
+
+class EmotionTimelineResponse(BaseModel):
+    session_id: str
+    resolution_seconds: float
+    timeline: List[EmotionTimelinePoint]
+    summary: Dict[str, Dict[str, float]]
+    samples: int
+
+@router.post("/api/emotions/batch", response_model=EmotionBatchResponse, status_code=202)
+async def ingest_emotions(batch: EmotionBatch):
+    """
+    Buffer a batch of emotion samples; they are downsampled and written to Mongo in the background.
+    """
+    if not (len(batch.timestamps) == len(batch.labels) == len(batch.scores)):
+        raise HTTPException(status_code=422, detail="timestamps, labels and scores must have the same length")
+    try:
+        accepted = emotion_telemetry.add(batch.session_id, batch.timestamps, batch.labels, batch.scores)
+        return EmotionBatchResponse(accepted=accepted, dropped=len(batch.timestamps) - accepted)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Emotion ingestion failed: {str(e)}")
+
+@router.get("/api/emotions/{session_id}", response_model=EmotionTimelineResponse)
+async def get_emotion_timeline(session_id: str, resolution: Optional[float] = Query(None, gt=0, le=3600)):
+    """
+    Aggregated emotion timeline (count/min/mean/max per label per window) and per-label totals.
+    """
+    try:
+        return await emotion_telemetry.timeline(session_id, resolution)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Emotion timeline failed: {str(e)}")
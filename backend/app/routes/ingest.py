@@ -0,0 +1,72 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse
+import hashlib
+import os
+import uuid
+import zipfile
+from app.services.ingestion import ingestion_manager
+
+router = APIRouter()
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+async def _spool(file: UploadFile) -> str:
+    """
+    Streams the upload to the spool directory, named by its content hash so
+    the same archive maps to the same job (a re-upload resumes or returns it).
+    """
+    limit = ingestion_manager.max_upload_bytes
+    if file.size is not None and file.size > limit:
+        raise HTTPException(status_code=413, detail=f"Archive exceeds the {limit // (1024 * 1024)} MB upload limit")
+    os.makedirs(ingestion_manager.spool_dir, exist_ok=True)
+    partial = os.path.join(ingestion_manager.spool_dir, f"{uuid.uuid4().hex}.part")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise HTTPException(status_code=413, detail=f"Archive exceeds the {limit // (1024 * 1024)} MB upload limit")
+                hasher.update(chunk)
+                out.write(chunk)
+        if not zipfile.is_zipfile(partial):
+            raise HTTPException(status_code=400, detail="Upload must be a ZIP archive of resumes")
+        path = os.path.join(ingestion_manager.spool_dir, f"{hasher.hexdigest()}.zip")
+        os.replace(partial, path)
+        return path
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+@router.post("/api/recruiter/ingest", status_code=202)
+async def ingest_resumes(
+    role: str = Form(...),
+    domain: str = Form(...),
+    file: UploadFile = File(...)
+):
+    """
+    Bulk-import a ZIP of resumes (.txt/.md/.pdf/.docx) for a role/domain.
+    Returns 202 with the job's progress; poll GET /api/recruiter/ingest/{job_id}.
+    """
+    path = await _spool(file)
+    try:
+        progress = await ingestion_manager.submit(path, role, domain)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ingestion failed to start: {str(e)}")
+    return JSONResponse(status_code=202, content=progress)
+
+@router.get("/api/recruiter/ingest/{job_id}")
+async def get_ingest_job(job_id: str):
+    """
+    Progress of a bulk import: counts per outcome, files/second, ETA and stage queue depths.
+    """
+    try:
+        progress = await ingestion_manager.get(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ingest job lookup failed: {str(e)}")
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return progress
@@ -1,6 +1,10 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.models import InteractionRequest, AIResponse
 from app.services.langchain_service import InterviewAgent
+from app.services.streaming import sse_event
+from app.services.jobs import job_queue, QueueFullError, SUCCEEDED
+from app.services.emotion_telemetry import emotion_telemetry
 
 router = APIRouter()
 
@@ -15,7 +19,8 @@ async def interact(request: InteractionRequest):
     try:
         response_text = await agent.generate_response(
             request.transcript, 
-            request.emotion_label
+            request.emotion_label,
+            request.session_id
         )
         
         return AIResponse(
@@ -26,10 +31,61 @@ async def interact(request: InteractionRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/interact/stream")
+async def interact_stream(request: InteractionRequest):
+    """
+    Streaming variant of /interact (Server-Sent Events).
+    Emits `token` events as the LLM produces text, `sentence` events at sentence
+    boundaries (for early TTS), and a final `done` (or `error`) event.
+    """
+    async def event_stream():
+        async for event, data in agent.stream_response(
+            request.transcript,
+            request.emotion_label,
+            request.session_id
+        ):
+            yield sse_event(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def build_report(session_id: str) -> dict:
+    """Job handler: final interview report for a session, with its emotion timeline."""
+    report = await agent.generate_report(session_id)
+    emotions = await emotion_telemetry.timeline(session_id, resolution=60)
+    return {"report": report, "emotions": emotions}
+
+job_queue.register("report", build_report)
+
+async def _submit_report(session_id: str):
+    return await job_queue.submit("report", {"session_id": session_id}, key=session_id)
+
 @router.post("/report/{session_id}")
 async def generate_report(session_id: str):
     try:
-        report = await agent.generate_report(session_id)
-        return {"report": report}
+        job = await job_queue.wait(await _submit_report(session_id))
+        if job.status != SUCCEEDED:
+            raise HTTPException(status_code=500, detail=job.error or "Report generation did not finish")
+        return job.result
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/report/{session_id}/jobs", status_code=202)
+async def submit_report_job(session_id: str):
+    """
+    Queue report generation and return immediately; poll GET /api/jobs/{job_id}.
+    """
+    try:
+        job = await _submit_report(session_id)
+        return {"job_id": job.id, "status": job.status}
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+from app.services.jobs import job_queue
+
+router = APIRouter()
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+@router.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    Status of a background job (queued / running / succeeded / failed) and its result once done.
+    """
+    try:
+        job = await job_queue.get(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Job lookup failed: {str(e)}")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return JobStatusResponse(**job.public())
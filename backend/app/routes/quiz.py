@@ -1,10 +1,19 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List
 from app.services.langchain_service import InterviewAgent
+from app.services.quiz_cache import quiz_cache
+from app.services.jobs import job_queue, QueueFullError, SUCCEEDED
+from app.services.streaming import sse_event
 
 router = APIRouter()
 
+QUIZ_QUESTIONS = 10
+
+# Shared agent: reuses the pooled LLM client across requests
+agent = InterviewAgent()
+
 class QuizQuestion(BaseModel):
     question: str
     options: List[str]
@@ -17,14 +26,90 @@ class QuizRequest(BaseModel):
 class QuizResponse(BaseModel):
     questions: List[QuizQuestion]
 
+class QuizJobResponse(BaseModel):
+    job_id: str
+    status: str
+
+async def build_quiz(domain: str, resume_text: str, resume_hash: str = None) -> dict:
+    """Job handler: cached quiz for this resume/domain, generated on a miss."""
+    # resume_hash is only accepted from jobs queued before keys were computed server-side
+    cache_key = quiz_cache.make_key(domain, resume_text)
+    questions = await quiz_cache.get(cache_key)
+    if questions is None:
+        questions = await agent.generate_quiz(resume_text, domain, QUIZ_QUESTIONS, seed=cache_key)
+        # A quiz missing questions (shards that gave up) is served but not cached
+        if len(questions) == QUIZ_QUESTIONS:
+            await quiz_cache.set(cache_key, questions)
+    return {"questions": questions}
+
+job_queue.register("quiz", build_quiz)
+# Background top-ups of under-stocked skills in the question bank
+job_queue.register("quiz_bank_fill", agent.quiz_bank.fill)
+
+async def _submit_quiz(request: QuizRequest):
+    # Same resume + domain while one is already generating joins that job
+    return await job_queue.submit(
+        "quiz",
+        {"domain": request.domain, "resume_text": request.resume_text},
+        key=quiz_cache.make_key(request.domain, request.resume_text)
+    )
+
 @router.post("/api/generate-quiz", response_model=QuizResponse)
 async def generate_quiz(request: QuizRequest):
     """
-    Generate 10 quiz questions based on resume and domain.
+    Generate quiz questions based on resume and domain.
+    Runs through the job queue (bounded concurrency) and waits for the result.
     """
     try:
-        agent = InterviewAgent()
-        questions = await agent.generate_quiz(request.resume_text, request.domain)
-        return QuizResponse(questions=questions)
+        job = await job_queue.wait(await _submit_quiz(request))
+        if job.status != SUCCEEDED:
+            raise HTTPException(status_code=500, detail=job.error or "Quiz generation did not finish")
+        return QuizResponse(**job.result)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/generate-quiz/jobs", response_model=QuizJobResponse, status_code=202)
+async def submit_quiz_job(request: QuizRequest):
+    """
+    Queue quiz generation and return immediately; poll GET /api/jobs/{job_id}.
+    """
+    try:
+        job = await _submit_quiz(request)
+        return QuizJobResponse(job_id=job.id, status=job.status)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/generate-quiz/stream")
+async def stream_quiz(request: QuizRequest):
+    """
+    Streaming variant (Server-Sent Events): emits a `question` event as soon
+    as each question is generated, then `done` with the full list (or `error`).
+    A cached quiz is replayed immediately.
+    """
+    cache_key = quiz_cache.make_key(request.domain, request.resume_text)
+
+    async def event_stream():
+        questions = await quiz_cache.get(cache_key)
+        if questions is not None:
+            for question in questions:
+                yield sse_event("question", question)
+            yield sse_event("done", questions)
+            return
+        async for event, data in agent.stream_quiz(
+            request.resume_text, request.domain, QUIZ_QUESTIONS, seed=cache_key
+        ):
+            if event == "done" and len(data) == QUIZ_QUESTIONS:
+                await quiz_cache.set(cache_key, data)
+            yield sse_event(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
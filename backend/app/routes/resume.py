@@ -1,18 +1,34 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
 from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
 import hashlib
+import os
 from datetime import datetime
-from app.db.config import get_candidates_collection
+from app.db.repositories import candidates
+from app.services.vector_index import candidate_search
+from app.services.document_extractor import document_extractor, ExtractionFailed
+from app.services.text_extraction import UnsupportedDocument
 
 router = APIRouter()
 
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
 class ResumeUploadResponse(BaseModel):
     candidate_id: str
     resume_hash: str
     message: str
+    duplicate: bool = False
+
+def _too_large():
+    return HTTPException(
+        status_code=413,
+        detail=f"Resume exceeds the {MAX_RESUME_BYTES // 1024} KB upload limit"
+    )
 
 @router.post("/api/upload-resume", response_model=ResumeUploadResponse)
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     role: str = Form(...),
     domain: str = Form(...),
     name: str = Form(None),
@@ -21,14 +37,42 @@ async def upload_resume(
 ):
     """
     Upload candidate resume, hash it, and store in MongoDB.
+    A resume already uploaded for the same role/domain returns the existing candidate.
     """
     try:
-        # Read file content
-        resume_bytes = await file.read()
-        resume_text = resume_bytes.decode('utf-8', errors='ignore')
+        # Reject oversized uploads before reading when the size is known up front
+        if file.size is not None and file.size > MAX_RESUME_BYTES:
+            raise _too_large()
+        
+        # Stream the file in chunks, hashing incrementally and enforcing the limit
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if len(buffer) + len(chunk) > MAX_RESUME_BYTES:
+                raise _too_large()
+            hasher.update(chunk)
+            buffer.extend(chunk)
+        resume_hash = hasher.hexdigest()
         
-        # Generate SHA256 hash
-        resume_hash = hashlib.sha256(resume_bytes).hexdigest()
+        # Short-circuit duplicates before decoding or storing anything
+        existing = await candidates.find_by_hash(resume_hash, role, domain)
+        if existing:
+            return ResumeUploadResponse(
+                candidate_id=str(existing["_id"]),
+                resume_hash=resume_hash,
+                message="Resume already uploaded",
+                duplicate=True
+            )
+        
+        # PDF/DOCX parsing runs in the extraction process pool; re-uploads hit its cache
+        try:
+            resume_text = await document_extractor.extract(file.filename or "", bytes(buffer), resume_hash)
+        except UnsupportedDocument as e:
+            raise HTTPException(status_code=415, detail=str(e))
+        except ExtractionFailed as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if not resume_text.strip():
+            raise HTTPException(status_code=422, detail="No text could be extracted from the resume")
         
         # Create candidate document
         candidate_doc = {
@@ -41,15 +85,29 @@ async def upload_resume(
             "created_at": datetime.utcnow()
         }
         
-        # Insert into MongoDB
-        candidates_collection = get_candidates_collection()
-        result = await candidates_collection.insert_one(candidate_doc)
+        # Insert into MongoDB; the unique (resume_hash, role, domain) index
+        # catches a concurrent upload of the same file
+        try:
+            candidate_id = await candidates.insert(candidate_doc)
+        except DuplicateKeyError:
+            existing = await candidates.find_by_hash(resume_hash, role, domain)
+            return ResumeUploadResponse(
+                candidate_id=str(existing["_id"]),
+                resume_hash=resume_hash,
+                message="Resume already uploaded",
+                duplicate=True
+            )
+        
+        # Embed + index after the response is sent
+        background_tasks.add_task(candidate_search.index_candidate, candidate_id, resume_text, role, domain)
         
         return ResumeUploadResponse(
-            candidate_id=str(result.inserted_id),
+            candidate_id=candidate_id,
             resume_hash=resume_hash,
             message="Resume uploaded successfully"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
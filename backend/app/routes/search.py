@@ -0,0 +1,84 @@
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from app.db.repositories import candidates
+from app.services.vector_index import candidate_search
+
+router = APIRouter()
+
+class CandidateSearchRequest(BaseModel):
+    job_description: str
+    top_k: int = 10
+    role: Optional[str] = None
+    domain: Optional[str] = None
+
+class CandidateMatch(BaseModel):
+    candidate_id: str
+    score: float
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    domain: Optional[str] = None
+
+class CandidateSearchResponse(BaseModel):
+    backend: str
+    results: List[CandidateMatch]
+
+class CandidateSummary(BaseModel):
+    candidate_id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    domain: Optional[str] = None
+    resume_hash: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class CandidateListResponse(BaseModel):
+    items: List[CandidateSummary]
+    next_cursor: Optional[str] = None
+
+@router.post("/api/recruiter/search", response_model=CandidateSearchResponse)
+async def search_candidates(request: CandidateSearchRequest):
+    """
+    Return the top-k indexed candidates for a job description.
+    """
+    try:
+        hits = await candidate_search.search(
+            request.job_description, request.top_k, request.role, request.domain
+        )
+        
+        # Fetch display fields only; resume_text stays in Mongo
+        profiles = await candidates.get_many(
+            [cid for cid, _ in hits],
+            {"name": 1, "email": 1, "role": 1, "domain": 1}
+        )
+        
+        return CandidateSearchResponse(
+            backend=candidate_search.index.backend,
+            results=[
+                CandidateMatch(candidate_id=cid, score=round(score, 4), **profiles.get(cid, {}))
+                for cid, score in hits
+            ]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+@router.get("/api/recruiter/candidates", response_model=CandidateListResponse)
+async def list_candidates(
+    role: Optional[str] = None,
+    domain: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """
+    Newest-first candidate summaries (no resume text). Pass next_cursor back as `cursor` for the next page.
+    """
+    try:
+        page = await candidates.list(role=role, domain=domain, limit=limit, after=cursor)
+        return CandidateListResponse(
+            items=[CandidateSummary(candidate_id=doc.pop("_id"), **doc) for doc in page["items"]],
+            next_cursor=page["next_cursor"]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Listing failed: {str(e)}")
@@ -0,0 +1,141 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from app.services.cache import TTLCache
+from app.services.text_extraction import TEXT, UnsupportedDocument, decode_text, detect_format, extract_text
+
+load_dotenv()
+
+
+class ExtractionFailed(Exception):
+    """Extraction ran out of time or memory, or its worker process died."""
+
+
+def _limit_worker_memory(memory_mb: int):
+    # Runs in each pool process: a hostile PDF raises MemoryError instead of growing the host
+    if memory_mb:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _extract_in_worker(filename: str, data: bytes, max_pages: int) -> str:
+    return extract_text(filename, data, max_pages=max_pages)
+
+
+class DocumentExtractor:
+    """
+    Turns uploaded PDF/DOCX resumes into text in a pool of worker processes
+    so parsing never blocks the event loop. Each document gets a time limit
+    (the pool is recycled to kill a stuck parse) and each worker an address
+    space limit. Results are cached by resume_hash, and a file already stored
+    for another role/domain reuses that candidate's text.
+    """
+    def __init__(self, workers: int = 2, timeout: float = 20.0, memory_mb: int = 512, max_pages: int = 50,
+                 cache_entries: int = 1024, cache_ttl: float = 86400, repository=None):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_pages = max_pages
+        self.cache = TTLCache(max_entries=cache_entries, ttl_seconds=cache_ttl)
+        self._repository = repository
+        self._executor = None
+        self._slots = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            workers=int(os.getenv("EXTRACT_WORKERS", "2")),
+            timeout=float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20")),
+            memory_mb=int(os.getenv("EXTRACT_MEMORY_MB", "512")),
+            max_pages=int(os.getenv("EXTRACT_MAX_PAGES", "50")),
+            cache_entries=int(os.getenv("EXTRACT_CACHE_MAX_ENTRIES", "1024")),
+            cache_ttl=float(os.getenv("EXTRACT_CACHE_TTL_SECONDS", "86400")),
+        )
+
+    @property
+    def repository(self):
+        if self._repository is None:
+            from app.db.repositories import candidates
+            self._repository = candidates
+        return self._repository
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # forkserver: workers start from a clean process, not a copy of a
+            # server holding models and event-loop threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context,
+                initializer=_limit_worker_memory, initargs=(self.memory_mb,),
+            )
+        return self._executor
+
+    def _recycle(self, pool: ProcessPoolExecutor):
+        """Kills the pool's processes (the only way to stop a running parse) and starts fresh next time."""
+        if self._executor is pool:
+            self._executor = None
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, filename: str, data: bytes) -> str:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        # One document per worker at a time, so the timeout only counts parsing, not queueing
+        async with self._slots:
+            for attempt in range(2):
+                pool = self._pool()
+                future = asyncio.get_running_loop().run_in_executor(
+                    pool, _extract_in_worker, filename, data, self.max_pages
+                )
+                try:
+                    async with asyncio.timeout(self.timeout):
+                        return await future
+                except TimeoutError:
+                    self._recycle(pool)
+                    raise ExtractionFailed(f"Text extraction took longer than {self.timeout:g}s")
+                except MemoryError:
+                    raise ExtractionFailed(f"Text extraction exceeded the {self.memory_mb} MB memory limit")
+                except BrokenProcessPool:
+                    # Recycled because another document timed out: run this one again
+                    if pool is not self._executor and attempt == 0:
+                        continue
+                    self._recycle(pool)
+                    raise ExtractionFailed(f"Text extraction worker died (over the {self.memory_mb} MB memory limit?)")
+
+    async def extract(self, filename: str, data: bytes, resume_hash: str = None) -> str:
+        """Text of an uploaded resume; raises UnsupportedDocument or ExtractionFailed."""
+        if resume_hash:
+            cached = self.cache.get(resume_hash)
+            if cached is not None:
+                return cached
+            try:
+                stored = await self.repository.resume_text_by_hash(resume_hash)
+            except Exception as e:
+                print(f"Extraction cache lookup error: {e}")
+                stored = None
+            if stored is not None:
+                self.cache.set(resume_hash, stored)
+                return stored
+
+        # Plain text is only decoded; the pool is for formats that need parsing
+        if detect_format(filename, data) == TEXT:
+            text = decode_text(data)
+        else:
+            text = await self._run(filename, data)
+        if resume_hash:
+            self.cache.set(resume_hash, text)
+        return text
+
+    async def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+document_extractor = DocumentExtractor.from_env()
@@ -0,0 +1,43 @@
+import asyncio
+import os
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class EmbeddingService:
+    """
+    Lazily loaded sentence-embedding model shared by the backend.
+    Encoding runs in a worker thread so it never blocks the event loop.
+    """
+    def __init__(self, model_name: str = None):
+        self.model_name = model_name or os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    print(f"Loading embedding model {self.model_name}...")
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: list, batch_size: int = 64):
+        """Returns unit-length float32 embeddings, one row per text."""
+        return self.model.encode(
+            texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+        ).astype("float32", copy=False)
+
+    async def aencode(self, texts: list, batch_size: int = 64):
+        return await asyncio.to_thread(self.encode, texts, batch_size)
+
+
+embedding_service = EmbeddingService()
@@ -0,0 +1,280 @@
+import asyncio
+import os
+import time
+from array import array
+from collections import OrderedDict
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Labels the interview room reports; anything else is dropped rather than given a code
+LABELS = ("Neutral", "Happy", "Nervous", "Focused")
+
+
+class EmotionBuffer:
+    """Raw samples for one session in packed arrays (13 bytes per sample)."""
+    __slots__ = ("timestamps", "codes", "scores", "windows", "dropped", "last_access")
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.codes = array("B")
+        self.scores = array("f")
+        # Aggregated windows not yet written to Mongo (or all of them when not persisting)
+        self.windows = []
+        self.dropped = 0
+        self.last_access = time.monotonic()
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+def merge_stats(into: dict, stats: dict):
+    n = into["n"] + stats["n"]
+    into["mean"] = (into["mean"] * into["n"] + stats["mean"] * stats["n"]) / n
+    into["min"] = min(into["min"], stats["min"])
+    into["max"] = max(into["max"], stats["max"])
+    into["n"] = n
+
+
+class EmotionTelemetry:
+    """
+    Ingests emotion samples (several per second per candidate) into
+    per-session array buffers. Samples are downsampled into fixed windows
+    (count/min/mean/max per label) once a window has closed, and the windows
+    are appended to `interviews.emotion_data` in one bulk write per flush, so
+    an hour of samples becomes ~720 small array entries instead of tens of
+    thousands of documents or pushes.
+    """
+    def __init__(
+        self,
+        window_seconds: float = 5.0,
+        flush_interval: float = 5.0,
+        grace_seconds: float = 2.0,
+        max_samples_per_session: int = 20000,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 3600,
+        persist: bool = True,
+        labels: tuple = LABELS,
+        max_clock_skew: float = 300.0,
+    ):
+        self.window_seconds = window_seconds
+        self.flush_interval = flush_interval
+        self.grace_seconds = grace_seconds
+        self.max_samples_per_session = max_samples_per_session
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self.max_clock_skew = max_clock_skew
+
+        self._buffers: "OrderedDict[str, EmotionBuffer]" = OrderedDict()
+        # Fixed codes (uint8) for the known labels, shared by every session
+        self._label_names = [label.strip().capitalize() for label in labels][:255]
+        self._label_codes = {label: code for code, label in enumerate(self._label_names)}
+        self._flush_task = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            window_seconds=float(os.getenv("EMOTION_WINDOW_SECONDS", "5")),
+            flush_interval=float(os.getenv("EMOTION_FLUSH_INTERVAL", "5")),
+            max_samples_per_session=int(os.getenv("EMOTION_MAX_BUFFERED_SAMPLES", "20000")),
+            max_sessions=int(os.getenv("EMOTION_MAX_SESSIONS", "10000")),
+            persist=os.getenv("EMOTION_PERSIST", "true").lower() in ("1", "true", "yes"),
+            labels=tuple(label for label in os.getenv("EMOTION_LABELS", ",".join(LABELS)).split(",") if label.strip()),
+            max_clock_skew=float(os.getenv("EMOTION_MAX_CLOCK_SKEW_SECONDS", "300")),
+        )
+
+    def _code(self, label) -> int:
+        """Code of a known label, or -1."""
+        if not isinstance(label, str):
+            return -1
+        return self._label_codes.get(label.strip().capitalize(), -1)
+
+    def _buffer(self, session_id: str) -> EmotionBuffer:
+        buffer = self._buffers.get(session_id)
+        if buffer is None:
+            buffer = EmotionBuffer()
+            self._buffers[session_id] = buffer
+        else:
+            self._buffers.move_to_end(session_id)
+        buffer.last_access = time.monotonic()
+        return buffer
+
+    def add(self, session_id: str, timestamps: list, labels: list, scores: list) -> int:
+        """
+        Appends a batch of samples (timestamps in epoch seconds). Returns how
+        many were accepted. Samples with an unknown label, a non-finite score,
+        or a timestamp not within max_clock_skew of server time are dropped,
+        as are samples beyond the per-session cap.
+        """
+        count = min(len(timestamps), len(labels), len(scores))
+        ts = np.asarray(timestamps[:count], dtype=np.float64)
+        values = np.asarray(scores[:count], dtype=np.float64)
+        codes = np.fromiter((self._code(label) for label in labels[:count]), dtype=np.int64, count=count)
+        with np.errstate(invalid="ignore"):
+            valid = (
+                np.isfinite(ts) & (np.abs(ts - time.time()) <= self.max_clock_skew)
+                & np.isfinite(values) & (codes >= 0)
+            )
+        ts, values, codes = ts[valid], values[valid], codes[valid]
+
+        buffer = self._buffer(session_id)
+        room = self.max_samples_per_session - len(buffer)
+        accepted = max(0, min(len(ts), room))
+        buffer.dropped += count - accepted
+        if accepted:
+            buffer.timestamps.frombytes(ts[:accepted].tobytes())
+            buffer.codes.frombytes(codes[:accepted].astype(np.uint8).tobytes())
+            buffer.scores.frombytes(np.clip(values[:accepted], 0.0, 1.0).astype(np.float32).tobytes())
+        return accepted
+
+    def _aggregate(self, buffer: EmotionBuffer, cutoff: float = None, consume: bool = True) -> list:
+        """
+        Downsamples samples in windows that ended before `cutoff` (all of them
+        when cutoff is None). Consumed samples are removed from the buffer.
+        """
+        if not len(buffer):
+            return []
+        ts = np.frombuffer(buffer.timestamps, dtype=np.float64)
+        codes = np.frombuffer(buffer.codes, dtype=np.uint8)
+        scores = np.frombuffer(buffer.scores, dtype=np.float32)
+
+        window = np.floor(ts / self.window_seconds).astype(np.int64)
+        if cutoff is None:
+            mask = np.ones(len(ts), dtype=bool)
+        else:
+            mask = (window + 1) * self.window_seconds <= cutoff
+        if not mask.any():
+            return []
+
+        w, c, s = window[mask], codes[mask], scores[mask]
+        order = np.lexsort((c, w))
+        w, c, s = w[order], c[order], s[order]
+        starts = np.flatnonzero(np.r_[True, (w[1:] != w[:-1]) | (c[1:] != c[:-1])])
+        counts = np.diff(np.r_[starts, len(s)])
+        sums = np.add.reduceat(s, starts)
+        mins = np.minimum.reduceat(s, starts)
+        maxs = np.maximum.reduceat(s, starts)
+
+        windows = []
+        for i, start in enumerate(starts):
+            t = float(w[start] * self.window_seconds)
+            if not windows or windows[-1]["t"] != t:
+                windows.append({"t": t, "labels": {}})
+            windows[-1]["labels"][self._label_names[c[start]]] = {
+                "n": int(counts[i]),
+                "min": round(float(mins[i]), 4),
+                "mean": round(float(sums[i] / counts[i]), 4),
+                "max": round(float(maxs[i]), 4),
+            }
+
+        if consume:
+            keep = ~mask
+            buffer.timestamps = array("d", ts[keep].tobytes())
+            buffer.codes = array("B", codes[keep].tobytes())
+            buffer.scores = array("f", scores[keep].tobytes())
+        return windows
+
+    def _evict(self):
+        """Drop idle sessions that have nothing left to write, then enforce the LRU bound."""
+        now = time.monotonic()
+        for session_id in list(self._buffers):
+            buffer = self._buffers[session_id]
+            if now - buffer.last_access < self.ttl_seconds:
+                break
+            if not len(buffer) and (not self.persist or not buffer.windows):
+                del self._buffers[session_id]
+        while len(self._buffers) > self.max_sessions:
+            self._buffers.popitem(last=False)
+
+    async def flush(self, force: bool = False):
+        """Aggregates closed windows (all windows when force) and writes them in one bulk write."""
+        cutoff = None if force else time.time() - self.grace_seconds
+        for buffer in self._buffers.values():
+            buffer.windows.extend(self._aggregate(buffer, cutoff))
+        if not self.persist:
+            return
+
+        pending = {sid: buffer.windows for sid, buffer in self._buffers.items() if buffer.windows}
+        if not pending:
+            return
+        for buffer in self._buffers.values():
+            buffer.windows = []
+        try:
+            from app.db.repositories import interviews
+            await interviews.append_emotion_windows(pending)
+        except Exception as e:
+            print(f"Emotion flush error: {e}")
+            # Keep the windows for the next attempt
+            for session_id, windows in pending.items():
+                buffer = self._buffer(session_id)
+                buffer.windows = windows + buffer.windows
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            self._evict()
+
+    async def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush(force=True)
+
+    async def timeline(self, session_id: str, resolution: float = None) -> dict:
+        """
+        Aggregated timeline for a session at `resolution` seconds (rounded to a
+        multiple of the storage window), plus per-label totals.
+        """
+        windows = []
+        if self.persist:
+            try:
+                from app.db.repositories import interviews
+                windows.extend(await interviews.get_emotion_windows(session_id))
+            except Exception as e:
+                print(f"Emotion timeline read error ({session_id}): {e}")
+        buffer = self._buffers.get(session_id)
+        if buffer is not None:
+            windows.extend(buffer.windows)
+            windows.extend(self._aggregate(buffer, consume=False))
+
+        step = max(1, round((resolution or self.window_seconds) / self.window_seconds)) * self.window_seconds
+        buckets = {}
+        totals = {}
+        for entry in windows:
+            t = (entry["t"] // step) * step
+            bucket = buckets.setdefault(t, {})
+            for label, stats in entry["labels"].items():
+                for target in (bucket, totals):
+                    if label in target:
+                        merge_stats(target[label], stats)
+                    else:
+                        target[label] = dict(stats)
+
+        samples = sum(stats["n"] for stats in totals.values())
+        return {
+            "session_id": session_id,
+            "resolution_seconds": step,
+            "timeline": [
+                {"t": t, "labels": {label: {**stats, "mean": round(stats["mean"], 4)} for label, stats in buckets[t].items()}}
+                for t in sorted(buckets)
+            ],
+            "summary": {
+                label: {"share": round(stats["n"] / samples, 4), "mean": round(stats["mean"], 4), "max": stats["max"]}
+                for label, stats in sorted(totals.items(), key=lambda item: -item[1]["n"])
+            },
+            "samples": samples,
+        }
+
+
+emotion_telemetry = EmotionTelemetry.from_env()
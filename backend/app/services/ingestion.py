@@ -0,0 +1,565 @@
+import asyncio
+import hashlib
+import os
+import re
+import socket
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from dotenv import load_dotenv
+from app.services.skill_taxonomy import default_taxonomy
+from app.services.text_extraction import SUPPORTED_EXTENSIONS, UnsupportedDocument
+
+load_dotenv()
+
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(5 * 1024 * 1024)))
+RUNNING, COMPLETED, FAILED = "running", "completed", "failed"
+# "unindexed": stored, but embedding or vector indexing failed, so not yet searchable
+OUTCOMES = ("inserted", "unindexed", "duplicates", "failed", "skipped")
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+def parse_resume(text: str) -> dict:
+    """Name (first short line), email and taxonomy skills of a resume."""
+    email = _EMAIL.search(text)
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    looks_like_name = 0 < len(first_line) <= 60 and "@" not in first_line and not any(c.isdigit() for c in first_line)
+    return {
+        "name": first_line if looks_like_name else None,
+        "email": email.group(0) if email else None,
+        "skills": default_taxonomy().extract(text),
+    }
+
+
+class ResumeSource:
+    """
+    Resume files in a ZIP archive or a directory tree, listed in a stable
+    order so a run can be resumed by position. The manifest (names plus
+    sizes and CRCs / mtimes) identifies that exact listing.
+    """
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        if os.path.isdir(self.path):
+            self.kind = "directory"
+        elif zipfile.is_zipfile(self.path):
+            self.kind = "zip"
+        else:
+            raise ValueError(f"Not a ZIP archive or directory: {path}")
+        self._zip = None
+
+    @staticmethod
+    def _wanted(name: str) -> bool:
+        base = os.path.basename(name)
+        return (
+            not base.startswith(".") and "__MACOSX" not in name
+            and os.path.splitext(base.lower())[1] in SUPPORTED_EXTENSIONS
+        )
+
+    def listing(self) -> list:
+        """Sorted (name, signature) pairs; the signature changes when a file does."""
+        if self.kind == "zip":
+            with zipfile.ZipFile(self.path) as archive:
+                return sorted(
+                    (i.filename, f"{i.file_size}:{i.CRC:08x}")
+                    for i in archive.infolist() if not i.is_dir() and self._wanted(i.filename)
+                )
+        entries = []
+        for root, dirs, files in os.walk(self.path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for f in files:
+                if self._wanted(f):
+                    stat = os.stat(os.path.join(root, f))
+                    entries.append((os.path.relpath(os.path.join(root, f), self.path), f"{stat.st_size}:{stat.st_mtime_ns}"))
+        return sorted(entries)
+
+    @staticmethod
+    def manifest(listing: list) -> str:
+        digest = hashlib.sha1()
+        for name, signature in listing:
+            digest.update(f"{name}\0{signature}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def read(self, name: str) -> bytes:
+        """File contents; raises ValueError when larger than MAX_RESUME_BYTES."""
+        if self.kind == "zip":
+            if self._zip is None:
+                self._zip = zipfile.ZipFile(self.path)
+            size = self._zip.getinfo(name).file_size
+        else:
+            size = os.path.getsize(os.path.join(self.path, name))
+        if size > MAX_RESUME_BYTES:
+            raise ValueError(f"larger than {MAX_RESUME_BYTES // 1024} KB")
+        if self.kind == "zip":
+            return self._zip.read(name)
+        with open(os.path.join(self.path, name), "rb") as f:
+            return f.read()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+class IngestJob:
+    """
+    Progress of one bulk ingestion. Files are numbered in source order; the
+    watermark is the first index not yet finished, so everything below it
+    is done and a resumed run starts from there.
+    """
+    def __init__(self, id: str, source: str, role: str, domain: str, total: int = 0, watermark: int = 0,
+                 counts: dict = None, elapsed_seconds: float = 0.0, status: str = RUNNING, errors: list = None,
+                 created_at: datetime = None, manifest: str = None):
+        self.id = id
+        self.source = source
+        self.manifest = manifest
+        self.role = role
+        self.domain = domain
+        self.total = total
+        self.watermark = watermark
+        self.status = status
+        self.errors = errors or []
+        self.created_at = created_at or datetime.utcnow()
+        # Outcomes below the watermark (persisted) and above it (this run only)
+        self.committed = {outcome: 0 for outcome in OUTCOMES}
+        self.committed.update(counts or {})
+        self._pending = {}
+        self._previous_elapsed = elapsed_seconds
+        self._started = time.monotonic()
+        self._finished = None
+        self._resumed_from = watermark
+        self.queues = {}
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "IngestJob":
+        return cls(
+            doc["_id"], doc["source"], doc["role"], doc["domain"], total=doc.get("total", 0),
+            watermark=doc.get("watermark", 0), counts=doc.get("counts"), elapsed_seconds=doc.get("elapsed_seconds", 0.0),
+            status=doc.get("status", RUNNING), errors=doc.get("errors"), created_at=doc.get("created_at"),
+            manifest=doc.get("manifest"),
+        )
+
+    def complete(self, index: int, outcome: str, error: str = None):
+        self._pending[index] = outcome
+        if error:
+            self.errors = (self.errors + [error])[-20:]
+        while self.watermark in self._pending:
+            self.committed[self._pending.pop(self.watermark)] += 1
+            self.watermark += 1
+
+    def finish(self, status: str):
+        self.status = status
+        self._finished = time.monotonic()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.status != RUNNING and self._finished is None:
+            return self._previous_elapsed
+        return self._previous_elapsed + (self._finished or time.monotonic()) - self._started
+
+    def to_doc(self) -> dict:
+        """Checkpoint: only progress below the watermark, which a resumed run will not redo."""
+        return {
+            "_id": self.id, "source": self.source, "manifest": self.manifest, "role": self.role, "domain": self.domain,
+            "total": self.total, "watermark": self.watermark, "counts": dict(self.committed),
+            "elapsed_seconds": round(self.elapsed_seconds, 2), "status": self.status, "errors": self.errors,
+            "created_at": self.created_at, "updated_at": datetime.utcnow(),
+        }
+
+    def progress(self) -> dict:
+        counts = dict(self.committed)
+        for outcome in self._pending.values():
+            counts[outcome] += 1
+        processed = sum(counts.values())
+        run_seconds = (self._finished or time.monotonic()) - self._started
+        rate = (processed - self._resumed_from) / run_seconds if run_seconds > 0 else 0.0
+        remaining = max(0, self.total - processed)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "source": os.path.basename(self.source),
+            "role": self.role,
+            "domain": self.domain,
+            "total": self.total,
+            "processed": processed,
+            "percent": round(100 * processed / self.total, 1) if self.total else 100.0,
+            "counts": counts,
+            "files_per_second": round(rate, 2),
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "eta_seconds": round(remaining / rate, 1) if rate > 0 and self.status == RUNNING else None,
+            "queues": {name: queue.qsize() for name, queue in self.queues.items()},
+            "errors": self.errors[-5:],
+        }
+
+
+def progress_from_doc(doc: dict) -> dict:
+    """Progress of a job that is not running in this process (from its last checkpoint)."""
+    job = IngestJob.from_doc(doc)
+    data = job.progress()
+    data.update({"files_per_second": None, "eta_seconds": None, "elapsed_seconds": doc.get("elapsed_seconds", 0.0)})
+    return data
+
+
+class IngestionPipeline:
+    """
+    read -> hash/dedup -> extract+parse (process pool) -> embed (batched) ->
+    insert_many (batched), connected by bounded queues so a slow stage
+    backpressures the ones before it instead of buffering the whole archive.
+    """
+    def __init__(self, job: IngestJob, source: ResumeSource, extract_workers: int = 4, queue_size: int = 64,
+                 dedup_batch: int = 64, embed_batch: int = 32, insert_batch: int = 200, batch_wait: float = 0.5):
+        self.job = job
+        self.source = source
+        self.extract_workers = extract_workers
+        self.queue_size = queue_size
+        self.dedup_batch = dedup_batch
+        self.embed_batch = embed_batch
+        self.insert_batch = insert_batch
+        self.batch_wait = batch_wait
+        self._embedding_warned = False
+
+    async def _batch(self, queue: asyncio.Queue, max_items: int, wait: float = 0.0) -> tuple:
+        """Next batch from a queue: blocks for one item, then takes what arrives within `wait`. Returns (items, ended)."""
+        item = await queue.get()
+        if item is None:
+            return [], True
+        items = [item]
+        # asyncio.timeout rather than wait_for: on 3.11 wait_for can swallow a
+        # cancellation that lands as the get completes, leaving the stage stuck
+        try:
+            async with asyncio.timeout(wait):
+                while len(items) < max_items:
+                    item = queue.get_nowait() if wait <= 0 else await queue.get()
+                    if item is None:
+                        return items, True
+                    items.append(item)
+        except (asyncio.QueueEmpty, TimeoutError):
+            pass
+        return items, False
+
+    async def _read(self, names: list, out: asyncio.Queue):
+        for index in range(self.job.watermark, len(names)):
+            name = names[index]
+            try:
+                data = await asyncio.to_thread(self.source.read, name)
+            except Exception as e:
+                self.job.complete(index, "skipped", f"{name}: {e}")
+                continue
+            await out.put({"index": index, "name": name, "data": data})
+        await out.put(None)
+
+    async def _dedup(self, inp: asyncio.Queue, out: asyncio.Queue):
+        from app.db.repositories import candidates
+        seen = set()
+        ended = False
+        while not ended:
+            items, ended = await self._batch(inp, self.dedup_batch)
+            for item in items:
+                item["resume_hash"] = hashlib.sha256(item["data"]).hexdigest()
+            existing = await candidates.existing_hashes(
+                {item["resume_hash"] for item in items}, self.job.role, self.job.domain
+            )
+            for item in items:
+                if item["resume_hash"] in existing or item["resume_hash"] in seen:
+                    self.job.complete(item["index"], "duplicates")
+                    continue
+                seen.add(item["resume_hash"])
+                await out.put(item)
+        for _ in range(self.extract_workers):
+            await out.put(None)
+
+    async def _extract(self, inp: asyncio.Queue, out: asyncio.Queue):
+        from app.services.document_extractor import document_extractor
+        while (item := await inp.get()) is not None:
+            try:
+                # No resume_hash: the dedup stage already skipped stored files, and a
+                # bulk import would otherwise flush the upload cache
+                text = (await document_extractor.extract(item["name"], item.pop("data"))).strip()
+                if not text:
+                    raise UnsupportedDocument("no text found")
+                parsed = await asyncio.to_thread(parse_resume, text)
+            except Exception as e:
+                self.job.complete(item["index"], "failed", f"{item['name']}: {e}")
+                continue
+            item.update(text=text, parsed=parsed)
+            await out.put(item)
+
+    async def _embed(self, inp: asyncio.Queue, out: asyncio.Queue):
+        from app.services.vector_index import candidate_search
+        ended = False
+        while not ended:
+            items, ended = await self._batch(inp, self.embed_batch)
+            if items:
+                try:
+                    vectors = await candidate_search.embed([item["text"] for item in items], batch_size=self.embed_batch)
+                    for item, vector in zip(items, vectors):
+                        item["vector"] = vector
+                except Exception as e:
+                    # Candidates are still stored, counted as "unindexed" (not searchable)
+                    if not self._embedding_warned:
+                        print(f"⚠️ Ingest embedding error, inserting without vectors: {e}")
+                        self.job.errors = (self.job.errors + [f"embedding: {e}"])[-20:]
+                        self._embedding_warned = True
+            for item in items:
+                await out.put(item)
+        await out.put(None)
+
+    async def _insert(self, inp: asyncio.Queue):
+        from app.db.repositories import candidates
+        from app.services.vector_index import candidate_search
+        ended = False
+        while not ended:
+            items, ended = await self._batch(inp, self.insert_batch, self.batch_wait)
+            if not items:
+                continue
+            now = datetime.utcnow()
+            docs = [
+                {
+                    "name": item["parsed"]["name"],
+                    "email": item["parsed"]["email"],
+                    "role": self.job.role,
+                    "domain": self.job.domain,
+                    "resume_text": item["text"],
+                    "resume_hash": item["resume_hash"],
+                    "skills": item["parsed"]["skills"],
+                    "source_file": item["name"],
+                    "ingest_job": self.job.id,
+                    "created_at": now,
+                }
+                for item in items
+            ]
+            result = await candidates.insert_many(docs)
+            inserted = set(result["inserted_ids"])
+            entries = [
+                (str(doc["_id"]), item["vector"], self.job.role, self.job.domain)
+                for doc, item in zip(docs, items)
+                if str(doc["_id"]) in inserted and item.get("vector") is not None
+            ]
+            indexed = set()
+            if entries:
+                try:
+                    await candidate_search.index_many(entries)
+                    indexed = {candidate_id for candidate_id, *_ in entries}
+                except Exception as e:
+                    print(f"⚠️ Ingest vector index error: {e}")
+                    self.job.errors = (self.job.errors + [f"vector index: {e}"])[-20:]
+            for doc, item in zip(docs, items):
+                candidate_id = str(doc["_id"])
+                if candidate_id not in inserted:
+                    self.job.complete(item["index"], "duplicates")
+                elif candidate_id in indexed:
+                    self.job.complete(item["index"], "inserted")
+                else:
+                    self.job.complete(item["index"], "unindexed")
+
+    async def run(self, names: list):
+        read_q = asyncio.Queue(self.queue_size)
+        extract_q = asyncio.Queue(self.queue_size)
+        embed_q = asyncio.Queue(self.queue_size)
+        insert_q = asyncio.Queue(self.queue_size * 4)
+        self.job.queues = {"read": read_q, "extract": extract_q, "embed": embed_q, "insert": insert_q}
+
+        async def extract_stage():
+            await asyncio.gather(*[self._extract(extract_q, embed_q) for _ in range(self.extract_workers)])
+            await embed_q.put(None)
+
+        stages = [
+            asyncio.create_task(self._read(names, read_q)),
+            asyncio.create_task(self._dedup(read_q, extract_q)),
+            asyncio.create_task(extract_stage()),
+            asyncio.create_task(self._embed(embed_q, insert_q)),
+            asyncio.create_task(self._insert(insert_q)),
+        ]
+        try:
+            # The first stage to fail stops the others; progress up to the watermark is kept
+            done, pending = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            self.source.close()
+
+
+class IngestionManager:
+    """
+    Runs bulk resume ingestion jobs in the background and checkpoints them
+    to the ingest_jobs collection. A job whose process died is resumed from
+    its watermark by the next process that starts; files past the watermark
+    are read again and skipped as duplicates if they were already stored.
+    """
+    def __init__(self, spool_dir: str = None, max_jobs: int = 2, extract_workers: int = 4, queue_size: int = 64,
+                 embed_batch: int = 32, insert_batch: int = 200, checkpoint_interval: float = 2.0,
+                 lease_seconds: float = 30.0, max_upload_bytes: int = 512 * 1024 * 1024):
+        # Uploaded archives are kept here until their job completes, so a restart can resume them
+        self.spool_dir = spool_dir or os.path.join(tempfile.gettempdir(), "zara-ingest")
+        self.max_upload_bytes = max_upload_bytes
+        self.extract_workers = extract_workers
+        self.queue_size = queue_size
+        self.embed_batch = embed_batch
+        self.insert_batch = insert_batch
+        self.checkpoint_interval = checkpoint_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._slots = asyncio.Semaphore(max(1, max_jobs))
+        self._jobs = {}
+        self._tasks = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            spool_dir=os.getenv("INGEST_SPOOL_DIR") or None,
+            max_jobs=int(os.getenv("INGEST_MAX_JOBS", "2")),
+            extract_workers=int(os.getenv("INGEST_EXTRACT_WORKERS", "4")),
+            queue_size=int(os.getenv("INGEST_QUEUE_SIZE", "64")),
+            embed_batch=int(os.getenv("INGEST_EMBED_BATCH", "32")),
+            insert_batch=int(os.getenv("INGEST_INSERT_BATCH", "200")),
+            checkpoint_interval=float(os.getenv("INGEST_CHECKPOINT_SECONDS", "2")),
+            max_upload_bytes=int(os.getenv("INGEST_MAX_ZIP_BYTES", str(512 * 1024 * 1024))),
+        )
+
+    @staticmethod
+    def job_id_for(path: str, role: str, domain: str, manifest: str) -> str:
+        """
+        Same path + unchanged contents + role + domain gives the same job, so
+        re-running a command resumes it; a changed source is a new job (files
+        already stored are skipped by the dedup stage, so the rescan is cheap).
+        """
+        key = f"{os.path.abspath(path)}|{manifest}|{role}|{domain}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    async def _checkpoint(self, job: IngestJob) -> bool:
+        from app.db.repositories import ingest_jobs
+        try:
+            return await ingest_jobs.checkpoint(job.id, self.owner, job.to_doc(), self.lease_seconds)
+        except Exception as e:
+            print(f"Ingest checkpoint error ({job.id}): {e}")
+            return True
+
+    async def _checkpoint_loop(self, job: IngestJob, pipeline_task: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            if not await self._checkpoint(job):
+                print(f"⚠️ Ingest job {job.id} was taken over by another process; stopping here")
+                pipeline_task.cancel()
+                return
+
+    async def run(self, job: IngestJob) -> dict:
+        """Runs (or resumes) a job to the end in the current task."""
+        self._jobs[job.id] = job
+        async with self._slots:
+            source = ResumeSource(job.source)
+            listing = await asyncio.to_thread(source.listing)
+            if ResumeSource.manifest(listing) != job.manifest:
+                # The watermark is a position in the original listing; it means nothing in this one
+                job.finish(FAILED)
+                job.errors = (job.errors + ["source changed since the job started; submit it again for a new job"])[-20:]
+                await self._checkpoint(job)
+                print(f"⚠️ Ingest {job.id}: {source.path} changed since the job started; not resuming")
+                return job.progress()
+            names = [name for name, _ in listing]
+            job.total = len(names)
+            pipeline = IngestionPipeline(
+                job, source, extract_workers=self.extract_workers, queue_size=self.queue_size,
+                embed_batch=self.embed_batch, insert_batch=self.insert_batch,
+            )
+            print(f"📥 Ingest {job.id}: {job.total} files from {source.kind} {source.path} (resuming at {job.watermark})")
+            pipeline_task = asyncio.create_task(pipeline.run(names))
+            checkpoints = asyncio.create_task(self._checkpoint_loop(job, pipeline_task))
+            try:
+                await pipeline_task
+                job.finish(COMPLETED)
+            except asyncio.CancelledError:
+                # Shutdown or lost lease: leave it "running" so it is resumed
+                raise
+            except Exception as e:
+                job.finish(FAILED)
+                job.errors = (job.errors + [f"pipeline: {e}"])[-20:]
+                print(f"❌ Ingest {job.id} failed: {e}")
+            finally:
+                checkpoints.cancel()
+                await self._checkpoint(job)
+            if job.status == COMPLETED:
+                self._remove_spooled(job.source)
+            progress = job.progress()
+            print(f"✅ Ingest {job.id} {job.status}: {progress['counts']} in {progress['elapsed_seconds']}s")
+            return progress
+
+    def _remove_spooled(self, path: str):
+        if os.path.abspath(path).startswith(os.path.abspath(self.spool_dir) + os.sep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _launch(self, job: IngestJob):
+        task = asyncio.create_task(self.run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+
+    async def open_job(self, path: str, role: str, domain: str, job_id: str = None) -> IngestJob:
+        """Creates the job, or claims an unfinished one with the same id so it resumes."""
+        from app.db.repositories import ingest_jobs
+        source = ResumeSource(path)  # validates the path
+        manifest = ResumeSource.manifest(await asyncio.to_thread(source.listing))
+        job_id = job_id or self.job_id_for(path, role, domain, manifest)
+        if job_id in self._jobs and job_id in self._tasks:
+            return self._jobs[job_id]
+        doc = await ingest_jobs.get(job_id)
+        if doc is not None:
+            if doc.get("status") == COMPLETED:
+                return IngestJob.from_doc(doc)
+            claimed = await ingest_jobs.claim(job_id, self.owner, self.lease_seconds)
+            if claimed is None:
+                raise RuntimeError(f"Ingest job {job_id} is running in another process ({doc.get('owner')})")
+            return IngestJob.from_doc(claimed)
+        job = IngestJob(job_id, os.path.abspath(path), role, domain, manifest=manifest)
+        await ingest_jobs.create(job.to_doc(), self.owner, self.lease_seconds)
+        return job
+
+    async def submit(self, path: str, role: str, domain: str, job_id: str = None) -> dict:
+        """Starts a job in the background and returns its progress."""
+        job = await self.open_job(path, role, domain, job_id)
+        if job.status != COMPLETED and job.id not in self._tasks:
+            self._launch(job)
+        return job.progress()
+
+    async def get(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is not None and job.id in self._tasks:
+            return job.progress()
+        from app.db.repositories import ingest_jobs
+        doc = await ingest_jobs.get(job_id)
+        return progress_from_doc(doc) if doc else None
+
+    async def start(self):
+        """Resumes jobs left running by a process that died (lease expired)."""
+        try:
+            from app.db.repositories import ingest_jobs
+            for job_id in await ingest_jobs.orphaned():
+                claimed = await ingest_jobs.claim(job_id, self.owner, self.lease_seconds)
+                if not claimed:
+                    continue
+                job = IngestJob.from_doc(claimed)
+                if os.path.exists(job.source):
+                    print(f"🔁 Resuming ingest job {job_id} at file {job.watermark}")
+                    self._launch(job)
+                else:
+                    # e.g. an upload spooled under /tmp that did not survive a container restart
+                    job.finish(FAILED)
+                    job.errors = (job.errors + ["source file is gone; upload it again"])[-20:]
+                    await self._checkpoint(job)
+                    print(f"⚠️ Ingest job {job_id}: {job.source} no longer exists; marked failed")
+        except Exception as e:
+            print(f"Ingest recovery error: {e}")
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+ingestion_manager = IngestionManager.from_env()
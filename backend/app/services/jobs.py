@@ -0,0 +1,369 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.services.cache import TTLCache
+from app.services.metrics import JOB_LATENCY
+
+load_dotenv()
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+ACTIVE = (QUEUED, RUNNING)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job backlog is full; callers should retry later."""
+
+
+class Job:
+    """One unit of background work and its outcome."""
+    __slots__ = ("id", "kind", "key", "payload", "status", "result", "error", "deadline_seconds",
+                 "created_at", "started_at", "finished_at", "owner")
+
+    def __init__(self, kind: str, payload: dict, key: str = None, deadline_seconds: float = 60.0, id: str = None):
+        self.id = id or uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.deadline_seconds = deadline_seconds
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.owner = None
+
+    @property
+    def done(self) -> bool:
+        return self.status not in ACTIVE
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        job = cls(data["kind"], data.get("payload") or {}, data.get("key"), data.get("deadline_seconds", 60.0), data["id"])
+        for slot in ("status", "result", "error", "created_at", "started_at", "finished_at", "owner"):
+            setattr(job, slot, data.get(slot))
+        return job
+
+    def public(self) -> dict:
+        """Status view returned to clients (no payload)."""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class MemoryJobStore:
+    """Keeps jobs in process memory; finished jobs expire after `ttl_seconds`."""
+    def __init__(self, max_jobs: int = 10000, ttl_seconds: float = 3600):
+        self.jobs = TTLCache(max_entries=max_jobs, ttl_seconds=ttl_seconds)
+
+    async def save(self, job: Job):
+        self.jobs.set(job.id, job)
+
+    async def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    async def find_active(self, key: str):
+        return None  # in-flight dedup is handled by the queue itself
+
+    async def renew(self, job_ids: list, owner: str):
+        pass
+
+    async def claim_orphans(self, owner: str, kinds: list, limit: int) -> list:
+        return []
+
+    async def fail_orphans(self, kinds: list, error: str) -> int:
+        return 0
+
+
+class MongoJobStore:
+    """
+    Persists jobs in the `jobs` collection so queued work survives a restart.
+    An unfinished job is owned through a lease that its process renews while
+    the job is queued or running there; only jobs whose lease ran out
+    (stopped or crashed process) are claimed by another process.
+    """
+    def __init__(self, ttl_seconds: float = 3600, lease_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self._index_ready = False
+
+    async def _collection(self):
+        from app.db.config import Database
+        collection = Database.get_database()["jobs"]
+        if not self._index_ready:
+            await collection.create_index("created_at", expireAfterSeconds=int(self.ttl_seconds))
+            await collection.create_index([("key", 1), ("status", 1)])
+            await collection.create_index([("status", 1), ("lease_until", 1)])
+            self._index_ready = True
+        return collection
+
+    def _lease(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    @staticmethod
+    def _orphaned(kinds: list) -> dict:
+        return {
+            "status": {"$in": list(ACTIVE)},
+            "kind": {"$in": list(kinds)},
+            "$or": [{"lease_until": {"$lt": datetime.utcnow()}}, {"lease_until": None}],
+        }
+
+    async def save(self, job: Job):
+        doc = job.to_dict()
+        doc["_id"] = doc.pop("id")
+        doc["lease_until"] = None if job.done else self._lease()
+        await (await self._collection()).replace_one({"_id": job.id}, doc, upsert=True)
+
+    @staticmethod
+    def _to_job(doc):
+        if doc is None:
+            return None
+        doc["id"] = doc.pop("_id")
+        return Job.from_dict(doc)
+
+    async def get(self, job_id: str):
+        return self._to_job(await (await self._collection()).find_one({"_id": job_id}))
+
+    async def find_active(self, key: str):
+        # Only jobs some live process still holds; an expired lease is not worth waiting on
+        return self._to_job(await (await self._collection()).find_one(
+            {"key": key, "status": {"$in": list(ACTIVE)}, "lease_until": {"$gte": datetime.utcnow()}}
+        ))
+
+    async def renew(self, job_ids: list, owner: str):
+        """Extends the lease of jobs this process still holds."""
+        if job_ids:
+            await (await self._collection()).update_many(
+                {"_id": {"$in": list(job_ids)}, "owner": owner}, {"$set": {"lease_until": self._lease()}}
+            )
+
+    async def claim_orphans(self, owner: str, kinds: list, limit: int) -> list:
+        """Takes over up to `limit` unfinished jobs (oldest first) whose lease has expired."""
+        from pymongo import ReturnDocument
+        collection = await self._collection()
+        claimed = []
+        while len(claimed) < limit:
+            doc = await collection.find_one_and_update(
+                self._orphaned(kinds),
+                {"$set": {"owner": owner, "lease_until": self._lease(), "status": QUEUED}},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                break
+            claimed.append(self._to_job(doc))
+        return claimed
+
+    async def fail_orphans(self, kinds: list, error: str) -> int:
+        """Fails orphaned jobs nobody could take, so new submissions stop joining them."""
+        result = await (await self._collection()).update_many(
+            self._orphaned(kinds),
+            {"$set": {"status": FAILED, "error": error, "finished_at": datetime.utcnow(),
+                      "payload": {}, "lease_until": None}},
+        )
+        return result.modified_count
+
+
+class JobQueue:
+    """
+    In-process async job queue with a bounded worker pool.
+    Handlers are registered per job kind; identical in-flight jobs (same key)
+    are coalesced, each run is bounded by its deadline, and the backlog is
+    capped so bursts get a fast 503 instead of piling up.
+    """
+    def __init__(self, store=None, workers: int = 4, max_queue: int = 256, deadline_seconds: float = 60.0):
+        self.store = store or MemoryJobStore()
+        self.workers = workers
+        self.max_queue = max_queue
+        self.deadline_seconds = deadline_seconds
+        self.handlers = {}
+        # Lease holder id of the jobs this process queues (set at start, after any fork)
+        self.owner = None
+
+        self._queue = None
+        self._worker_tasks = []
+        self._heartbeat = None
+        # Everything queued or running in this process: key -> job, id -> job, id -> done event
+        self._inflight: dict = {}
+        self._active: dict = {}
+        self._events: dict = {}
+
+    @classmethod
+    def from_env(cls):
+        ttl = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+        backend = os.getenv("JOB_STORE", "memory").lower()
+        if backend == "mongo":
+            store = MongoJobStore(ttl_seconds=ttl, lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "60")))
+        else:
+            store = MemoryJobStore(ttl_seconds=ttl)
+        return cls(
+            store=store,
+            workers=int(os.getenv("JOB_WORKERS", "4")),
+            max_queue=int(os.getenv("JOB_MAX_QUEUE", "256")),
+            deadline_seconds=float(os.getenv("JOB_DEADLINE_SECONDS", "60")),
+        )
+
+    def register(self, kind: str, handler):
+        """handler(**payload) -> JSON-serialisable result"""
+        self.handlers[kind] = handler
+
+    async def start(self):
+        if self._worker_tasks:
+            return
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._heartbeat = asyncio.create_task(self._renew_leases())
+        await self._recover()
+
+    async def _recover(self):
+        """
+        Re-queues work whose process stopped (expired lease) as far as the
+        backlog allows; what does not fit is failed rather than left queued.
+        """
+        kinds = list(self.handlers)
+        try:
+            recovered = await self.store.claim_orphans(self.owner, kinds, self.max_queue - self._queue.qsize())
+            for job in recovered:
+                self._track(job)
+                self._queue.put_nowait(job)
+            dropped = await self.store.fail_orphans(
+                kinds, "Job was pending when its worker stopped and could not be re-queued; submit it again"
+            )
+        except Exception as e:
+            print(f"Job recovery error: {e}")
+            return
+        if recovered or dropped:
+            print(f"🔁 Re-queued {len(recovered)} unfinished jobs, failed {dropped}")
+
+    async def _renew_leases(self):
+        interval = getattr(self.store, "lease_seconds", 60) / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.store.renew(list(self._active), self.owner)
+            except Exception as e:
+                print(f"Job lease renewal error: {e}")
+
+    async def stop(self):
+        tasks = self._worker_tasks + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._heartbeat = None
+
+    def _track(self, job: Job):
+        job.owner = self.owner
+        if job.key:
+            self._inflight[job.key] = job
+        self._active[job.id] = job
+        self._events[job.id] = asyncio.Event()
+
+    async def submit(self, kind: str, payload: dict, key: str = None, deadline_seconds: float = None) -> Job:
+        """Queues a job, or returns the in-flight job with the same key."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if key:
+            key = f"{kind}:{key}"
+            existing = self._inflight.get(key)
+            if existing is None:
+                existing = await self.store.find_active(key)
+            if existing is not None:
+                return existing
+
+        if self._queue is None:
+            await self.start()
+        if self._queue.full():
+            raise QueueFullError(f"Job queue is full ({self.max_queue} pending); retry later")
+
+        job = Job(kind, payload, key, deadline_seconds or self.deadline_seconds)
+        self._track(job)
+        await self.store.save(job)
+        self._queue.put_nowait(job)
+        return job
+
+    async def get(self, job_id: str):
+        job = self._active.get(job_id)
+        return job if job is not None else await self.store.get(job_id)
+
+    async def wait(self, job: Job, timeout: float = None) -> Job:
+        """Waits for a job to finish (or the timeout) and returns its latest state."""
+        event = self._events.get(job.id)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return await self.get(job.id) or job
+
+        # Joined a job owned by another process: poll the shared store
+        deadline = time.monotonic() + (timeout if timeout is not None else job.deadline_seconds * 2)
+        while not job.done and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+            job = await self.get(job.id) or job
+        return job
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            await self._run(job)
+
+    async def _run(self, job: Job):
+        job.status = RUNNING
+        job.started_at = datetime.utcnow()
+        await self._save(job)
+        started = time.perf_counter()
+        try:
+            job.result = await asyncio.wait_for(self.handlers[job.kind](**job.payload), job.deadline_seconds)
+            job.status = SUCCEEDED
+        except asyncio.TimeoutError:
+            job.status = FAILED
+            job.error = f"Deadline of {job.deadline_seconds:g}s exceeded"
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        # The payload is only needed to (re)run the job
+        job.payload = {}
+        await self._save(job)
+
+        if job.key and self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+        self._active.pop(job.id, None)
+        event = self._events.pop(job.id, None)
+        if event is not None:
+            event.set()
+        elapsed = time.perf_counter() - started
+        JOB_LATENCY.labels(job.kind, job.status).observe(elapsed)
+        print(f"Job {job.kind}:{job.id[:8]} {job.status} in {elapsed:.2f}s")
+
+    async def _save(self, job: Job):
+        try:
+            await self.store.save(job)
+        except Exception as e:
+            print(f"Job store error ({job.id}): {e}")
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._active),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+        }
+
+
+job_queue = JobQueue.from_env()
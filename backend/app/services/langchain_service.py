@@ -3,34 +3,63 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_ollama import ChatOllama
 from langchain_groq import ChatGroq
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
+from app.services.session_store import session_store
+from app.services.streaming import SentenceSplitter
+from app.services.report_builder import ReportBuilder
+from app.services.quiz_generator import QuizGenerator
+from app.services.quiz_bank import QuizBank, GENERAL
+from app.services.metrics import METRICS_ENABLED, LLMMetricsCallback, stage
 
 load_dotenv()
 
+@lru_cache(maxsize=None)
+def get_llm(provider: str):
+    """
+    Builds the chat model for a provider once per process and reuses it.
+    """
+    if provider == "groq":
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+        model = "llama-3.3-70b-versatile"
+        return ChatGroq(
+            temperature=0.7,
+            model_name=model,
+            api_key=api_key,
+            callbacks=_metrics_callbacks(provider, model)
+        )
+    # Default to Ollama
+    base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    model = "llama3:latest"
+    return ChatOllama(
+        model=model,
+        temperature=0.7,
+        base_url=base_url,
+        callbacks=_metrics_callbacks(provider, model)
+    )
+
+def _metrics_callbacks(provider: str, model: str):
+    return [LLMMetricsCallback(provider, model)] if METRICS_ENABLED else None
+
 class InterviewAgent:
-    def __init__(self):
+    ERROR_REPLY = "I'm having a bit of trouble connecting to my thought process. Could you repeat that?"
+
+    def __init__(self, sessions=None, reports=None):
         self.provider = os.getenv("LLM_PROVIDER", "ollama").lower()
         print(f"Initializing InterviewAgent with provider: {self.provider}")
         
-        if self.provider == "groq":
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
-                raise ValueError("GROQ_API_KEY not found in environment variables")
-            self.llm = ChatGroq(
-                temperature=0.7,
-                model_name="llama-3.3-70b-versatile",
-                api_key=api_key
-            )
-        else:
-            # Default to Ollama
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            self.llm = ChatOllama(
-                model="llama3:latest",
-                temperature=0.7,
-                base_url=base_url
-            )
-            
-        self.history = []
+        # Every agent shares one client (and its HTTP connection pool) per provider
+        self.llm = get_llm(self.provider)
+            
+        # Conversation history lives in a session-keyed store, not on the agent
+        self.sessions = sessions if sessions is not None else session_store
+        # Finished turns are folded into a running report summary in the background
+        self.reports = reports if reports is not None else ReportBuilder.from_env(self.llm)
+        # Quizzes come from the question bank first; concurrent streamed shards fill the gaps
+        self.quizzes = QuizGenerator.from_env(self.llm)
+        self.quiz_bank = QuizBank.from_env(self.quizzes)
         self.system_prompt = (
             "You are Zero, an advanced AI technical interviewer. "
             "Your goal is to assess the candidate's skills accurately while maintaining a professional and empathetic persona. "
@@ -39,143 +68,154 @@ class InterviewAgent:
             "3. Keep responses concise (under 3 sentences) to maintain conversation flow."
         )
 
-    async def generate_response(self, transcript: str, emotion_label: str) -> str:
+    async def _build_chain(self, transcript: str, emotion_label: str, session_id: str):
         """
-        Generates a response using the configured LLM provider.
+        Builds the prompt | llm | parser chain for one interview turn and
+        returns it with the question being answered (the last assistant message).
         """
-        try:
-            # Add empathetic context for nervous candidates
-            emotion_context = ""
-            if emotion_label.lower() == "nervous":
-                emotion_context = (
-                    "The candidate appears nervous. Start your response with a brief reassuring statement "
-                    "like 'No worries, take your time' or 'That's perfectly fine' or 'You're doing great' "
-                    "before proceeding with your question or feedback. Keep a warm, supportive tone."
-                )
-            
-            # Construct dynamic prompt
-            system_msg = self.system_prompt
-            if emotion_context:
-                system_msg += f"\n\nIMPORTANT: {emotion_context}"
-            
+        # Add empathetic context for nervous candidates
+        emotion_context = ""
+        if emotion_label.lower() == "nervous":
+            emotion_context = (
+                "The candidate appears nervous. Start your response with a brief reassuring statement "
+                "like 'No worries, take your time' or 'That's perfectly fine' or 'You're doing great' "
+                "before proceeding with your question or feedback. Keep a warm, supportive tone."
+            )
+        
+        # Construct dynamic prompt
+        system_msg = self.system_prompt
+        if emotion_context:
+            system_msg += f"\n\nIMPORTANT: {emotion_context}"
+        
+        with stage("history_load"):
+            history = await self.sessions.get_history(session_id)
+        with stage("prompt_build"):
             prompt = ChatPromptTemplate.from_messages([
                 ("system", system_msg),
-                *[("user", msg["content"]) if msg["role"] == "user" else ("assistant", msg["content"]) for msg in self.history[-4:]],
+                *[("user", msg["content"]) if msg["role"] == "user" else ("assistant", msg["content"]) for msg in history[-4:]],
                 ("user", f"[Emotion: {emotion_label}] {transcript}")
             ])
-            
-            chain = prompt | self.llm | StrOutputParser()
+        
+        question = next((msg["content"] for msg in reversed(history) if msg["role"] == "assistant"), "")
+        return prompt | self.llm | StrOutputParser(), question
+
+    async def generate_response(self, transcript: str, emotion_label: str, session_id: str = "default") -> str:
+        """
+        Generates a response using the configured LLM provider.
+        """
+        try:
+            chain, question = await self._build_chain(transcript, emotion_label, session_id)
             
             response = await chain.ainvoke({})
             
             # Update History
-            self.history.append({"role": "user", "content": transcript})
-            self.history.append({"role": "assistant", "content": response})
+            await self.sessions.append_turn(session_id, transcript, response)
+            self.reports.schedule_turn(session_id, question, transcript, response)
             
             return response
             
         except Exception as e:
             print(f"LLM Error ({self.provider}): {e}")
-            return "I'm having a bit of trouble connecting to my thought process. Could you repeat that?"
+            return self.ERROR_REPLY
 
-    async def generate_quiz(self, resume_text: str, domain: str):
+    async def stream_response(self, transcript: str, emotion_label: str, session_id: str = "default"):
         """
-        Generate 10 domain-specific quiz questions from resume.
-        Returns list of {question, options, correct_index}
+        Streams a response as it is generated.
+        Yields ("token", text) for every chunk, ("sentence", text) whenever a
+        sentence is complete, and a final ("done", full_text).
+        History is only written once the stream has finished.
         """
-        quiz_prompt = (
-            f"You are a technical recruiter creating a quiz for a {domain} position. "
-            f"Based on the candidate's resume below, generate EXACTLY 10 multiple-choice questions. "
-            f"Questions should test their claimed skills, experience, and domain knowledge. "
-            f"Format: Return ONLY valid JSON array with this structure:\n"
-            f"[\n"
-            f'  {{"question": "...", "options": ["A", "B", "C", "D"], "correct_index": 0}},\n'
-            f"  ...\n"
-            f"]\n\n"
-            f"Resume:\n{resume_text[:2000]}\n\n"
-            f"Generate 10 {domain}-specific questions now:"
-        )
-        
+        splitter = SentenceSplitter()
+        parts = []
         try:
-            # Use simple messages without template variables
-            from langchain_core.messages import HumanMessage, SystemMessage
-            
-            messages = [
-                SystemMessage(content="You are a technical quiz generator. Output only valid JSON."),
-                HumanMessage(content=quiz_prompt)
-            ]
+            chain, question = await self._build_chain(transcript, emotion_label, session_id)
             
-            quiz_json = await self.llm.ainvoke(messages)
+            async for chunk in chain.astream({}):
+                if not chunk:
+                    continue
+                parts.append(chunk)
+                yield "token", chunk
+                for sentence in splitter.feed(chunk):
+                    yield "sentence", sentence
             
-            # Extract content from response
-            if hasattr(quiz_json, 'content'):
-                quiz_json = quiz_json.content
+            tail = splitter.flush()
+            if tail:
+                yield "sentence", tail
             
-            # Clean and parse JSON
-            quiz_json = str(quiz_json).replace("```json", "").replace("```", "").strip()
-            
-            import json
-            questions = json.loads(quiz_json)
-            
-            # Ensure exactly 10 questions
-            if len(questions) > 10:
-                questions = questions[:10]
-            elif len(questions) < 10:
-                raise ValueError(f"Only {len(questions)} questions generated")
-            
-            return questions
+            response = "".join(parts)
+            await self.sessions.append_turn(session_id, transcript, response)
+            self.reports.schedule_turn(session_id, question, transcript, response)
+            yield "done", response
             
         except Exception as e:
-            print(f"Quiz Generation Error: {e}")
-            raise Exception(f"Failed to generate quiz: {str(e)}")
+            print(f"LLM Stream Error ({self.provider}): {e}")
+            if not parts:
+                yield "sentence", self.ERROR_REPLY
+            yield "error", self.ERROR_REPLY
 
-    async def generate_report(self, session_id: str) -> str:
+    async def generate_quiz(self, resume_text: str, domain: str, total: int = 10, seed: str = None):
         """
-        Generates a comprehensive interview report.
+        Generate domain-specific quiz questions from resume.
+        Returns list of {question, options, correct_index}
         """
-        if not self.history or len(self.history) < 2:
-            # Generate basic report if minimal conversation
-            return self._generate_basic_report()
-        
-        conversation_summary = "\n".join([
-            f"{'Candidate' if msg['role'] == 'user' else 'AI'}: {msg['content'][:200]}"
-            for msg in self.history[-10:]  # Last 10 messages
-        ])
-        
-        report_prompt = f"""
-Based on this interview conversation, generate a comprehensive candidate assessment report.
+        async for event, data in self.stream_quiz(resume_text, domain, total, seed):
+            if event == "error":
+                raise Exception(data)
+            if event == "done":
+                return data
 
-Conversation:
-{conversation_summary}
+    async def stream_quiz(self, resume_text: str, domain: str, total: int = 10, seed: str = None):
+        """
+        Streams quiz questions: banked questions for the resume's skills first
+        (shuffled per candidate via `seed`), then LLM shards for whatever the
+        bank could not cover. Yields ("question", question) for each one and a
+        final ("done", questions), or ("error", message) if nothing could be
+        generated.
+        """
+        questions = []
+        try:
+            skills = self.quiz_bank.skills_for(resume_text)
+            banked, understocked = await self.quiz_bank.assemble(domain, skills, total, seed or resume_text)
+            for question in banked:
+                questions.append(question)
+                yield "question", question
 
-Generate a detailed JSON report with:
-- overall_score (0-100)
-- strengths (list of 3-5 strengths)
-- weaknesses (list of 3-5 areas for improvement)
-- summary (2-3 sentence overall assessment)
-- recommendation (hire/consider/reject with explanation)
+            if len(questions) < total:
+                # Gap questions are written from this resume, so they are never banked;
+                # the bank is only stocked by the resume-free fill jobs below
+                async for question in self.quizzes.stream(
+                    resume_text, domain, total - len(questions),
+                    skills=[skill for skill in understocked if skill != GENERAL] or None,
+                    exclude=[q["question"] for q in questions],
+                ):
+                    questions.append(question)
+                    yield "question", question
 
-Return ONLY valid JSON.
-"""
-        
+            await self.quiz_bank.schedule_fill(domain, understocked)
+            yield "done", questions
+        except Exception as e:
+            print(f"Quiz Generation Error: {e}")
+            if questions:
+                yield "done", questions
+            else:
+                yield "error", f"Failed to generate quiz: {str(e)}"
+
+    async def generate_report(self, session_id: str) -> str:
+        """
+        Returns the interview report, merged from the running per-turn summary
+        and stored on the interview so repeat requests are served as-is.
+        """
         try:
-            from langchain_core.messages import HumanMessage, SystemMessage
-            
-            messages = [
-                SystemMessage(content="You are an expert technical interviewer creating assessment reports."),
-                HumanMessage(content=report_prompt)
-            ]
-            
-            response = await self.llm.ainvoke(messages)
-            
-            if hasattr(response, 'content'):
-                response = response.content
-            
-            return str(response)
-            
+            history = await self.sessions.get_history(session_id)
+            report = await self.reports.build_report(session_id, history)
         except Exception as e:
             print(f"Report Generation Error: {e}")
+            report = None
+        if report is None:
+            # Nothing assessable yet (minimal conversation or LLM unavailable)
             return self._generate_basic_report()
+        import json
+        return json.dumps(report)
     
     def _generate_basic_report(self) -> str:
         """Generate a basic report when conversation history is minimal."""
@@ -0,0 +1,160 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from pymongo import monitoring
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Adds a Server-Timing header with per-stage durations to every response
+TIMING_HEADER = os.getenv("METRICS_TIMING_HEADER", "false").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+HTTP_REQUESTS = Counter("zara_http_requests_total", "HTTP requests", ["method", "route", "status"])
+HTTP_LATENCY = Histogram("zara_http_request_seconds", "HTTP request latency (until headers are sent)",
+                         ["method", "route"], buckets=LATENCY_BUCKETS)
+STAGE_LATENCY = Histogram("zara_stage_seconds", "Latency of internal request stages", ["stage"], buckets=LATENCY_BUCKETS)
+
+LLM_LATENCY = Histogram("zara_llm_call_seconds", "LLM call latency", ["provider", "model", "mode"], buckets=LATENCY_BUCKETS)
+LLM_TTFT = Histogram("zara_llm_time_to_first_token_seconds", "Time to first streamed token",
+                     ["provider", "model"], buckets=LATENCY_BUCKETS)
+LLM_TOKENS = Histogram("zara_llm_tokens", "Tokens per LLM call", ["provider", "model", "kind"], buckets=TOKEN_BUCKETS)
+LLM_ERRORS = Counter("zara_llm_errors_total", "Failed LLM calls", ["provider", "model"])
+
+DB_LATENCY = Histogram("zara_db_command_seconds", "MongoDB command latency", ["command", "status"], buckets=DB_BUCKETS)
+
+JOB_LATENCY = Histogram("zara_job_seconds", "Background job run time", ["kind", "status"], buckets=LATENCY_BUCKETS)
+
+# Stage durations (ms) for the current request, used for the Server-Timing header
+_request_stages: ContextVar = ContextVar("request_stages", default=None)
+
+
+def observe_stage(stage: str, seconds: float):
+    if not METRICS_ENABLED:
+        return
+    STAGE_LATENCY.labels(stage).observe(seconds)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0.0) + seconds * 1000
+
+
+@contextmanager
+def stage(name: str):
+    """Times a block as one request stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - started)
+
+
+def start_request_timing() -> dict:
+    stages = {}
+    _request_stages.set(stages)
+    return stages
+
+
+def server_timing(stages: dict, total_seconds: float) -> str:
+    parts = [f"{name.replace(' ', '_')};dur={ms:.1f}" for name, ms in stages.items()]
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def route_label(scope: dict) -> str:
+    """
+    Route template for a request ("/api/report/{session_id}"), never the raw
+    path, so label cardinality stays bounded. Some FastAPI versions only
+    expose the template relative to the included router; the prefix is then
+    taken from the raw path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path
+    depth = template.count("/")
+    path = scope.get("path", "")
+    prefix = path.rsplit("/", depth)[0] if path.count("/") > depth else ""
+    return prefix + template
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Prometheus exposition payload and content type. Under serve.py with
+    several workers, PROMETHEUS_MULTIPROC_DIR is set and the payload
+    aggregates every worker, whichever one answers the scrape.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    LangChain callback recording latency, time to first token and token
+    counts for every call made through a chat model.
+    """
+    run_inline = True
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._runs = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._runs[run_id] = [time.perf_counter(), False]
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._runs[run_id] = [time.perf_counter(), False]
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and not run[1]:
+            run[1] = True
+            elapsed = time.perf_counter() - run[0]
+            LLM_TTFT.labels(self.provider, self.model).observe(elapsed)
+            observe_stage("llm_first_token", elapsed)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        elapsed = time.perf_counter() - run[0]
+        LLM_LATENCY.labels(self.provider, self.model, "stream" if run[1] else "invoke").observe(elapsed)
+        observe_stage("llm", elapsed)
+
+        usage = None
+        try:
+            message = response.generations[0][0].message
+            usage = getattr(message, "usage_metadata", None)
+        except (AttributeError, IndexError):
+            pass
+        if usage:
+            LLM_TOKENS.labels(self.provider, self.model, "prompt").observe(usage.get("input_tokens", 0))
+            LLM_TOKENS.labels(self.provider, self.model, "completion").observe(usage.get("output_tokens", 0))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._runs.pop(run_id, None)
+        LLM_ERRORS.labels(self.provider, self.model).inc()
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener feeding DB latency histograms (runs on the driver's threads)."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        DB_LATENCY.labels(event.command_name, "ok").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        DB_LATENCY.labels(event.command_name, "error").observe(event.duration_micros / 1e6)
@@ -1,6 +1,7 @@
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient
 import os
 import asyncio
+import random
 
 class InterviewOrchestrator:
     """
@@ -11,8 +12,27 @@ class InterviewOrchestrator:
         # Fallback to a free model if no key is present instantly, 
         # but User promised keys. We'll default to 'meta-llama/Meta-Llama-3-70B-Instruct'
         # Note: This requires HF_TOKEN in env or login.
-        self.model_id = "meta-llama/Meta-Llama-3-70B-Instruct" 
-        self.client = InferenceClient(token=os.getenv("HF_TOKEN"))
+        self.model_id = os.getenv("HF_MODEL_ID", "meta-llama/Meta-Llama-3-70B-Instruct")
+        # Async client so an LLM call never blocks the event loop.
+        # HF_BASE_URL points at any OpenAI-compatible endpoint (TGI, a local stub, ...)
+        self.client = AsyncInferenceClient(base_url=os.getenv("HF_BASE_URL"), token=os.getenv("HF_TOKEN"))
+
+        # Per-call deadline and bounded retries with jittered exponential backoff
+        self.timeout = float(os.getenv("HF_TIMEOUT_SECONDS", "20"))
+        self.max_retries = int(os.getenv("HF_MAX_RETRIES", "2"))
+        self.retry_base_delay = float(os.getenv("HF_RETRY_BASE_DELAY", "0.25"))
+        self.retry_max_delay = float(os.getenv("HF_RETRY_MAX_DELAY", "2"))
+
+        # Hedging: if the primary has not answered within the SLO, race a second
+        # provider (when configured) or give up and use the local fallback.
+        self.hedge_after = float(os.getenv("HF_HEDGE_AFTER_SECONDS", "0")) or None
+        self.secondary_model_id = os.getenv("HF_SECONDARY_MODEL_ID")
+        self.secondary_client = None
+        if self.secondary_model_id:
+            self.secondary_client = AsyncInferenceClient(
+                base_url=os.getenv("HF_SECONDARY_BASE_URL"),
+                token=os.getenv("HF_SECONDARY_TOKEN", os.getenv("HF_TOKEN"))
+            )
         
         self.system_prompt = (
             "You are Zero, an advanced AI technical interviewer. "
@@ -47,16 +67,8 @@ class InterviewOrchestrator:
             return self._fallback_logic(transcript, emotion_label)
 
         try:
-            # Call HF Inference
-            # Streaming is better for latency, but blocking is easier for first pass
-            response = self.client.chat_completion(
-                model=self.model_id,
-                messages=messages,
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            ai_text = response.choices[0].message.content
+            # Call HF Inference (async, with deadline/retries/hedging)
+            ai_text = await self._hedged_completion(messages, max_tokens=150, temperature=0.7)
             
             # Update History
             self.history.append({"role": "user", "content": transcript})
@@ -69,6 +81,69 @@ class InterviewOrchestrator:
             # Fallback if API fails (e.g. no key yet)
             return self._fallback_logic(transcript, emotion_label)
 
+    async def _completion(self, client, model, messages, max_tokens, temperature) -> str:
+        """
+        One chat completion with a per-attempt deadline and bounded retries.
+        Client errors (4xx other than 429) are not retried.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await asyncio.wait_for(
+                    client.chat_completion(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    ),
+                    timeout=self.timeout
+                )
+                return response.choices[0].message.content
+            except Exception as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                retryable = status is None or status == 429 or status >= 500
+                if attempt == self.max_retries or not retryable:
+                    raise
+                # Full jitter keeps concurrent retries from hammering the provider in lockstep
+                delay = min(self.retry_base_delay * (2 ** attempt), self.retry_max_delay)
+                print(f"HF Inference retry {attempt + 1}/{self.max_retries} after error: {e}")
+                await asyncio.sleep(random.uniform(0, delay))
+
+    async def _hedged_completion(self, messages, max_tokens, temperature) -> str:
+        """
+        Runs the primary completion; if it misses the hedge SLO, races the
+        secondary provider or raises TimeoutError so the caller falls back.
+        """
+        primary = asyncio.create_task(
+            self._completion(self.client, self.model_id, messages, max_tokens, temperature)
+        )
+        if self.hedge_after is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if done:
+                return primary.result()
+
+            if self.secondary_client is None:
+                raise asyncio.TimeoutError(f"Primary missed {self.hedge_after}s SLO")
+
+            print(f"Hedging: primary missed {self.hedge_after}s SLO, racing {self.secondary_model_id}")
+            tasks.add(asyncio.create_task(
+                self._completion(self.secondary_client, self.secondary_model_id, messages, max_tokens, temperature)
+            ))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
     def _fallback_logic(self, transcript, emotion_label):
         """Temporary local fallback if HF API Key is missing."""
         if "nervous" in emotion_label.lower():
@@ -106,13 +181,7 @@ class InterviewOrchestrator:
         ]
         
         try:
-            response = self.client.chat_completion(
-                model=self.model_id,
-                messages=messages,
-                max_tokens=500,
-                temperature=0.2
-            )
-            report_json = response.choices[0].message.content
+            report_json = await self._hedged_completion(messages, max_tokens=500, temperature=0.2)
             # Cleanup Markdown if present
             report_json = report_json.replace("```json", "").replace("```", "").strip()
             
@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import os
+import random
+from datetime import datetime
+from dotenv import load_dotenv
+from app.services.quiz_generator import DIFFICULTIES, extract_skills, question_key
+
+load_dotenv()
+
+GENERAL = "General"
+
+
+class QuizBank:
+    """
+    Persistent question bank indexed by domain, skill and difficulty.
+    A quiz is assembled from the bank for the resume's skills (one indexed
+    lookup per skill), shuffled per candidate; the LLM only fills what the
+    bank cannot cover, and under-stocked skills are topped up in background
+    jobs, so LLM spend grows with distinct skills rather than candidates.
+    """
+    def __init__(
+        self,
+        generator,
+        repository=None,
+        enabled: bool = True,
+        target_per_skill: int = 20,
+        max_skills: int = 10,
+        fill_timeout: float = 120,
+    ):
+        self.generator = generator
+        self.enabled = enabled
+        self.target_per_skill = target_per_skill
+        self.max_skills = max_skills
+        self.fill_timeout = fill_timeout
+        self._repository = repository
+
+    @classmethod
+    def from_env(cls, generator):
+        return cls(
+            generator,
+            enabled=os.getenv("QUIZ_BANK_ENABLED", "true").lower() in ("1", "true", "yes"),
+            target_per_skill=int(os.getenv("QUIZ_BANK_TARGET_PER_SKILL", "20")),
+            max_skills=int(os.getenv("QUIZ_BANK_MAX_SKILLS", "10")),
+        )
+
+    @property
+    def repository(self):
+        if self._repository is None:
+            from app.db.repositories import quiz_items
+            self._repository = quiz_items
+        return self._repository
+
+    @staticmethod
+    def normalize_domain(domain: str) -> str:
+        return domain.strip().lower()
+
+    @staticmethod
+    def item_id(domain: str, question: str) -> str:
+        return hashlib.sha1(f"{domain}|{question_key(question)}".encode("utf-8")).hexdigest()
+
+    def skills_for(self, resume_text: str) -> list:
+        return extract_skills(resume_text, limit=self.max_skills)
+
+    async def lookup(self, domain: str, skills: list) -> dict:
+        """
+        {skill: [items]}: a random draw of up to target_per_skill items per
+        skill and difficulty (one indexed query each), fetched concurrently.
+        """
+        queries = [(skill, difficulty) for skill in skills for difficulty in DIFFICULTIES]
+        results = await asyncio.gather(
+            *[self.repository.find(domain, skill, self.target_per_skill, difficulty=difficulty, sample=True)
+              for skill, difficulty in queries],
+            return_exceptions=True,
+        )
+        pools = {skill: [] for skill in skills}
+        for (skill, difficulty), result in zip(queries, results):
+            if isinstance(result, Exception):
+                print(f"Quiz bank lookup error ({domain}/{skill}/{difficulty}): {result}")
+                result = []
+            pools[skill].extend(result)
+        return pools
+
+    @staticmethod
+    def pick(pools: dict, total: int, seed: str) -> list:
+        """
+        Up to `total` distinct questions spread round-robin over the skills,
+        shuffled with a per-candidate seed, ordered easy -> hard.
+        """
+        rng = random.Random(seed)
+        queues = []
+        for skill in pools:
+            items = list(pools[skill])
+            rng.shuffle(items)
+            queues.append(items)
+        rng.shuffle(queues)
+
+        picked, seen = [], set()
+        while len(picked) < total and any(queues):
+            for items in queues:
+                while items:
+                    item = items.pop()
+                    key = question_key(item["question"])
+                    if key not in seen:
+                        seen.add(key)
+                        picked.append(item)
+                        break
+                if len(picked) >= total:
+                    break
+        picked.sort(key=lambda item: DIFFICULTIES.index(item.get("difficulty", "medium")))
+        return [{key: value for key, value in item.items() if key != "_id"} for item in picked]
+
+    async def assemble(self, domain: str, skills: list, total: int, seed: str) -> tuple:
+        """Returns (questions from the bank, skills below the stock target)."""
+        if not self.enabled:
+            return [], []
+        domain = self.normalize_domain(domain)
+        pools = await self.lookup(domain, skills or [GENERAL])
+        understocked = [skill for skill, items in pools.items() if len(items) < self.target_per_skill]
+        return self.pick(pools, total, seed), understocked
+
+    async def add(self, domain: str, questions: list) -> int:
+        """Stores generated questions in the bank; returns how many were new."""
+        if not self.enabled or not questions:
+            return 0
+        domain = self.normalize_domain(domain)
+        now = datetime.utcnow()
+        items = [
+            {
+                "_id": self.item_id(domain, q["question"]),
+                "domain": domain,
+                "skill": q.get("skill") or GENERAL,
+                "difficulty": q.get("difficulty", "medium"),
+                "question": q["question"],
+                "options": q["options"],
+                "correct_index": q["correct_index"],
+                "created_at": now,
+            }
+            for q in questions
+        ]
+        try:
+            return await self.repository.insert_many(items)
+        except Exception as e:
+            print(f"Quiz bank write error ({domain}): {e}")
+            return 0
+
+    async def fill(self, domain: str, skill: str) -> dict:
+        """Tops one skill up to target_per_skill questions (job handler)."""
+        domain = self.normalize_domain(domain)
+        existing = await self.repository.find(domain, skill, self.target_per_skill)
+        missing = self.target_per_skill - len(existing)
+        if missing <= 0:
+            return {"domain": domain, "skill": skill, "added": 0}
+        questions = []
+        try:
+            async for question in self.generator.stream(
+                "", domain, missing,
+                skills=None if skill == GENERAL else [skill],
+                exclude=[item["question"] for item in existing],
+            ):
+                question["skill"] = skill
+                questions.append(question)
+        except ValueError as e:
+            print(f"Quiz bank fill error ({domain}/{skill}): {e}")
+        added = await self.add(domain, questions)
+        print(f"🗃️ Quiz bank: +{added} {domain}/{skill}")
+        return {"domain": domain, "skill": skill, "added": added}
+
+    async def schedule_fill(self, domain: str, skills: list):
+        """Queues background top-ups for under-stocked skills (one job per domain/skill at a time)."""
+        if not self.enabled:
+            return
+        from app.services.jobs import job_queue, QueueFullError
+        domain = self.normalize_domain(domain)
+        for skill in skills:
+            try:
+                await job_queue.submit(
+                    "quiz_bank_fill", {"domain": domain, "skill": skill},
+                    key=f"{domain}:{skill}", deadline_seconds=self.fill_timeout,
+                )
+            except (QueueFullError, ValueError) as e:
+                # Queue full or no filler registered in this process; the next quiz retries
+                print(f"Quiz bank fill not scheduled ({domain}/{skill}): {e}")
+                return
@@ -0,0 +1,95 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.services.cache import TTLCache
+from app.services.shared_state import state_backend
+
+load_dotenv()
+
+
+class QuizCache:
+    """
+    Caches generated quizzes by resume text hash + domain.
+    Memory tier (LRU/TTL) in front of the shared state backend (when several
+    workers run) and an optional Mongo tier shared across restarts.
+    """
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 86400, use_mongo: bool = False, state=None):
+        self.ttl_seconds = ttl_seconds
+        self.use_mongo = use_mongo
+        self.state = state if state is not None and state.shared else None
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._index_ready = False
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", "2048")),
+            ttl_seconds=float(os.getenv("QUIZ_CACHE_TTL_SECONDS", "86400")),
+            use_mongo=os.getenv("QUIZ_CACHE_MONGO", "false").lower() in ("1", "true", "yes"),
+            state=state_backend,
+        )
+
+    @staticmethod
+    def make_key(domain: str, resume_text: str) -> str:
+        """
+        Key on a hash of the resume text computed here, never on a hash sent by
+        the client, which could name another resume's cached quiz.
+        """
+        text_hash = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+        return f"{text_hash}:{domain.strip().lower()}"
+
+    async def get(self, key: str):
+        questions = self.memory.get(key)
+        if questions is not None:
+            return questions
+        if self.state is not None:
+            try:
+                questions = await self.state.get(f"quiz:{key}")
+            except Exception as e:
+                print(f"Quiz cache shared read error: {e}")
+            if questions is not None:
+                self.memory.set(key, questions)
+                return questions
+        if not self.use_mongo:
+            return None
+        try:
+            from app.db.config import get_quiz_cache_collection
+            doc = await get_quiz_cache_collection().find_one(
+                {"_id": key, "created_at": {"$gte": datetime.utcnow() - timedelta(seconds=self.ttl_seconds)}},
+                {"questions": 1},
+            )
+        except Exception as e:
+            print(f"Quiz cache read error: {e}")
+            return None
+        if doc:
+            self.memory.set(key, doc["questions"])
+            return doc["questions"]
+        return None
+
+    async def set(self, key: str, questions: list):
+        self.memory.set(key, questions)
+        if self.state is not None:
+            try:
+                await self.state.set(f"quiz:{key}", questions, ttl=self.ttl_seconds)
+            except Exception as e:
+                print(f"Quiz cache shared write error: {e}")
+        if not self.use_mongo:
+            return
+        try:
+            from app.db.config import get_quiz_cache_collection
+            collection = get_quiz_cache_collection()
+            if not self._index_ready:
+                # Let Mongo expire old entries on its own
+                await collection.create_index("created_at", expireAfterSeconds=int(self.ttl_seconds))
+                self._index_ready = True
+            await collection.replace_one(
+                {"_id": key},
+                {"questions": questions, "created_at": datetime.utcnow()},
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"Quiz cache write error: {e}")
+
+
+quiz_cache = QuizCache.from_env()
@@ -0,0 +1,243 @@
+import asyncio
+import os
+import re
+from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage, SystemMessage
+from app.services.streaming import JSONArrayParser
+from app.services.skill_taxonomy import default_taxonomy
+
+load_dotenv()
+
+# "Skills: Python, Go, ..." or a "Skills" heading followed by a list
+_SKILLS_SECTION = re.compile(r"(?im)^\s*(?:technical\s+)?skills\b[^\n:]*:?\s*(.*(?:\n(?!\s*\n).*)*)")
+_SKILL_SPLIT = re.compile(r"[,;|•·\n/]+")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def extract_skills(resume_text: str, limit: int = 12) -> list:
+    """
+    Canonical taxonomy skills mentioned in the resume, in order of first
+    appearance; falls back to the entries of its skills section.
+    """
+    skills = default_taxonomy().extract(resume_text or "")
+    if skills:
+        return skills[:limit]
+    match = _SKILLS_SECTION.search(resume_text or "")
+    if not match:
+        return []
+    skills = {}
+    for part in _SKILL_SPLIT.split(match.group(1)):
+        skill = part.strip(" -*\t.").strip()
+        if 1 < len(skill) <= 40 and skill.lower() not in skills:
+            skills[skill.lower()] = skill
+    return list(skills.values())[:limit]
+
+
+def question_key(question: str) -> str:
+    """Normalized question text used for de-duplication."""
+    return re.sub(r"\W+", " ", question.lower()).strip()
+
+
+def validate_question(item) -> dict:
+    """Normalized {question, options, correct_index, difficulty[, skill]}, or None if the item is unusable."""
+    if not isinstance(item, dict):
+        return None
+    question = item.get("question")
+    options = item.get("options")
+    correct_index = item.get("correct_index")
+    if not isinstance(question, str) or not question.strip():
+        return None
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(o, (str, int, float)) for o in options):
+        return None
+    try:
+        correct_index = int(correct_index)
+    except (TypeError, ValueError):
+        return None
+    if not 0 <= correct_index < len(options):
+        return None
+    difficulty = str(item.get("difficulty", "")).strip().lower()
+    result = {
+        "question": question.strip(),
+        "options": [str(o).strip() for o in options],
+        "correct_index": correct_index,
+        "difficulty": difficulty if difficulty in DIFFICULTIES else "medium",
+    }
+    if isinstance(item.get("skill"), str) and item["skill"].strip():
+        result["skill"] = item["skill"].strip()
+    return result
+
+
+class QuizGenerator:
+    """
+    Generates a quiz as several small concurrent LLM requests ("shards") of a
+    few questions each, spread over the resume's skills. Every shard is
+    streamed through an incremental JSON parser, so questions are yielded as
+    soon as they are complete, and a failed or short shard is retried on its
+    own for the questions it still owes.
+    """
+    def __init__(self, llm, shard_size: int = 3, concurrency: int = 8, retries: int = 2, shard_timeout: float = 45):
+        self.llm = llm
+        self.shard_size = max(1, shard_size)
+        self.retries = retries
+        self.shard_timeout = shard_timeout
+        # Process-wide cap on in-flight shard calls
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+
+    @classmethod
+    def from_env(cls, llm):
+        return cls(
+            llm,
+            shard_size=int(os.getenv("QUIZ_SHARD_SIZE", "3")),
+            concurrency=int(os.getenv("QUIZ_SHARD_CONCURRENCY", "8")),
+            retries=int(os.getenv("QUIZ_SHARD_RETRIES", "2")),
+            shard_timeout=float(os.getenv("QUIZ_SHARD_TIMEOUT_SECONDS", "45")),
+        )
+
+    def plan(self, resume_text: str, domain: str, total: int, skills: list = None) -> list:
+        """
+        Splits the quiz into (count, focus skills) shards, dealing skills
+        round-robin; with fewer skills than shards they are reused so every
+        shard has a focus.
+        """
+        counts = [self.shard_size] * (total // self.shard_size)
+        if total % self.shard_size:
+            counts.append(total % self.shard_size)
+        skills = skills if skills is not None else extract_skills(resume_text)
+        focus = [[] for _ in counts]
+        if skills:
+            for i in range(max(len(skills), len(counts))):
+                skill = skills[i % len(skills)]
+                if skill not in focus[i % len(counts)]:
+                    focus[i % len(counts)].append(skill)
+        return list(zip(counts, focus))
+
+    def _messages(self, resume_text: str, domain: str, count: int, focus: list, avoid: list) -> list:
+        topic = f"Focus on these skills: {', '.join(focus)}. " if focus else ""
+        skill_field = f'"skill": "{focus[0]}", ' if focus else ""
+        avoid_text = ""
+        if avoid:
+            avoid_text = "Do not repeat these questions:\n" + "\n".join(f"- {q}" for q in avoid[-10:]) + "\n\n"
+        if resume_text:
+            source = (
+                f"Based on the candidate's resume below, generate EXACTLY {count} multiple-choice questions. "
+                f"Questions should test their claimed skills, experience, and domain knowledge. "
+            )
+            resume = f"Resume:\n{resume_text[:2000]}\n\n"
+        else:
+            # Question bank fills are not tied to one candidate
+            source = f"Generate EXACTLY {count} multiple-choice questions testing practical, job-relevant knowledge. "
+            resume = ""
+        prompt = (
+            f"You are a technical recruiter creating a quiz for a {domain} position. "
+            f"{source}{topic}"
+            f"Format: Return ONLY valid JSON array with this structure:\n"
+            f"[\n"
+            f'  {{{skill_field}"difficulty": "easy|medium|hard", "question": "...", "options": ["A", "B", "C", "D"], "correct_index": 0}},\n'
+            f"  ...\n"
+            f"]\n\n"
+            f"{avoid_text}"
+            f"{resume}"
+            f"Generate {count} {domain}-specific questions now:"
+        )
+        return [
+            SystemMessage(content="You are a technical quiz generator. Output only valid JSON."),
+            HumanMessage(content=prompt),
+        ]
+
+    async def _stream_shard(self, messages: list, done, accept):
+        """Streams one shard call, handing each valid question to accept() until done() says the shard is full."""
+        parser = JSONArrayParser()
+        stream = self.llm.astream(messages)
+        try:
+            async for chunk in stream:
+                text = getattr(chunk, "content", chunk)
+                for item in parser.feed(str(text or "")):
+                    question = validate_question(item)
+                    if question is not None:
+                        accept(question)
+                        if done():
+                            return
+        finally:
+            await stream.aclose()
+
+    async def _run_shard(self, resume_text: str, domain: str, count: int, focus: list, accept, seen_questions: list):
+        # Counted outside the call so questions from a timed-out attempt are kept
+        accepted = [0]
+        focus_names = {skill.lower(): skill for skill in focus}
+
+        def take(question: dict):
+            # Tag with one of this shard's skills so the question can be banked under it
+            if focus:
+                question["skill"] = focus_names.get(question.get("skill", "").lower(), focus[0])
+            else:
+                question.pop("skill", None)
+            if accepted[0] < count and accept(question):
+                accepted[0] += 1
+
+        def done() -> bool:
+            return accepted[0] >= count
+
+        for attempt in range(self.retries + 1):
+            if done():
+                return
+            # Retries list what the quiz already has so the shard does not repeat it
+            messages = self._messages(resume_text, domain, count - accepted[0], focus, seen_questions if attempt else [])
+            try:
+                async with self._slots:
+                    await asyncio.wait_for(self._stream_shard(messages, done, take), timeout=self.shard_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Quiz shard error (attempt {attempt + 1}, {count - accepted[0]} left): {e!r}")
+        if not done():
+            print(f"Quiz shard gave up with {count - accepted[0]} question(s) missing")
+
+    async def stream(self, resume_text: str, domain: str, total: int = 10, skills: list = None, exclude: list = None):
+        """
+        Yields valid, de-duplicated questions in arrival order, at most `total`.
+        `skills` overrides the skills taken from the resume; questions in
+        `exclude` (already asked) are never yielded. Raises if no shard
+        produced anything.
+        """
+        queue = asyncio.Queue()
+        seen = {question_key(q) for q in exclude or []}
+        seen_questions = list(exclude or [])
+
+        def accept(question: dict) -> bool:
+            key = question_key(question["question"])
+            if key in seen:
+                return False
+            seen.add(key)
+            seen_questions.append(question["question"])
+            queue.put_nowait(question)
+            return True
+
+        async def run(count, focus):
+            try:
+                await self._run_shard(resume_text, domain, count, focus, accept, seen_questions)
+            finally:
+                queue.put_nowait(None)
+
+        tasks = [asyncio.create_task(run(count, focus)) for count, focus in self.plan(resume_text, domain, total, skills)]
+        produced = 0
+        running = len(tasks)
+        try:
+            while running and produced < total:
+                question = await queue.get()
+                if question is None:
+                    running -= 1
+                    continue
+                produced += 1
+                yield question
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if produced == 0:
+            raise ValueError("No valid quiz questions were generated")
+        if produced < total:
+            print(f"Quiz generated {produced}/{total} questions")
+
+    async def generate(self, resume_text: str, domain: str, total: int = 10, skills: list = None) -> list:
+        return [question async for question in self.stream(resume_text, domain, total, skills)]
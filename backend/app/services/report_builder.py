@@ -0,0 +1,314 @@
+import asyncio
+import json
+import os
+from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage, SystemMessage
+from app.services.cache import TTLCache
+from app.services.shared_state import state_backend
+
+load_dotenv()
+
+FOLD_PROMPT = """
+Assess ONE answer from a technical interview.
+
+Interviewer's question: {question}
+Candidate's answer: {answer}
+Interviewer's follow-up: {reply}
+
+Return ONLY valid JSON:
+{{"skills": [skills the candidate demonstrated], "gaps": [weaknesses or missing knowledge shown], "score": 0-100 quality of this answer, "note": "one sentence on this answer"}}
+"""
+
+
+class InterviewSummary:
+    """Running structured summary of one interview, updated turn by turn."""
+    __slots__ = ("turns", "scores", "skills", "gaps", "notes", "report")
+
+    MAX_NOTES = 20
+
+    def __init__(self):
+        self.turns = 0
+        self.scores = []
+        # lower-cased name -> [display name, mentions]
+        self.skills = {}
+        self.gaps = {}
+        # (score, note) pairs
+        self.notes = []
+        self.report = None
+
+    def fold(self, delta: dict):
+        """Merges one turn's assessment. Turns are independent, so order does not matter."""
+        self.turns += 1
+        score = delta.get("score")
+        if isinstance(score, (int, float)):
+            score = max(0, min(100, float(score)))
+            self.scores.append(score)
+        for field, target in (("skills", self.skills), ("gaps", self.gaps)):
+            for name in delta.get(field) or []:
+                name = str(name).strip()
+                if name:
+                    target.setdefault(name.lower(), [name, 0])[1] += 1
+        note = str(delta.get("note") or "").strip()
+        if note:
+            if note[-1] not in ".!?":
+                note += "."
+            self.notes.append((score if isinstance(score, float) else 50.0, note))
+            if len(self.notes) > self.MAX_NOTES:
+                # Keep the extremes; they are what the final summary quotes
+                self.notes.sort(key=lambda n: n[0])
+                del self.notes[len(self.notes) // 2]
+        self.report = None
+
+    def to_dict(self) -> dict:
+        # Skill names ("node.js", ".net") are not valid Mongo keys, so counts are stored as lists
+        return {
+            "turns": self.turns,
+            "scores": self.scores,
+            "skills": [{"name": name, "count": count} for name, count in self.skills.values()],
+            "gaps": [{"name": name, "count": count} for name, count in self.gaps.values()],
+            "notes": self.notes,
+        }
+
+    @staticmethod
+    def _counts(entries) -> dict:
+        if isinstance(entries, dict):
+            # Summaries stored before counts became lists
+            return {key: list(value) for key, value in entries.items()}
+        return {entry["name"].lower(): [entry["name"], entry["count"]] for entry in entries or []}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InterviewSummary":
+        summary = cls()
+        summary.turns = data.get("turns", 0)
+        summary.scores = list(data.get("scores", []))
+        summary.skills = cls._counts(data.get("skills"))
+        summary.gaps = cls._counts(data.get("gaps"))
+        summary.notes = [tuple(n) for n in data.get("notes", [])]
+        return summary
+
+    @staticmethod
+    def _top(entries: dict, limit: int = 5, exclude: set = ()) -> list:
+        ranked = sorted(
+            (value for key, value in entries.items() if key not in exclude),
+            key=lambda value: -value[1]
+        )
+        return [name for name, _ in ranked[:limit]]
+
+    def merge(self) -> dict:
+        """Final report from the running summary; no LLM call."""
+        overall = round(sum(self.scores) / len(self.scores)) if self.scores else 50
+        strengths = self._top(self.skills)
+        weaknesses = self._top(self.gaps, exclude=set(self.skills))
+
+        summary = f"Assessed over {self.turns} answer{'s' if self.turns != 1 else ''} with an average score of {overall}/100."
+        if self.notes:
+            ordered = sorted(self.notes, key=lambda n: n[0])
+            summary += f" Strongest answer: {ordered[-1][1]}"
+            if len(ordered) > 1:
+                summary += f" Weakest answer: {ordered[0][1]}"
+
+        if overall >= 75:
+            recommendation = "Hire - consistently strong answers across the interview."
+        elif overall >= 55:
+            recommendation = "Consider - solid in places; probe the listed gaps in the next round."
+        else:
+            recommendation = "No Hire - answers did not meet the bar for this role."
+
+        return {
+            "overall_score": overall,
+            "strengths": strengths or ["Engaged with the interview process"],
+            "weaknesses": weaknesses or ["No significant gaps observed"],
+            "summary": summary,
+            "recommendation": recommendation,
+            "turns_assessed": self.turns,
+        }
+
+
+class ReportBuilder:
+    """
+    Folds every finished interview turn into a running summary in the
+    background, so the final report is a cheap merge instead of one large
+    LLM call over a truncated transcript. Reports are stored on the
+    interview document and served from there until new turns arrive.
+
+    With a shared state backend (several worker processes) each turn's
+    assessment is appended to a shared list and every worker rebuilds the
+    summary from it, so turns folded on different workers are never lost
+    to a read-modify-write race; the in-process cache is not used.
+    """
+    MAX_TURNS = 500
+
+    def __init__(
+        self,
+        llm,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 6 * 3600,
+        concurrency: int = 4,
+        wait_seconds: float = 15.0,
+        persist: bool = True,
+        state=None,
+    ):
+        self.llm = llm
+        self.summaries = TTLCache(max_entries=max_sessions, ttl_seconds=ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.persist = persist
+        self.state = state if state is not None and state.shared else None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: dict = {}
+
+    @classmethod
+    def from_env(cls, llm):
+        return cls(
+            llm,
+            max_sessions=int(os.getenv("REPORT_SUMMARY_MAX_SESSIONS", "10000")),
+            ttl_seconds=float(os.getenv("REPORT_SUMMARY_TTL_SECONDS", str(6 * 3600))),
+            concurrency=int(os.getenv("REPORT_FOLD_CONCURRENCY", "4")),
+            wait_seconds=float(os.getenv("REPORT_FOLD_WAIT_SECONDS", "15")),
+            persist=os.getenv("REPORT_PERSIST", "true").lower() in ("1", "true", "yes"),
+            state=state_backend,
+        )
+
+    def _summary(self, session_id: str) -> InterviewSummary:
+        summary = self.summaries.get(session_id)
+        if summary is None:
+            summary = InterviewSummary()
+            self.summaries.set(session_id, summary)
+        return summary
+
+    def schedule_turn(self, session_id: str, question: str, answer: str, reply: str):
+        """Queues a finished turn (question, answer, follow-up) for background folding (fire and forget)."""
+        task = asyncio.create_task(self.fold_turn(session_id, question, answer, reply))
+        tasks = self._tasks.setdefault(session_id, set())
+        tasks.add(task)
+
+        def _done(t):
+            tasks.discard(t)
+            if not tasks:
+                self._tasks.pop(session_id, None)
+        task.add_done_callback(_done)
+
+    async def fold_turn(self, session_id: str, question: str, answer: str, reply: str):
+        delta = await self._assess_turn(question, answer, reply)
+        if delta is None:
+            return
+        if self.state is not None:
+            await self._append_shared(session_id, delta)
+            await self._save(session_id, await self._load(session_id))
+            return
+        summary = await self._load(session_id)
+        summary.fold(delta)
+        await self._save(session_id, summary)
+
+    async def _assess_turn(self, question: str, answer: str, reply: str):
+        messages = [
+            SystemMessage(content="You are an expert technical interviewer. Output only valid JSON."),
+            HumanMessage(content=FOLD_PROMPT.format(
+                question=(question or "(opening of the interview)")[:1000], answer=answer[:1500], reply=reply[:1500]
+            )),
+        ]
+        try:
+            async with self._semaphore:
+                response = await self.llm.ainvoke(messages)
+            content = response.content if hasattr(response, "content") else response
+            content = str(content).replace("```json", "").replace("```", "").strip()
+            delta = json.loads(content[content.find("{"):content.rfind("}") + 1])
+            return delta if isinstance(delta, dict) else None
+        except Exception as e:
+            print(f"Report fold error: {e}")
+            return None
+
+    async def _load_stored(self, session_id: str):
+        try:
+            from app.db.repositories import interviews
+            return await interviews.get_report_state(session_id)
+        except Exception as e:
+            print(f"Report state load error ({session_id}): {e}")
+            return None
+
+    async def _append_shared(self, session_id: str, delta: dict):
+        key = f"report:{session_id}"
+        if self.persist and not await self.state.get_list(key, 1):
+            # Shared entries expired (or predate it): start from the persisted summary
+            state = await self._load_stored(session_id)
+            if state and state.get("rolling_summary"):
+                await self.state.append(key, [{"base": state["rolling_summary"]}], self.MAX_TURNS, self.ttl_seconds)
+        await self.state.append(key, [delta], self.MAX_TURNS, self.ttl_seconds)
+
+    async def _load_shared(self, session_id: str) -> InterviewSummary:
+        """Summary rebuilt from every worker's folded turns (cheap: no LLM calls)."""
+        entries = await self.state.get_list(f"report:{session_id}", self.MAX_TURNS)
+        bases = [entry["base"] for entry in entries if "base" in entry]
+        # Two workers may both seed a base; the first one wins and turns fold on top in any order
+        summary = InterviewSummary.from_dict(bases[0]) if bases else InterviewSummary()
+        for entry in entries:
+            if "base" not in entry:
+                summary.fold(entry)
+        if not entries and self.persist:
+            state = await self._load_stored(session_id)
+            if state:
+                summary = InterviewSummary.from_dict(state.get("rolling_summary") or {})
+        return summary
+
+    async def _load(self, session_id: str) -> InterviewSummary:
+        if self.state is not None:
+            return await self._load_shared(session_id)
+        summary = self.summaries.get(session_id)
+        if summary is not None or not self.persist:
+            return summary or self._summary(session_id)
+        state = await self._load_stored(session_id)
+        # Another fold may have populated the cache while we were reading
+        cached = self.summaries.get(session_id)
+        if cached is not None:
+            return cached
+        summary = InterviewSummary.from_dict(state.get("rolling_summary") or {}) if state else InterviewSummary()
+        if state and state.get("report") and state["report"].get("turns_assessed") == summary.turns:
+            summary.report = state["report"]
+        self.summaries.set(session_id, summary)
+        return summary
+
+    async def _save(self, session_id: str, summary: InterviewSummary):
+        if not self.persist:
+            return
+        try:
+            from app.db.repositories import interviews
+            await interviews.set_report_state(session_id, summary.to_dict(), summary.report)
+        except Exception as e:
+            print(f"Report state save error ({session_id}): {e}")
+
+    async def build_report(self, session_id: str, history: list = None):
+        """
+        Returns the merged report, or None when no turn could be assessed.
+        Waits briefly for in-flight folds; backfills from history when the
+        running summary is empty (e.g. after a restart without persistence).
+        """
+        pending = self._tasks.get(session_id)
+        if pending:
+            await asyncio.wait(list(pending), timeout=self.wait_seconds)
+
+        summary = await self._load(session_id)
+        if summary.report is not None:
+            return summary.report
+
+        if summary.turns == 0 and history:
+            turns = [
+                (
+                    history[i - 1]["content"] if i and history[i - 1]["role"] == "assistant" else "",
+                    history[i]["content"],
+                    history[i + 1]["content"],
+                )
+                for i in range(len(history) - 1)
+                if history[i]["role"] == "user" and history[i + 1]["role"] == "assistant"
+            ]
+            deltas = await asyncio.gather(*[self._assess_turn(*turn) for turn in turns])
+            for delta in deltas:
+                if delta is not None:
+                    summary.fold(delta)
+                    if self.state is not None:
+                        await self._append_shared(session_id, delta)
+
+        if summary.turns == 0:
+            return None
+        summary.report = summary.merge()
+        await self._save(session_id, summary)
+        return summary.report
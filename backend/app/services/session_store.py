@@ -0,0 +1,174 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from dotenv import load_dotenv
+from app.services.shared_state import state_backend
+
+load_dotenv()
+
+
+class ConversationSession:
+    """Bounded message history for a single interview session."""
+    __slots__ = ("session_id", "messages", "last_access")
+
+    def __init__(self, session_id: str, max_messages: int):
+        self.session_id = session_id
+        self.messages = deque(maxlen=max_messages)
+        self.last_access = time.monotonic()
+
+    def touch(self):
+        self.last_access = time.monotonic()
+
+
+class SessionStore:
+    """
+    Session-keyed conversation store with LRU/TTL eviction and optional
+    write-behind persistence to the `interviews` Mongo collection.
+    With a shared state backend (several worker processes) the recent
+    history lives there instead of in this process.
+    """
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        max_messages: int = 20,
+        ttl_seconds: float = 3600,
+        persist: bool = False,
+        flush_interval: float = 5.0,
+        state=None,
+    ):
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self.flush_interval = flush_interval
+        self.state = state if state is not None and state.shared else None
+
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        # Messages not yet written to Mongo, kept apart from the LRU so that
+        # evicting a session never drops unflushed turns.
+        self._pending: dict = {}
+        self._flush_task = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", "10000")),
+            max_messages=int(os.getenv("SESSION_MAX_MESSAGES", "20")),
+            ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", "3600")),
+            persist=os.getenv("SESSION_PERSIST", "false").lower() in ("1", "true", "yes"),
+            flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", "5")),
+            state=state_backend,
+        )
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _get_or_create(self, session_id: str) -> ConversationSession:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(session_id, self.max_messages)
+            self._sessions[session_id] = session
+            self._evict()
+        else:
+            self._sessions.move_to_end(session_id)
+        session.touch()
+        return session
+
+    def _evict(self):
+        """Drop expired sessions from the cold end, then enforce the LRU bound."""
+        now = time.monotonic()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_access < self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    async def get_history(self, session_id: str) -> list:
+        """Return the recent messages for a session, rehydrating from Mongo on a miss."""
+        if self.state is not None:
+            messages = await self.state.get_list(f"session:{session_id}", self.max_messages)
+            if not messages and self.persist:
+                messages = await self._load_transcript(session_id)
+                if messages:
+                    await self.state.append(f"session:{session_id}", messages, self.max_messages, self.ttl_seconds)
+            return messages
+        if session_id not in self._sessions and self.persist:
+            await self._load(session_id)
+        return list(self._get_or_create(session_id).messages)
+
+    async def append(self, session_id: str, role: str, content: str):
+        await self.append_many(session_id, [{"role": role, "content": content}])
+
+    async def append_many(self, session_id: str, messages: list):
+        if self.state is not None:
+            await self.state.append(f"session:{session_id}", messages, self.max_messages, self.ttl_seconds)
+        else:
+            self._get_or_create(session_id).messages.extend(messages)
+        if self.persist:
+            self._pending.setdefault(session_id, []).extend(messages)
+
+    async def append_turn(self, session_id: str, user_text: str, assistant_text: str):
+        await self.append_many(session_id, [
+            {"role": "user", "content": user_text},
+            {"role": "assistant", "content": assistant_text},
+        ])
+
+    async def clear(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        if self.state is not None:
+            await self.state.delete(f"session:{session_id}")
+
+    async def _load_transcript(self, session_id: str) -> list:
+        try:
+            from app.db.repositories import interviews
+            return await interviews.get_transcript(session_id, self.max_messages)
+        except Exception as e:
+            print(f"Session load error ({session_id}): {e}")
+            return []
+
+    async def _load(self, session_id: str):
+        transcript = await self._load_transcript(session_id)
+        if transcript:
+            session = self._get_or_create(session_id)
+            session.messages.extend(transcript)
+
+    async def flush(self):
+        """Write all pending messages to Mongo in one batched round trip."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            from app.db.repositories import interviews
+            await interviews.append_transcripts(pending)
+        except Exception as e:
+            print(f"Session flush error: {e}")
+            # Put the batch back in front of anything appended meanwhile
+            for session_id, messages in pending.items():
+                self._pending[session_id] = messages + self._pending.get(session_id, [])
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._evict()
+            await self.flush()
+
+    async def start(self):
+        if self.persist and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self.persist:
+            await self.flush()
+
+
+session_store = SessionStore.from_env()
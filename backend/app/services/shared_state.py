@@ -0,0 +1,147 @@
+import json
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.services.cache import TTLCache
+
+load_dotenv()
+
+
+class MemoryState:
+    """Per-process state; fine for a single worker, invisible to the others."""
+    shared = False
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str):
+        return self._entries.get(key)
+
+    async def set(self, key: str, value, ttl: float = None):
+        self._entries.set(key, value)
+
+    async def delete(self, key: str):
+        self._entries.pop(key)
+
+    async def append(self, key: str, items: list, max_len: int, ttl: float = None):
+        entries = self._entries.get(key)
+        if entries is None:
+            entries = deque(maxlen=max_len)
+        entries.extend(items)
+        self._entries.set(key, entries)
+
+    async def get_list(self, key: str, last: int) -> list:
+        return list(self._entries.get(key) or [])[-last:]
+
+
+class MongoState:
+    """
+    State in the `shared_state` collection, visible to every worker.
+    Expired entries are filtered on read and removed by a TTL index.
+    """
+    shared = True
+
+    def __init__(self, ttl_seconds: float = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._index_ready = False
+
+    async def _collection(self):
+        from app.db.config import Database
+        collection = Database.get_database()["shared_state"]
+        if not self._index_ready:
+            try:
+                await collection.create_index("expires_at", expireAfterSeconds=0, name="expires_at_ttl")
+            except Exception as e:
+                print(f"⚠️ Could not create shared_state TTL index: {e}")
+            self._index_ready = True
+        return collection
+
+    def _expires_at(self, ttl: float = None) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=ttl or self.ttl_seconds)
+
+    async def get(self, key: str):
+        collection = await self._collection()
+        doc = await collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}}, {"value": 1})
+        return (doc or {}).get("value")
+
+    async def set(self, key: str, value, ttl: float = None):
+        collection = await self._collection()
+        await collection.replace_one(
+            {"_id": key}, {"value": value, "expires_at": self._expires_at(ttl)}, upsert=True
+        )
+
+    async def delete(self, key: str):
+        collection = await self._collection()
+        await collection.delete_one({"_id": key})
+
+    async def append(self, key: str, items: list, max_len: int, ttl: float = None):
+        collection = await self._collection()
+        await collection.update_one(
+            {"_id": key},
+            {
+                "$push": {"items": {"$each": items, "$slice": -max_len}},
+                "$set": {"expires_at": self._expires_at(ttl)},
+            },
+            upsert=True,
+        )
+
+    async def get_list(self, key: str, last: int) -> list:
+        collection = await self._collection()
+        doc = await collection.find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.utcnow()}}, {"items": {"$slice": -last}}
+        )
+        return (doc or {}).get("items") or []
+
+
+class RedisState:
+    """State in Redis (requires the `redis` package); values are stored as JSON."""
+    shared = True
+
+    def __init__(self, url: str, ttl_seconds: float = 3600, prefix: str = "zara:"):
+        import redis.asyncio as redis
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.client = redis.from_url(url)
+
+    def _ttl(self, ttl: float = None) -> int:
+        return max(1, int(ttl or self.ttl_seconds))
+
+    async def get(self, key: str):
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value, ttl: float = None):
+        await self.client.set(self.prefix + key, json.dumps(value, default=str), ex=self._ttl(ttl))
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+    async def append(self, key: str, items: list, max_len: int, ttl: float = None):
+        key = self.prefix + key
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, *[json.dumps(item, default=str) for item in items])
+            pipe.ltrim(key, -max_len, -1)
+            pipe.expire(key, self._ttl(ttl))
+            await pipe.execute()
+
+    async def get_list(self, key: str, last: int) -> list:
+        return [json.loads(raw) for raw in await self.client.lrange(self.prefix + key, -last, -1)]
+
+
+def state_backend_from_env():
+    """
+    STATE_BACKEND=memory (default, one worker) | mongo | redis. Anything
+    other than memory is shared between worker processes.
+    """
+    backend = os.getenv("STATE_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("STATE_TTL_SECONDS", "3600"))
+    if backend == "redis":
+        return RedisState(os.getenv("REDIS_URL", "redis://localhost:6379/0"), ttl_seconds=ttl_seconds)
+    if backend == "mongo":
+        return MongoState(ttl_seconds=ttl_seconds)
+    return MemoryState(ttl_seconds=ttl_seconds)
+
+
+state_backend = state_backend_from_env()
@@ -0,0 +1,141 @@
+import json
+import os
+from collections import deque
+from functools import lru_cache
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skills.json")
+
+
+# Aliases this short ("py", "ts", "ml", "s3") also need a real token boundary
+SHORT_ALIAS_CHARS = 3
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _glued(text: str, i: int, step: int, alias_len: int) -> bool:
+    """
+    Whether text[i], the character just outside a match of a short alias,
+    joins it to a longer token: a letter/digit, "+"/"#" (C vs C++/C#), a
+    "." with a word character beyond it ("file.py", "Node.js"), or for
+    one-letter aliases "-", "&" or "'" ("C-level", "R&D").
+    """
+    if i < 0 or i >= len(text):
+        return False
+    ch = text[i]
+    if _is_word_char(ch) or ch in "+#":
+        return True
+    if ch == ".":
+        beyond = i + step
+        return 0 <= beyond < len(text) and _is_word_char(text[beyond])
+    return alias_len == 1 and ch in "-&'"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher. Built once, then scans text in a single
+    pass regardless of how many patterns it holds.
+    """
+    def __init__(self, patterns: dict):
+        # patterns: lowercase pattern -> payload
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, payload in patterns.items():
+            self._insert(pattern, payload)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, payload):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def _build_failure_links(self):
+        # Depth-1 states fail back to the root; everything else is filled breadth-first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                # Inherit the outputs of the failure state so every match is reported
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yields (start, end, payload) for every pattern occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payload in out[state]:
+                yield i + 1 - length, i + 1, payload
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with aliases (e.g. "k8s" -> "Kubernetes"), matched with
+    word boundaries so "Java" is not found inside "JavaScript". Aliases of up
+    to three characters need a stricter boundary (see _glued), and one- or
+    two-letter aliases written with a capital ("Go", "C", "R") only match in
+    that case, since in lower case they are ordinary words.
+    """
+    def __init__(self, skills: dict):
+        # skills: canonical name -> list of aliases
+        self.skills = skills
+        patterns = {}
+        for canonical, aliases in skills.items():
+            for alias in [canonical, *aliases]:
+                exact = alias if len(alias) <= 2 and alias.isalpha() and not alias.islower() else None
+                patterns[alias.lower()] = (canonical, exact)
+        self.matcher = AhoCorasick(patterns)
+
+    @classmethod
+    def load(cls, path: str = None):
+        with open(path or DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.skills)
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Returns canonical skills mentioned in text, in order of first appearance.
+        """
+        lowered = text.lower()
+        n = len(lowered)
+        found = {}
+        for start, end, (canonical, exact) in self.matcher.iter_matches(lowered):
+            if canonical in found:
+                continue
+            if exact is not None and text[start:end] != exact:
+                continue
+            if end - start <= SHORT_ALIAS_CHARS:
+                if _glued(lowered, start - 1, -1, end - start) or _glued(lowered, end, 1, end - start):
+                    continue
+            # Word boundaries: the match must not be glued to a letter/digit on either side
+            elif start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                continue
+            elif end < n and _is_word_char(lowered[end]) and _is_word_char(lowered[end - 1]):
+                continue
+            found[canonical] = start
+        return list(found)
+
+
+@lru_cache(maxsize=None)
+def default_taxonomy(path: str = None) -> SkillTaxonomy:
+    """Taxonomy from SKILL_TAXONOMY_PATH (or the bundled list), built once per process."""
+    return SkillTaxonomy.load(path or os.getenv("SKILL_TAXONOMY_PATH") or DEFAULT_TAXONOMY_PATH)
@@ -0,0 +1,102 @@
+import json
+import re
+
+# End of sentence: terminal punctuation, optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+_ABBREVIATIONS = {"e.g.", "i.e.", "vs.", "dr.", "mr.", "mrs.", "ms."}
+
+
+class SentenceSplitter:
+    """
+    Incrementally splits a token stream into sentences so TTS can start
+    speaking before the full reply has been generated.
+    """
+    def __init__(self, min_chars: int = 12):
+        # Very short fragments ("Dr.", "e.g.") are held back and merged with the next one
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> list:
+        self.buffer += chunk
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:match.end()].strip()
+            last_word = candidate.rsplit(None, 1)[-1].lower()
+            if len(candidate) < self.min_chars or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> str:
+        tail, self.buffer = self.buffer.strip(), ""
+        return tail
+
+
+def sse_event(event: str, data) -> str:
+    """Formats one Server-Sent Event; data is JSON-encoded so newlines are safe."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class JSONArrayParser:
+    """
+    Incrementally parses the top-level objects of a streamed JSON array, so
+    each element can be used as soon as its closing brace arrives. Text before
+    the opening bracket (prose, code fences) is ignored, and an element that
+    fails to parse is skipped instead of failing the whole array.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+
+    def feed(self, chunk: str) -> list:
+        self.buffer += chunk
+        items = []
+        i = self.pos
+        buffer = self.buffer
+        while i < len(buffer):
+            ch = buffer[i]
+            if not self.started:
+                if ch == "[":
+                    self.started = True
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                if self.depth == 0:
+                    self.object_start = i
+                self.depth += 1
+            elif ch in "}]":
+                if self.depth == 0:
+                    # End of the top-level array; ignore anything after it
+                    self.started = False
+                else:
+                    self.depth -= 1
+                    if self.depth == 0 and self.object_start is not None:
+                        try:
+                            items.append(json.loads(buffer[self.object_start:i + 1]))
+                        except ValueError:
+                            pass
+                        self.object_start = None
+            i += 1
+
+        # Drop everything already consumed except an unfinished element
+        keep = self.object_start if self.object_start is not None else i
+        self.buffer = buffer[keep:]
+        self.pos = i - keep
+        if self.object_start is not None:
+            self.object_start = 0
+        return items
@@ -0,0 +1,99 @@
+import io
+import os
+import zipfile
+from xml.etree import ElementTree
+
+SUPPORTED_EXTENSIONS = {".txt", ".text", ".md", ".pdf", ".docx"}
+PDF, DOCX, TEXT = "pdf", "docx", "text"
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Uncompressed size allowed for word/document.xml (guards against zip bombs)
+MAX_DOCX_XML_BYTES = 50 * 1024 * 1024
+
+
+class UnsupportedDocument(ValueError):
+    """The file type is not supported or its text could not be extracted."""
+
+
+def detect_format(filename: str, data: bytes) -> str:
+    """
+    PDF, DOCX or TEXT from the file's leading bytes; the extension is only
+    used to name the error when the content is something else.
+    """
+    head = data[:1024]
+    # Readers tolerate a BOM or whitespace before the header, but it must lead the file
+    if head.removeprefix(b"\xef\xbb\xbf").lstrip().startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return DOCX
+        except zipfile.BadZipFile:
+            pass
+        raise UnsupportedDocument("ZIP-based file is not a Word .docx document")
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        raise UnsupportedDocument("Legacy .doc files are not supported; upload a PDF or .docx")
+    extension = os.path.splitext(filename.lower())[1]
+    if extension in (".pdf", ".docx"):
+        raise UnsupportedDocument(f"File is not a valid {extension} document")
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" not in head:
+        return TEXT
+    raise UnsupportedDocument(f"Unsupported file type: {extension or 'binary'}")
+
+
+def extract_text(filename: str, data: bytes, max_pages: int = None) -> str:
+    """Plain text of a resume file (PDF, DOCX or text), detected from its content."""
+    kind = detect_format(filename, data)
+    if kind == PDF:
+        return _pdf_text(data, max_pages)
+    if kind == DOCX:
+        return _docx_text(data)
+    return decode_text(data)
+
+
+def decode_text(data: bytes) -> str:
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="ignore")
+    return data.decode("utf-8-sig", errors="ignore")
+
+
+def _pdf_text(data: bytes, max_pages: int = None) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedDocument("PDF extraction requires pypdf (pip install pypdf)")
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        pages = reader.pages if not max_pages else reader.pages[:max_pages]
+        return "\n".join(page.extract_text() or "" for page in pages)
+    except MemoryError:
+        # The worker's memory cap: an extraction failure, not an unreadable file
+        raise
+    except Exception as e:
+        raise UnsupportedDocument(f"Unreadable PDF: {e}")
+
+
+def _docx_text(data: bytes) -> str:
+    """Paragraph text from word/document.xml (a .docx is a zip of XML parts)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            if archive.getinfo("word/document.xml").file_size > MAX_DOCX_XML_BYTES:
+                raise UnsupportedDocument("DOCX content is too large")
+            xml = archive.read("word/document.xml")
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise UnsupportedDocument(f"Unreadable DOCX: {e}")
+    paragraphs, parts = [], []
+    for event, element in ElementTree.iterparse(io.BytesIO(xml), events=("end",)):
+        tag = element.tag
+        if tag == _WORD_NS + "t":
+            parts.append(element.text or "")
+        elif tag == _WORD_NS + "tab":
+            parts.append("\t")
+        elif tag in (_WORD_NS + "br", _WORD_NS + "cr"):
+            parts.append("\n")
+        elif tag == _WORD_NS + "p":
+            paragraphs.append("".join(parts))
+            parts = []
+            element.clear()
+    return "\n".join(paragraphs)
@@ -0,0 +1,346 @@
+import asyncio
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import Column, String, DateTime, LargeBinary, select, text
+from dotenv import load_dotenv
+
+from app.database import Base, SessionLocal, engine, SQLALCHEMY_DATABASE_URL
+
+load_dotenv()
+
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+
+class LocalCandidateEmbedding(Base):
+    """Raw float32 embeddings for deployments without pgvector (e.g. SQLite)."""
+    __tablename__ = "candidate_embeddings_local"
+
+    candidate_id = Column(String, primary_key=True)
+    role = Column(String, index=True)
+    domain = Column(String, index=True)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index: vectors are bucketed by their nearest
+    k-means centroid and a query only scores the `n_probe` closest buckets.
+    """
+    def __init__(self, n_lists: int = 256, n_probe: int = 16, iterations: int = 10, seed: int = 0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids = None
+        self.lists = []
+        self.bucket_of = {}
+
+    def train(self, vectors: np.ndarray):
+        rng = np.random.default_rng(self.seed)
+        n_lists = min(self.n_lists, len(vectors))
+        sample = vectors[rng.choice(len(vectors), size=min(len(vectors), n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        # Spherical k-means: vectors are unit-length, so assign by dot product
+        for _ in range(self.iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+        self.centroids = centroids
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        self.lists = [list(order[bounds[c]:bounds[c + 1]]) for c in range(n_lists)]
+        self.bucket_of = {int(row): int(c) for row, c in enumerate(assignment)}
+
+    def add(self, row: int, vector: np.ndarray):
+        """Files a row under its nearest centroid, moving it if it was already filed (updated vector)."""
+        bucket = int(np.argmax(self.centroids @ vector))
+        previous = self.bucket_of.get(row)
+        if previous == bucket:
+            return
+        if previous is not None:
+            self.lists[previous].remove(row)
+        self.lists[bucket].append(row)
+        self.bucket_of[row] = bucket
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        probe = np.argpartition(-(self.centroids @ query), min(self.n_probe, len(self.centroids)) - 1)[:self.n_probe]
+        rows = [self.lists[c] for c in probe]
+        return np.fromiter((r for bucket in rows for r in bucket), dtype=np.int64)
+
+
+class LocalVectorIndex:
+    """
+    In-process candidate index: exact NumPy brute force, switching to an IVF
+    approximate search once the index is large. Rows are persisted through
+    SQLAlchemy (SQLite by default) and reloaded at startup.
+    """
+    backend = "local"
+
+    def __init__(self, dim: int = EMBEDDING_DIM, approximate_min_rows: int = 50000, n_lists: int = 256, n_probe: int = 16):
+        self.dim = dim
+        self.approximate_min_rows = approximate_min_rows
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.ivf = IVFIndex(n_lists=n_lists, n_probe=n_probe)
+        self._trained_rows = 0
+        # Rows added or updated while a background training run works on its snapshot
+        self._training = None
+        self._changed_rows = set()
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._ids = []
+        self._row_of = {}
+        # Role/domain stored as small integer codes so filters are a vectorized compare
+        self._roles = np.zeros(0, dtype=np.int32)
+        self._domains = np.zeros(0, dtype=np.int32)
+        self._codes = {None: 0}
+        self._lock = threading.Lock()
+
+    def setup(self):
+        LocalCandidateEmbedding.__table__.create(bind=engine, checkfirst=True)
+        with SessionLocal() as db:
+            for row in db.execute(select(LocalCandidateEmbedding)).scalars():
+                self._add_row(row.candidate_id, np.frombuffer(row.embedding, dtype=np.float32), row.role, row.domain)
+        # Train before serving so no request waits for k-means on a large index
+        if self._needs_training():
+            self._train()
+        print(f"Local vector index loaded {self._size} candidates")
+
+    def _code(self, label):
+        return self._codes.setdefault(label, len(self._codes))
+
+    def _grow(self):
+        capacity = max(1024, 2 * len(self._vectors))
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        self._roles = np.resize(self._roles, capacity)
+        self._domains = np.resize(self._domains, capacity)
+
+    def _add_row(self, candidate_id, vector, role, domain):
+        with self._lock:
+            row = self._row_of.get(candidate_id)
+            if row is None:
+                if self._size == len(self._vectors):
+                    self._grow()
+                row = self._size
+                self._size += 1
+                self._ids.append(candidate_id)
+                self._row_of[candidate_id] = row
+            self._roles[row] = self._code(role)
+            self._domains[row] = self._code(domain)
+            self._vectors[row] = vector
+            if self._trained_rows:
+                # New rows are filed; re-added rows move to their new bucket (never duplicated)
+                self.ivf.add(row, vector)
+            if self._training is not None:
+                self._changed_rows.add(row)
+
+    def _needs_training(self) -> bool:
+        # Retrain when the index has doubled since the last training run
+        return self._size >= self.approximate_min_rows and self._size >= 2 * self._trained_rows
+
+    def _maybe_train(self):
+        """Starts a background training run when one is due; searches keep using the current index meanwhile."""
+        with self._lock:
+            if self._training is not None or not self._needs_training():
+                return
+            self._training = threading.Thread(target=self._train, name="ivf-train", daemon=True)
+            self._training.start()
+
+    def _train(self):
+        with self._lock:
+            snapshot = self._vectors[:self._size].copy()
+            self._changed_rows = set()
+        ivf = IVFIndex(n_lists=self.n_lists, n_probe=self.n_probe)
+        try:
+            ivf.train(snapshot)
+        except Exception as e:
+            print(f"IVF training failed: {e}")
+            with self._lock:
+                self._training = None
+            return
+        with self._lock:
+            # File what changed during training, then swap the new index in
+            for row in range(len(snapshot), self._size):
+                ivf.add(row, self._vectors[row])
+            for row in self._changed_rows:
+                if row < len(snapshot):
+                    ivf.add(row, self._vectors[row])
+            self.ivf = ivf
+            self._trained_rows = len(snapshot)
+            self._changed_rows = set()
+            self._training = None
+
+    def add(self, candidate_id: str, vector: np.ndarray, role: str = None, domain: str = None):
+        vector = np.asarray(vector, dtype=np.float32)
+        self._add_row(candidate_id, vector, role, domain)
+        with SessionLocal() as db:
+            db.merge(LocalCandidateEmbedding(
+                candidate_id=candidate_id, role=role, domain=domain, embedding=vector.tobytes()
+            ))
+            db.commit()
+        self._maybe_train()
+
+    def add_many(self, entries: list):
+        """Adds (candidate_id, vector, role, domain) rows with one commit."""
+        with SessionLocal() as db:
+            for candidate_id, vector, role, domain in entries:
+                vector = np.asarray(vector, dtype=np.float32)
+                self._add_row(candidate_id, vector, role, domain)
+                db.merge(LocalCandidateEmbedding(
+                    candidate_id=candidate_id, role=role, domain=domain, embedding=vector.tobytes()
+                ))
+            db.commit()
+        self._maybe_train()
+
+    def search(self, query: np.ndarray, top_k: int = 10, role: str = None, domain: str = None, exact: bool = False) -> list:
+        with self._lock:
+            if self._size == 0:
+                return []
+            query = np.asarray(query, dtype=np.float32)
+            rows = None
+            if not exact and self._trained_rows:
+                rows = self._filter(self.ivf.candidates(query), role, domain)
+                # A selective filter can leave the probed buckets short: search every matching row
+                if len(rows) < min(top_k, self._size):
+                    rows = None
+            if rows is None:
+                rows = self._filter(np.arange(self._size), role, domain)
+            scores = self._vectors[rows] @ query
+            if len(rows) == 0:
+                return []
+            k = min(top_k, len(rows))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+    def _filter(self, rows: np.ndarray, role: str = None, domain: str = None) -> np.ndarray:
+        if role:
+            rows = rows[self._roles[rows] == self._codes.get(role, -1)]
+        if domain:
+            rows = rows[self._domains[rows] == self._codes.get(domain, -1)]
+        return rows
+
+    def __len__(self):
+        return self._size
+
+
+class PgVectorIndex:
+    """
+    Candidate index stored in Postgres with pgvector and an HNSW
+    (or IVFFlat) cosine index.
+    """
+    backend = "pgvector"
+
+    def __init__(self, dim: int = EMBEDDING_DIM, index_type: str = "hnsw"):
+        from pgvector.sqlalchemy import Vector
+
+        self.dim = dim
+        self.index_type = index_type
+
+        class CandidateEmbedding(Base):
+            __tablename__ = "candidate_embeddings"
+            __table_args__ = {"extend_existing": True}
+
+            candidate_id = Column(String, primary_key=True)
+            role = Column(String, index=True)
+            domain = Column(String, index=True)
+            embedding = Column(Vector(dim), nullable=False)
+            created_at = Column(DateTime, default=datetime.utcnow)
+
+        self.model = CandidateEmbedding
+
+    def setup(self):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        self.model.__table__.create(bind=engine, checkfirst=True)
+        if self.index_type == "ivfflat":
+            ddl = ("CREATE INDEX IF NOT EXISTS candidate_embeddings_ivfflat ON candidate_embeddings "
+                   "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)")
+        else:
+            ddl = ("CREATE INDEX IF NOT EXISTS candidate_embeddings_hnsw ON candidate_embeddings "
+                   "USING hnsw (embedding vector_cosine_ops)")
+        with engine.begin() as conn:
+            conn.execute(text(ddl))
+
+    def add(self, candidate_id: str, vector: np.ndarray, role: str = None, domain: str = None):
+        with SessionLocal() as db:
+            db.merge(self.model(candidate_id=candidate_id, role=role, domain=domain, embedding=np.asarray(vector).tolist()))
+            db.commit()
+
+    def add_many(self, entries: list):
+        """Adds (candidate_id, vector, role, domain) rows with one commit."""
+        with SessionLocal() as db:
+            for candidate_id, vector, role, domain in entries:
+                db.merge(self.model(candidate_id=candidate_id, role=role, domain=domain, embedding=np.asarray(vector).tolist()))
+            db.commit()
+
+    def search(self, query: np.ndarray, top_k: int = 10, role: str = None, domain: str = None, exact: bool = False) -> list:
+        distance = self.model.embedding.cosine_distance(np.asarray(query).tolist())
+        stmt = select(self.model.candidate_id, distance.label("distance"))
+        if role:
+            stmt = stmt.where(self.model.role == role)
+        if domain:
+            stmt = stmt.where(self.model.domain == domain)
+        stmt = stmt.order_by(distance).limit(top_k)
+        with SessionLocal() as db:
+            return [(candidate_id, 1.0 - float(d)) for candidate_id, d in db.execute(stmt)]
+
+
+class CandidateSearch:
+    """
+    Embeds resumes / job descriptions and stores or queries them in the
+    configured vector index (pgvector on Postgres, local otherwise).
+    """
+    def __init__(self, index=None):
+        self.index = index if index is not None else self._index_from_env()
+
+    @staticmethod
+    def _index_from_env():
+        backend = os.getenv("VECTOR_INDEX_BACKEND", "auto").lower()
+        if backend == "pgvector" or (backend == "auto" and SQLALCHEMY_DATABASE_URL.startswith("postgres")):
+            return PgVectorIndex(index_type=os.getenv("VECTOR_INDEX_TYPE", "hnsw"))
+        return LocalVectorIndex(
+            approximate_min_rows=int(os.getenv("VECTOR_INDEX_APPROX_MIN_ROWS", "50000")),
+            n_lists=int(os.getenv("VECTOR_INDEX_IVF_LISTS", "256")),
+            n_probe=int(os.getenv("VECTOR_INDEX_IVF_PROBE", "16")),
+        )
+
+    async def setup(self):
+        try:
+            await asyncio.to_thread(self.index.setup)
+        except Exception as e:
+            print(f"❌ Vector index setup failed ({self.index.backend}): {e}")
+
+    async def index_candidate(self, candidate_id: str, resume_text: str, role: str = None, domain: str = None):
+        from app.services.embeddings import embedding_service
+        try:
+            vector = (await embedding_service.aencode([resume_text]))[0]
+            await asyncio.to_thread(self.index.add, candidate_id, vector, role, domain)
+        except Exception as e:
+            print(f"Candidate indexing error ({candidate_id}): {e}")
+
+    async def embed(self, texts: list, batch_size: int = 64):
+        from app.services.embeddings import embedding_service
+        return await embedding_service.aencode(texts, batch_size)
+
+    async def index_many(self, entries: list):
+        """Stores precomputed (candidate_id, vector, role, domain) rows in one batch."""
+        await asyncio.to_thread(self.index.add_many, entries)
+
+    async def search(self, job_description: str, top_k: int = 10, role: str = None, domain: str = None) -> list:
+        from app.services.embeddings import embedding_service
+        query = (await embedding_service.aencode([job_description]))[0]
+        return await asyncio.to_thread(self.index.search, query, top_k, role, domain)
+
+
+candidate_search = CandidateSearch()
@@ -0,0 +1,293 @@
+"""
+Offline benchmark for InterviewAgent against a local Ollama/Groq-compatible stub.
+
+The stub serves both Ollama's /api/chat (NDJSON streaming) and Groq's
+OpenAI-style /openai/v1/chat/completions (SSE streaming). Every reply waits
+--latency seconds before the first token, then emits tokens at --token-rate
+tokens/s, so results measure our own overhead on top of a known model cost.
+
+Benchmarks generate_response (sequential and concurrent), stream_response
+(time to first sentence), generate_quiz and stream_quiz (time to first
+question), and writes the results as JSON.
+Compare two runs with --baseline:
+
+    python bench_agent.py                                   # ollama stub, defaults
+    python bench_agent.py --provider groq --latency 0.2 --token-rate 200
+    python bench_agent.py --baseline bench_results/agent-1a2b3c4.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+INTERVIEW_REPLY = (
+    "That sounds like a solid approach. How did you measure the impact of the change? "
+    "What would you do differently if the dataset were ten times larger?"
+)
+FOLD_REPLY = json.dumps({"skills": ["Python", "Profiling"], "gaps": ["Capacity planning"], "score": 72, "note": "Clear answer with numbers."})
+
+
+def quiz_reply(prompt: str) -> str:
+    """As many questions as the prompt asks for, distinct per prompt (quiz shards differ by focus skills)."""
+    match = re.search(r"exactly (\d+)", prompt)
+    count = int(match.group(1)) if match else 10
+    tag = zlib.crc32(prompt.encode()) % 10000
+    return json.dumps([
+        {"question": f"Question {tag}-{i + 1}: which option is correct?", "options": ["A", "B", "C", "D"], "correct_index": i % 4}
+        for i in range(count)
+    ])
+
+
+def reply_for(messages: list) -> str:
+    prompt = " ".join(str(m.get("content", "")) for m in messages).lower()
+    if "quiz" in prompt:
+        return quiz_reply(prompt)
+    if "assess one answer" in prompt:
+        return FOLD_REPLY
+    return INTERVIEW_REPLY
+
+
+def tokenize(text: str) -> list[str]:
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + [words[-1]]
+
+
+def start_stub_server(latency: float, token_rate: float) -> ThreadingHTTPServer:
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _tokens(self, messages):
+            time.sleep(latency)
+            for token in tokenize(reply_for(messages)):
+                yield token
+                time.sleep(1 / token_rate)
+
+        def _send(self, content_type: str, body: bytes = None):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            if body is None:
+                self.send_header("Transfer-Encoding", "chunked")
+            else:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body is not None:
+                self.wfile.write(body)
+
+        def _chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            try:
+                self._respond()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client stopped reading early (e.g. a quiz shard that had enough questions)
+
+        def _respond(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            messages = payload.get("messages", [])
+            model = payload.get("model", "stub")
+            stream = payload.get("stream", False)
+            created = datetime.now(timezone.utc).isoformat()
+            prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+
+            if self.path.startswith("/api/chat"):
+                if not stream:
+                    content = "".join(self._tokens(messages))
+                    body = {"model": model, "created_at": created, "done": True, "done_reason": "stop",
+                            "message": {"role": "assistant", "content": content},
+                            "prompt_eval_count": prompt_tokens, "eval_count": len(tokenize(content))}
+                    return self._send("application/json", json.dumps(body).encode())
+                self._send("application/x-ndjson")
+                for token in self._tokens(messages):
+                    line = {"model": model, "created_at": created, "done": False,
+                            "message": {"role": "assistant", "content": token}}
+                    self._chunk(json.dumps(line).encode() + b"\n")
+                final = {"model": model, "created_at": created, "done": True, "done_reason": "stop",
+                         "message": {"role": "assistant", "content": ""},
+                         "prompt_eval_count": prompt_tokens, "eval_count": len(tokenize(reply_for(messages)))}
+                self._chunk(json.dumps(final).encode() + b"\n")
+                return self._chunk(b"")
+
+            # OpenAI-compatible (Groq)
+            base = {"id": "stub", "created": int(time.time()), "model": model, "system_fingerprint": "stub"}
+            if not stream:
+                content = "".join(self._tokens(messages))
+                body = {**base, "object": "chat.completion", "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                ], "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20}}
+                return self._send("application/json", json.dumps(body).encode())
+            self._send("text/event-stream")
+            for token in self._tokens(messages):
+                chunk = {**base, "object": "chat.completion.chunk", "choices": [
+                    {"index": 0, "delta": {"role": "assistant", "content": token}, "finish_reason": None}
+                ]}
+                self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+            done = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            self._chunk(f"data: {json.dumps(done)}\n\n".encode())
+            self._chunk(b"data: [DONE]\n\n")
+            self._chunk(b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+        "min_ms": round(ordered[0] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(baseline: dict, current: dict):
+    """Prints the change in mean latency per benchmark (positive = slower)."""
+    print(f"\nvs baseline {baseline.get('commit')} ({baseline.get('timestamp')})")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name, {}).get("mean_ms")
+        if before:
+            change = (result["mean_ms"] - before) / before * 100
+            print(f"  {name:<28} {before:9.2f} -> {result['mean_ms']:9.2f} ms ({change:+.1f}%)")
+
+
+async def bench(args) -> dict:
+    from app.services.langchain_service import InterviewAgent
+
+    agent = InterviewAgent()
+    results = {}
+
+    async def turn(session_id: str):
+        started = time.perf_counter()
+        await agent.generate_response("I optimised our query planner and cut p95 by half.", "neutral", session_id)
+        return time.perf_counter() - started
+
+    await turn("warmup")
+
+    samples = [await turn(f"seq-{i}") for i in range(args.iterations)]
+    results["generate_response"] = summarize(samples)
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*[turn(f"conc-{i}") for i in range(args.concurrency)])
+    wall = time.perf_counter() - started
+    results["generate_response_concurrent"] = {
+        **summarize(samples), "concurrency": args.concurrency, "wall_ms": round(wall * 1000, 2),
+        "turns_per_s": round(args.concurrency / wall, 2),
+    }
+
+    first_sentence, totals = [], []
+    for i in range(args.iterations):
+        started = time.perf_counter()
+        first = None
+        async for event, _ in agent.stream_response("Tell me about caching.", "neutral", f"stream-{i}"):
+            if event == "sentence" and first is None:
+                first = time.perf_counter() - started
+        first_sentence.append(first or time.perf_counter() - started)
+        totals.append(time.perf_counter() - started)
+    results["stream_first_sentence"] = summarize(first_sentence)
+    results["stream_response"] = summarize(totals)
+
+    samples = []
+    for _ in range(args.iterations):
+        started = time.perf_counter()
+        await agent.generate_quiz("Python, Kubernetes, PostgreSQL. Built a payments API.", "backend")
+        samples.append(time.perf_counter() - started)
+    results["generate_quiz"] = summarize(samples)
+
+    first_question = []
+    for i in range(args.iterations):
+        started = time.perf_counter()
+        first = None
+        async for event, _ in agent.stream_quiz(f"Skills: Python, Go, SQL, AWS. Run {i}.", "backend"):
+            if event == "question" and first is None:
+                first = time.perf_counter() - started
+        first_question.append(first or time.perf_counter() - started)
+    results["stream_quiz_first_question"] = summarize(first_question)
+
+    # Let background report folds finish so they do not leak into the next run
+    pending = [t for tasks in agent.reports._tasks.values() for t in tasks]
+    if pending:
+        await asyncio.wait(pending, timeout=30)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline InterviewAgent benchmark against a stub LLM server.")
+    parser.add_argument("--provider", choices=["ollama", "groq"], default="ollama")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=500.0, help="stub tokens per second")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help="results file (default bench_results/agent-<commit>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency, args.token_rate)
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # Point the agent at the stub before it is imported; keep everything in memory
+    os.environ.update({
+        "LLM_PROVIDER": args.provider,
+        "OLLAMA_BASE_URL": stub_url,
+        "GROQ_API_BASE": stub_url,
+        "GROQ_API_KEY": os.environ.get("GROQ_API_KEY", "stub"),
+        "SESSION_PERSIST": "false",
+        "REPORT_PERSIST": "false",
+        "QUIZ_BANK_ENABLED": "false",  # measure generation, not bank lookups
+    })
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    try:
+        results = asyncio.run(bench(args))
+    finally:
+        server.shutdown()
+
+    report = {
+        "suite": "agent",
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "results": results,
+    }
+    for name, result in results.items():
+        print(f"{name:<30} mean {result['mean_ms']:9.2f} ms | p95 {result['p95_ms']:9.2f} ms | n={result['n']}")
+
+    output = args.output or os.path.join("bench_results", f"agent-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+One-off migration: removes duplicate candidates (same resume file, role and
+domain) stored before the unique resume_hash/role/domain index existed, so
+that index can be built. The oldest candidate of each group is kept and
+interviews of the removed ones are moved to it.
+
+    python dedupe_candidates.py --dry-run   # list what would be removed
+    python dedupe_candidates.py             # remove them and build the indexes
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.config import Database
+from app.db.repositories import candidates, ensure_indexes
+
+
+async def run(args) -> int:
+    await Database.connect_db()
+    try:
+        groups = await candidates.duplicates()
+        extra = sum(len(group["remove"]) for group in groups)
+        print(f"Found {len(groups)} duplicated resumes ({extra} extra candidates)")
+        for group in groups[:args.show]:
+            print(f"  keep {group['keep']}, remove {', '.join(str(oid) for oid in group['remove'])}")
+        if args.dry_run or not groups:
+            return 0
+        removed = await candidates.remove_duplicates(groups)
+        print(f"✅ Removed {removed} duplicate candidates")
+        await ensure_indexes()
+        print("✅ Indexes built")
+        return 0
+    finally:
+        await Database.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate candidates so the unique resume index can be built.")
+    parser.add_argument("--dry-run", action="store_true", help="only report the duplicates")
+    parser.add_argument("--show", type=int, default=20, help="groups to list")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
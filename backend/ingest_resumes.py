@@ -0,0 +1,83 @@
+"""
+Bulk-imports a ZIP archive or directory of resumes (.txt/.md/.pdf/.docx)
+into the candidates collection and the vector index.
+
+    python ingest_resumes.py resumes.zip --role "Backend Engineer" --domain "Software"
+    python ingest_resumes.py ./resumes/ --role "Data Scientist" --domain "AI/ML"
+
+Progress is checkpointed to Mongo every few seconds; running the same
+command again after an interruption resumes where it stopped. If the
+archive or directory has changed since (files added, edited or removed)
+the run starts a new job instead, and resumes already stored are skipped.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.config import Database
+from app.db.repositories import ensure_indexes
+from app.services.ingestion import COMPLETED, ingestion_manager
+from app.services.vector_index import candidate_search
+
+
+def print_progress(progress: dict):
+    counts = progress["counts"]
+    eta = f", ETA {progress['eta_seconds']:.0f}s" if progress.get("eta_seconds") is not None else ""
+    print(
+        f"  {progress['processed']}/{progress['total']} ({progress['percent']}%) "
+        f"inserted={counts['inserted']} unindexed={counts['unindexed']} duplicates={counts['duplicates']} "
+        f"failed={counts['failed']} skipped={counts['skipped']} "
+        f"{progress['files_per_second'] or 0:.1f} files/s{eta} queues={progress.get('queues', {})}"
+    )
+
+
+async def report(job, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        print_progress(job.progress())
+
+
+async def run(args) -> int:
+    await Database.connect_db()
+    await ensure_indexes()
+    await candidate_search.setup()
+    try:
+        job = await ingestion_manager.open_job(args.path, args.role, args.domain)
+        if job.status == COMPLETED:
+            print(f"✅ Already ingested (job {job.id}); nothing to do")
+            result = job.progress()
+        else:
+            reporter = asyncio.create_task(report(job, args.interval))
+            try:
+                result = await ingestion_manager.run(job)
+            finally:
+                reporter.cancel()
+        print_progress(result)
+        if args.json:
+            print(json.dumps(result))
+        return 0 if result["status"] == COMPLETED else 1
+    finally:
+        await Database.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import resumes from a ZIP archive or directory.")
+    parser.add_argument("path", help="ZIP archive or directory of resumes")
+    parser.add_argument("--role", required=True)
+    parser.add_argument("--domain", required=True)
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between progress lines")
+    parser.add_argument("--json", action="store_true", help="print the final progress as JSON")
+    args = parser.parse_args()
+    try:
+        sys.exit(asyncio.run(run(args)))
+    except KeyboardInterrupt:
+        print("⏸️ Interrupted; run the same command again to resume")
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Load test for InterviewOrchestrator against a local OpenAI-compatible stub.
+
+Fires N concurrent turns at a stub that sleeps STUB_LATENCY seconds per call
+and reports wall time and event-loop lag. With the async client the turns
+overlap (wall ~ one latency); a blocking client would serialize them
+(wall ~ N x latency) and starve the loop.
+
+    python load_test_orchestrator.py --turns 20 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_stub_server(latency: float) -> ThreadingHTTPServer:
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(latency)
+            body = json.dumps({
+                "id": "stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "stub"),
+                "system_fingerprint": "stub",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Stub reply. Tell me more about that project?"},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 8, "total_tokens": 18}
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Worst delay seen by a 10ms ticker; large values mean the loop was blocked."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(turns: int, latency: float):
+    server = start_stub_server(latency)
+    os.environ["HF_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("HF_TOKEN", "stub-token")
+    os.environ.setdefault("HF_MAX_RETRIES", "0")
+
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from app.services.orchestrator import InterviewOrchestrator
+
+    orch = InterviewOrchestrator()
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+
+    started = time.perf_counter()
+    replies = await asyncio.gather(*[
+        orch.generate_response(f"Answer number {i}", "neutral") for i in range(turns)
+    ])
+    wall = time.perf_counter() - started
+
+    stop.set()
+    worst_lag = await lag_task
+    server.shutdown()
+
+    print(f"turns:            {turns}")
+    print(f"stub latency:     {latency:.3f}s")
+    print(f"serial estimate:  {turns * latency:.3f}s")
+    print(f"concurrent wall:  {wall:.3f}s")
+    print(f"speedup:          {turns * latency / wall:.1f}x")
+    print(f"max loop lag:     {worst_lag * 1000:.1f}ms")
+    print(f"stub replies:     {sum(r.startswith('Stub reply') for r in replies)}/{turns}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns, args.latency))
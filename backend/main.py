@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+import time
 import uvicorn
-from app.routes import interview, quiz, resume
+from app.services import metrics
+from app.routes import interview, quiz, resume, search, jobs, emotions, ingest
 from app.db.config import Database
+from app.db.repositories import ensure_indexes
+from app.services.session_store import session_store
+from app.services.jobs import job_queue
+from app.services.emotion_telemetry import emotion_telemetry
+from app.services.vector_index import candidate_search
+from app.services.ingestion import ingestion_manager
+from app.services.document_extractor import document_extractor
 
 class InterviewerAPIServer:
     def __init__(self):
@@ -18,21 +27,56 @@ class InterviewerAPIServer:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["Server-Timing"],
         )
 
+        if metrics.METRICS_ENABLED:
+            @self.app.middleware("http")
+            async def record_metrics(request: Request, call_next):
+                started = time.perf_counter()
+                stages = metrics.start_request_timing()
+                response = await call_next(request)
+                elapsed = time.perf_counter() - started
+                path = metrics.route_label(request.scope)
+                metrics.HTTP_LATENCY.labels(request.method, path).observe(elapsed)
+                metrics.HTTP_REQUESTS.labels(request.method, path, str(response.status_code)).inc()
+                if metrics.TIMING_HEADER:
+                    response.headers["Server-Timing"] = metrics.server_timing(stages, elapsed)
+                return response
+
     def setup_events(self):
         @self.app.on_event("startup")
         async def startup_db():
             await Database.connect_db()
+            await ensure_indexes()
+            await session_store.start()
+            await candidate_search.setup()
+            await job_queue.start()
+            await emotion_telemetry.start()
+            await ingestion_manager.start()
         
         @self.app.on_event("shutdown")
         async def shutdown_db():
+            await ingestion_manager.stop()
+            await document_extractor.stop()
+            await job_queue.stop()
+            await emotion_telemetry.stop()
+            await session_store.stop()
             await Database.close_db()
 
     def setup_routes(self):
         self.app.include_router(interview.router, prefix="/api")
         self.app.include_router(quiz.router)  # Quiz router
         self.app.include_router(resume.router)  # Resume router
+        self.app.include_router(search.router)  # Recruiter candidate search
+        self.app.include_router(jobs.router)  # Background job status
+        self.app.include_router(emotions.router)  # Emotion telemetry
+        self.app.include_router(ingest.router)  # Bulk resume ingestion
+
+        @self.app.get("/metrics", include_in_schema=False)
+        def read_metrics():
+            payload, content_type = metrics.render()
+            return Response(content=payload, media_type=content_type)
 
         @self.app.get("/")
         def read_root():
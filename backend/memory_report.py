@@ -0,0 +1,92 @@
+"""
+Per-process memory of a serve.py process tree (Linux, reads /proc).
+
+RSS counts every resident page, so summing it over forked workers counts
+the shared model weights once per worker. PSS splits each shared page
+between the processes mapping it, so the PSS total is the real footprint;
+USS (private pages) is what each extra worker actually costs.
+
+    python memory_report.py <parent pid>
+    python memory_report.py <parent pid> --json
+    python memory_report.py <parent pid> --watch 5
+"""
+import argparse
+import json
+import os
+import time
+
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap")
+
+
+def smaps_rollup(pid: int) -> dict:
+    """Memory counters in kB from /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def children(pid: int) -> list:
+    pids = []
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            continue
+    return sorted(pids)
+
+
+def report(parent: int) -> dict:
+    rows = []
+    for role, pid in [("parent", parent)] + [("worker", child) for child in children(parent)]:
+        try:
+            mem = smaps_rollup(pid)
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+        rows.append({
+            "pid": pid,
+            "role": role,
+            "rss_mb": round(mem.get("Rss", 0) / 1024, 1),
+            "pss_mb": round(mem.get("Pss", 0) / 1024, 1),
+            "uss_mb": round((mem.get("Private_Clean", 0) + mem.get("Private_Dirty", 0)) / 1024, 1),
+            "shared_mb": round((mem.get("Shared_Clean", 0) + mem.get("Shared_Dirty", 0)) / 1024, 1),
+            "swap_mb": round(mem.get("Swap", 0) / 1024, 1),
+        })
+    totals = {key: round(sum(row[key] for row in rows), 1) for key in ("rss_mb", "pss_mb", "uss_mb")}
+    return {"parent": parent, "processes": rows, "totals": totals}
+
+
+def print_report(data: dict):
+    print(f"{'pid':>8} {'role':<7} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'shared MB':>10}")
+    for row in data["processes"]:
+        print(f"{row['pid']:>8} {row['role']:<7} {row['rss_mb']:>9} {row['pss_mb']:>9} {row['uss_mb']:>9} {row['shared_mb']:>10}")
+    totals = data["totals"]
+    print(f"{'total':>16} {totals['rss_mb']:>9} {totals['pss_mb']:>9} {totals['uss_mb']:>9}")
+    print("(sum of RSS double-counts shared pages; PSS total is the real footprint)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS/PSS/USS of a serve.py parent and its workers.")
+    parser.add_argument("pid", type=int, help="serve.py parent pid (printed at startup)")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--watch", type=float, default=0, help="repeat every N seconds")
+    args = parser.parse_args()
+
+    while True:
+        data = report(args.pid)
+        if args.json:
+            print(json.dumps(data))
+        else:
+            print_report(data)
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Production server: imports the app and loads models once in a parent
+process, then forks N uvicorn workers that share that memory copy-on-write.
+
+    python serve.py --workers 4          # or WEB_CONCURRENCY=4 python serve.py
+    python memory_report.py <parent pid> # per-worker RSS / PSS / USS
+
+Workers only share read-only memory (code, model weights, the skill
+taxonomy). Sessions, report summaries and caches that every worker must
+see belong in a shared backend (STATE_BACKEND=mongo|redis), job status in
+Mongo (JOB_STORE=mongo), and candidate vectors in pgvector. serve.py
+refuses to fork several workers while any of them is per process, and
+defaults to a single worker until they are configured.
+Database clients, the job queue and flush loops are started per worker
+(FastAPI startup events), never shared across the fork.
+"""
+import argparse
+import gc
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+
+def preload(preload_models: bool):
+    """Imports the app and loads read-only data in the parent, before forking."""
+    import main
+    from app.services.skill_taxonomy import default_taxonomy
+    default_taxonomy()
+    if preload_models:
+        try:
+            from app.services.embeddings import embedding_service
+            embedding_service.model  # loads the weights; no inference before the fork
+            print(f"✅ Preloaded embedding model {embedding_service.model_name}")
+        except Exception as e:
+            print(f"⚠️ Embedding model not preloaded (workers load it on first use): {e}")
+    # Keep the GC from touching (and so copying) everything allocated so far
+    gc.collect()
+    gc.freeze()
+    return main.app
+
+
+def bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args):
+    import uvicorn
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if "torch" in sys.modules:
+        # Split the cores between workers instead of every worker using all of them
+        sys.modules["torch"].set_num_threads(args.torch_threads or max(1, (os.cpu_count() or 1) // args.workers))
+    config = uvicorn.Config(app, timeout_keep_alive=args.keep_alive, log_level=args.log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """Forks the workers, restarts any that die, and stops them all on SIGTERM/SIGINT."""
+    RESTART_BACKOFF_SECONDS = 1.0
+
+    def __init__(self, app, sock: socket.socket, args):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers = {}  # pid -> (index, started_at)
+        self.stopping = False
+
+    def spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(self.app, self.sock, self.args)
+            finally:
+                os._exit(0)
+        self.workers[pid] = (index, time.monotonic())
+        print(f"👷 Worker {index} started (pid {pid})")
+
+    def stop(self, signum, frame):
+        # A second signal skips the graceful shutdown
+        sig = signal.SIGKILL if self.stopping else signal.SIGTERM
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for index in range(self.args.workers):
+            self.spawn(index)
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index, started_at = self.workers.pop(pid, (None, 0))
+            if index is None:
+                continue
+            if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+                from prometheus_client import multiprocess
+                multiprocess.mark_process_dead(pid)
+            if self.stopping:
+                continue
+            print(f"⚠️ Worker {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            if time.monotonic() - started_at < 5:
+                time.sleep(self.RESTART_BACKOFF_SECONDS)
+            self.spawn(index)
+
+
+def memory_backends() -> list:
+    """Settings that keep sessions or job status in process memory (not visible to other workers)."""
+    return [
+        f"{name}=memory" for name in ("STATE_BACKEND", "JOB_STORE")
+        if os.getenv(name, "memory").lower() == "memory"
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork multi-worker server for the interviewer API.")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    # One worker per core only once sessions and jobs live in shared backends
+    default_workers = (os.cpu_count() or 1) if not memory_backends() else 1
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(default_workers))))
+    parser.add_argument("--keep-alive", type=int, default=60, help="keep-alive timeout (seconds)")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    parser.add_argument("--torch-threads", type=int, default=int(os.getenv("TORCH_THREADS_PER_WORKER", "0")),
+                        help="intra-op threads per worker (default: cores / workers)")
+    parser.add_argument("--no-preload-models", dest="preload_models", action="store_false",
+                        default=os.getenv("PRELOAD_MODELS", "true").lower() in ("1", "true", "yes"))
+    args = parser.parse_args()
+    args.workers = max(1, args.workers)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    metrics_dir = None
+    if args.workers > 1:
+        unshared = memory_backends()
+        if unshared:
+            # Per-worker sessions would spread one interview's turns over separate histories
+            sys.exit(f"❌ Several workers need shared state, not per-process memory ({', '.join(unshared)}): "
+                     "set STATE_BACKEND=mongo|redis and JOB_STORE=mongo, or run with WEB_CONCURRENCY=1")
+        if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            # Must be set before prometheus_client is imported so every worker writes its samples there
+            metrics_dir = tempfile.mkdtemp(prefix="zara-metrics-")
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+    sock = bind(args.host, args.port)
+    started = time.perf_counter()
+    app = preload(args.preload_models)
+    if args.workers > 1:
+        from app.services.vector_index import candidate_search
+        if candidate_search.index.backend == "local":
+            # The local index is an in-memory matrix per process: candidates indexed by
+            # one worker would stay invisible to the others' searches until a restart
+            sock.close()
+            sys.exit("❌ Several workers need a shared vector index: set DATABASE_URL to Postgres "
+                     "(pgvector, VECTOR_INDEX_BACKEND=auto|pgvector) or run with WEB_CONCURRENCY=1")
+    print(f"🚀 Preloaded in {time.perf_counter() - started:.1f}s; forking {args.workers} worker(s) "
+          f"on {args.host}:{args.port} (parent pid {os.getpid()})")
+    try:
+        Supervisor(app, sock, args).run()
+    finally:
+        sock.close()
+        if metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Copies the skill taxonomy (matcher and skills.json) from the MCP server,
+which owns it, into the backend. The backend image is built from backend/
+alone, so it ships a copy; run this after editing the MCP originals.
+
+    python sync_skill_taxonomy.py           # copy
+    python sync_skill_taxonomy.py --check   # exit 1 if the copies drifted
+"""
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(HERE, "..", "mcp-server", "tools")
+FILES = {
+    os.path.join(SOURCE, "skill_taxonomy.py"): os.path.join(HERE, "app", "services", "skill_taxonomy.py"),
+    os.path.join(SOURCE, "data", "skills.json"): os.path.join(HERE, "app", "services", "data", "skills.json"),
+}
+
+
+def drifted() -> list:
+    """Backend copies that differ from (or are missing next to) their MCP originals."""
+    return [copy for original, copy in FILES.items()
+            if not os.path.exists(copy) or not filecmp.cmp(original, copy, shallow=False)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the skill taxonomy from the MCP server into the backend.")
+    parser.add_argument("--check", action="store_true", help="only report drift (exit status 1)")
+    args = parser.parse_args()
+    if not os.path.isdir(SOURCE):
+        sys.exit(f"❌ MCP server sources not found at {os.path.normpath(SOURCE)}")
+    stale = drifted()
+    if args.check:
+        for path in stale:
+            print(f"❌ {os.path.relpath(path, HERE)} differs from the MCP server copy; run python sync_skill_taxonomy.py")
+        sys.exit(1 if stale else 0)
+    for original, copy in FILES.items():
+        os.makedirs(os.path.dirname(copy), exist_ok=True)
+        shutil.copyfile(original, copy)
+    print(f"✅ Synced {len(FILES)} files ({len(stale)} changed)")
+
+
+if __name__ == "__main__":
+    main()
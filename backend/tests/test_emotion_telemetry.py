@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from app.services.emotion_telemetry import EmotionTelemetry
+
+
+@pytest.fixture
+def telemetry():
+    return EmotionTelemetry(window_seconds=5.0, persist=False)
+
+
+def test_aggregate_downsamples_per_window_and_label(telemetry):
+    base = (time.time() // 5) * 5 - 60
+    telemetry.add("s", [base + 1, base + 2, base + 3, base + 6], ["Happy", "Happy", "Nervous", "Happy"], [0.2, 0.6, 0.5, 0.9])
+    windows = telemetry._aggregate(telemetry._buffers["s"])
+    assert windows == [
+        {"t": base, "labels": {
+            "Happy": {"n": 2, "min": 0.2, "mean": 0.4, "max": 0.6},
+            "Nervous": {"n": 1, "min": 0.5, "mean": 0.5, "max": 0.5},
+        }},
+        {"t": base + 5, "labels": {"Happy": {"n": 1, "min": 0.9, "mean": 0.9, "max": 0.9}}},
+    ]
+    assert len(telemetry._buffers["s"]) == 0
+
+
+def test_aggregate_keeps_windows_that_have_not_closed(telemetry):
+    base = (time.time() // 5) * 5 - 60
+    telemetry.add("s", [base + 1, base + 7], ["Focused", "Focused"], [0.5, 0.5])
+    buffer = telemetry._buffers["s"]
+    windows = telemetry._aggregate(buffer, cutoff=base + 5)
+    assert [w["t"] for w in windows] == [base]
+    assert len(buffer) == 1
+    assert telemetry._aggregate(buffer, cutoff=base + 5) == []
+    assert [w["t"] for w in telemetry._aggregate(buffer)] == [base + 5]
+
+
+def test_aggregate_without_consume_leaves_the_buffer(telemetry):
+    now = time.time()
+    telemetry.add("s", [now, now], ["Neutral", "Neutral"], [0.1, 0.3])
+    buffer = telemetry._buffers["s"]
+    assert telemetry._aggregate(buffer, consume=False) == telemetry._aggregate(buffer)
+    assert telemetry._aggregate(buffer) == []
+
+
+def test_invalid_samples_are_dropped(telemetry):
+    now = time.time()
+    accepted = telemetry.add(
+        "s",
+        [now, float("nan"), now + 1e6, now, now],
+        ["Happy", "Happy", "Happy", "Bored", "Happy"],
+        [0.5, 0.5, 0.5, 0.5, float("inf")],
+    )
+    assert accepted == 1
+    assert telemetry._buffers["s"].dropped == 4
@@ -0,0 +1,48 @@
+from app.services.ingestion import IngestJob
+
+
+def new_job() -> IngestJob:
+    return IngestJob("job", "/tmp/resumes.zip", "Engineer", "Tech", total=5)
+
+
+def test_watermark_advances_only_over_a_finished_prefix():
+    job = new_job()
+    job.complete(1, "inserted")
+    job.complete(2, "duplicates")
+    assert job.watermark == 0
+    assert job.to_doc()["counts"]["inserted"] == 0
+
+    job.complete(0, "failed", "bad.pdf: unreadable")
+    assert job.watermark == 3
+    assert job.to_doc()["counts"] == {"inserted": 1, "unindexed": 0, "duplicates": 1, "failed": 1, "skipped": 0}
+    assert job.errors == ["bad.pdf: unreadable"]
+
+
+def test_progress_counts_files_above_the_watermark():
+    job = new_job()
+    job.complete(0, "inserted")
+    job.complete(3, "unindexed")
+    progress = job.progress()
+    assert progress["processed"] == 2
+    assert progress["counts"]["unindexed"] == 1
+    assert job.to_doc()["counts"]["unindexed"] == 0
+
+
+def test_resumed_job_continues_from_its_checkpoint():
+    job = new_job()
+    for i in range(3):
+        job.complete(i, "inserted")
+    resumed = IngestJob.from_doc(job.to_doc())
+    assert resumed.watermark == 3
+    resumed.complete(4, "skipped")
+    resumed.complete(3, "inserted")
+    assert resumed.watermark == 5
+    assert resumed.to_doc()["counts"]["inserted"] == 4
+
+
+def test_errors_keep_the_last_twenty():
+    job = new_job()
+    for i in range(25):
+        job.complete(i, "failed", f"file {i}")
+    assert len(job.errors) == 20
+    assert job.errors[-1] == "file 24"
@@ -0,0 +1,40 @@
+from app.services.quiz_bank import QuizBank
+
+
+def item(skill: str, n: int, difficulty: str = "medium") -> dict:
+    return {"_id": f"{skill}-{n}", "question": f"{skill} question {n}?", "skill": skill, "difficulty": difficulty}
+
+
+def test_pick_spreads_questions_round_robin_over_skills():
+    pools = {skill: [item(skill, n) for n in range(10)] for skill in ("Python", "SQL", "Docker")}
+    picked = QuizBank.pick(pools, 9, "seed")
+    assert len(picked) == 9
+    assert {skill: sum(q["skill"] == skill for q in picked) for skill in pools} == {"Python": 3, "SQL": 3, "Docker": 3}
+
+
+def test_pick_is_deterministic_per_seed():
+    pools = {skill: [item(skill, n) for n in range(10)] for skill in ("Python", "SQL")}
+    assert QuizBank.pick(pools, 5, "candidate-a") == QuizBank.pick(pools, 5, "candidate-a")
+    draws = {tuple(q["question"] for q in QuizBank.pick(pools, 5, f"candidate-{i}")) for i in range(10)}
+    assert len(draws) > 1
+
+
+def test_pick_skips_duplicate_questions_and_drops_ids():
+    pools = {
+        "Python": [item("Python", 1), {"_id": "dup", "question": "python QUESTION 1", "skill": "Python"}],
+        "Django": [{"_id": "dup2", "question": "Python question 1?", "skill": "Django"}, item("Django", 2)],
+    }
+    picked = QuizBank.pick(pools, 10, "seed")
+    assert sorted(q["question"] for q in picked) == ["Django question 2?", "Python question 1?"]
+    assert all("_id" not in q for q in picked)
+
+
+def test_pick_orders_easy_to_hard_and_handles_short_pools():
+    pools = {
+        "Python": [item("Python", 1, "hard"), item("Python", 2, "easy")],
+        "SQL": [item("SQL", 1, "medium")],
+        "Go": [],
+    }
+    picked = QuizBank.pick(pools, 10, "seed")
+    assert [q["difficulty"] for q in picked] == ["easy", "medium", "hard"]
+    assert QuizBank.pick({}, 5, "seed") == []
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+import sync_skill_taxonomy
+from app.services.skill_taxonomy import default_taxonomy
+
+
+@pytest.mark.skipif(not os.path.isdir(sync_skill_taxonomy.SOURCE), reason="MCP server sources not available")
+def test_backend_copy_matches_the_mcp_server():
+    assert sync_skill_taxonomy.drifted() == []
+
+
+def test_short_aliases_need_a_token_boundary():
+    skills = default_taxonomy().extract("Go and C services, R for stats. Also wrote file.py and used Node.js at R&D.")
+    assert {"Golang", "C", "R Language", "Node.js"} <= set(skills)
+    assert "Python" not in skills
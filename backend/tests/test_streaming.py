@@ -0,0 +1,45 @@
+from app.services.streaming import JSONArrayParser
+
+
+def feed_all(chunks) -> list:
+    parser = JSONArrayParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+def test_objects_are_emitted_as_their_closing_brace_arrives():
+    parser = JSONArrayParser()
+    assert parser.feed('[{"q": 1}, {"q"') == [{"q": 1}]
+    assert parser.feed(': 2}') == [{"q": 2}]
+    assert parser.feed(']') == []
+
+
+def test_chunk_boundaries_do_not_matter():
+    text = '[{"question": "a", "options": ["x", "y"]}, {"question": "b", "nested": {"k": [1, 2]}}]'
+    whole = feed_all([text])
+    assert whole == [{"question": "a", "options": ["x", "y"]}, {"question": "b", "nested": {"k": [1, 2]}}]
+    assert feed_all(list(text)) == whole
+
+
+def test_prose_and_code_fences_around_the_array_are_ignored():
+    text = 'Here you go:\n```json\n[{"q": 1}]\n```\nThat is all {"q": 2}'
+    assert feed_all([text]) == [{"q": 1}]
+
+
+def test_brackets_and_escaped_quotes_inside_strings():
+    text = r'[{"q": "What does \"}]\" print? [x]"}, {"q": "{"}]'
+    assert feed_all(list(text)) == [{"q": 'What does "}]" print? [x]'}, {"q": "{"}]
+
+
+def test_malformed_element_is_skipped():
+    assert feed_all(['[{"q": 1}, {"q": nope}, {"q": 3}]']) == [{"q": 1}, {"q": 3}]
+
+
+def test_consumed_text_is_dropped_from_the_buffer():
+    parser = JSONArrayParser()
+    parser.feed('[' + '{"q": 1}, ' * 100)
+    assert len(parser.buffer) < 20
+    parser.feed('{"q": "unfinis')
+    assert parser.buffer.startswith('{"q"')
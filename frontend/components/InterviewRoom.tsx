@@ -8,6 +8,7 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle, CardFooter }
 import { Button } from "@/components/ui/button"
 import { Progress } from "@/components/ui/progress"
 import { FaceLandmarker, FilesetResolver } from "@mediapipe/tasks-vision"
+import { runJob } from "@/lib/jobs"
 
 export default function InterviewRoom({ role }: { role: string }) {
     // --- Anti-Cheat Logic ---
@@ -56,6 +57,41 @@ export default function InterviewRoom({ role }: { role: string }) {
     const [timeRemaining, setTimeRemaining] = useState(300) // 5 minutes in seconds
     const [timerActive, setTimerActive] = useState(false)
 
+    // Emotion samples (~4/s) buffered and sent to the backend in batches
+    const emotionSamplesRef = useRef<{ timestamps: number[], labels: string[], scores: number[] }>({ timestamps: [], labels: [], scores: [] })
+    const lastSampleRef = useRef(0)
+
+    const recordEmotion = (label: string, score: number) => {
+        setEmotion({ label, score });
+        const now = Date.now();
+        if (now - lastSampleRef.current < 250) return;
+        lastSampleRef.current = now;
+        const samples = emotionSamplesRef.current;
+        samples.timestamps.push(now / 1000);
+        samples.labels.push(label);
+        samples.scores.push(score);
+    }
+
+    const flushEmotions = () => {
+        const samples = emotionSamplesRef.current;
+        if (samples.timestamps.length === 0) return;
+        emotionSamplesRef.current = { timestamps: [], labels: [], scores: [] };
+        fetch("http://localhost:8000/api/emotions/batch", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ session_id: "test-session", ...samples }),
+            keepalive: true
+        }).catch(err => console.error("Emotion upload failed:", err));
+    }
+
+    useEffect(() => {
+        const timer = setInterval(flushEmotions, 2000);
+        return () => {
+            clearInterval(timer);
+            flushEmotions();
+        }
+    }, []);
+
     // MediaPipe Setup
     useEffect(() => {
         let faceLandmarker: FaceLandmarker;
@@ -93,10 +129,10 @@ export default function InterviewRoom({ role }: { role: string }) {
                         const browUp = shapes.find(s => s.categoryName === 'browInnerUp')?.score || 0;
                         const eyeSquint = shapes.find(s => s.categoryName === 'eyeSquintLeft')?.score || 0;
 
-                        if (browUp > 0.3) setEmotion({ label: "Nervous", score: browUp });
-                        else if (smile > 0.3) setEmotion({ label: "Happy", score: smile });
-                        else if (eyeSquint > 0.4) setEmotion({ label: "Focused", score: eyeSquint });
-                        else setEmotion({ label: "Neutral", score: Math.max(smile, browUp, eyeSquint) });
+                        if (browUp > 0.3) recordEmotion("Nervous", browUp);
+                        else if (smile > 0.3) recordEmotion("Happy", smile);
+                        else if (eyeSquint > 0.4) recordEmotion("Focused", eyeSquint);
+                        else recordEmotion("Neutral", Math.max(smile, browUp, eyeSquint));
                     }
                 }
             }
@@ -270,12 +306,13 @@ export default function InterviewRoom({ role }: { role: string }) {
     }
 
     // Helper function for TTS
-    const speakText = (text: string, onEndCallback?: () => void) => {
+    const speakText = (text: string, onEndCallback?: () => void, interrupt: boolean = true) => {
         if ('speechSynthesis' in window) {
             console.log("🔊 Starting TTS...");
 
             // CRITICAL: Cancel any ongoing speech to prevent double voices
-            window.speechSynthesis.cancel();
+            // (streamed sentences pass interrupt=false so they queue up instead)
+            if (interrupt) window.speechSynthesis.cancel();
 
             const utterance = new SpeechSynthesisUtterance(text);
 
@@ -322,7 +359,7 @@ export default function InterviewRoom({ role }: { role: string }) {
             const emotionScore = emotion ? emotion.score : 0.0;
             console.log("😊 Emotion:", emotionLabel, "(" + emotionScore + ")");
 
-            const res = await fetch("http://localhost:8000/api/interact", {
+            const res = await fetch("http://localhost:8000/api/interact/stream", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({
@@ -333,21 +370,60 @@ export default function InterviewRoom({ role }: { role: string }) {
                 })
             });
 
-            if (!res.ok) {
+            if (!res.ok || !res.body) {
                 console.error(`API Error: ${res.status} ${res.statusText}`);
                 throw new Error(`Server responded with ${res.status}`);
             }
 
-            const data = await res.json();
-            console.log("🤖 AI Response:", data.text);
-            addMessage("ai", data.text);
-
-            // Use speakText helper for consistent female voice
-            speakText(data.text, () => {
-                // Auto-restart listening after AI finishes
+            // Speak each sentence as soon as it arrives; restart the mic once
+            // the stream has finished and the last queued sentence was spoken.
+            let pendingSpeech = 0;
+            let streamDone = false;
+            const restartMic = () => {
                 console.log("⏳ Waiting 500ms then restarting mic...");
                 setTimeout(() => startInteraction(), 500);
-            });
+            };
+            const onSentenceSpoken = () => {
+                pendingSpeech--;
+                if (streamDone && pendingSpeech === 0) restartMic();
+            };
+
+            const reader = res.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = "";
+            let fullText = "";
+
+            while (!streamDone) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                let boundary: number;
+                while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+                    const rawEvent = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+
+                    const eventName = rawEvent.match(/^event: (.*)$/m)?.[1];
+                    const dataLine = rawEvent.match(/^data: (.*)$/m)?.[1];
+                    if (!eventName || dataLine === undefined) continue;
+                    const data = JSON.parse(dataLine);
+
+                    if (eventName === "sentence") {
+                        pendingSpeech++;
+                        speakText(data, onSentenceSpoken, false);
+                    } else if (eventName === "token") {
+                        fullText += data;
+                    } else if (eventName === "done" || eventName === "error") {
+                        streamDone = true;
+                        if (eventName === "done") fullText = data;
+                    }
+                }
+            }
+
+            streamDone = true;
+            console.log("🤖 AI Response:", fullText);
+            addMessage("ai", fullText || "I'm having trouble connecting to my brain. Please try again.");
+            if (pendingSpeech === 0) restartMic();
 
         } catch (err) {
             console.error("API Error", err);
@@ -396,10 +472,7 @@ export default function InterviewRoom({ role }: { role: string }) {
         stopMedia(); // Revoke access immediately
         setIsGeneratingReport(true);
         try {
-            const res = await fetch("http://localhost:8000/api/report/test-session", {
-                method: "POST"
-            });
-            const data = await res.json();
+            const data = await runJob("/api/report/test-session/jobs");
             const parsed = typeof data === 'string' ? JSON.parse(data) : data;
             setReport(parsed);
         } catch (err) {
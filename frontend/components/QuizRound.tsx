@@ -12,6 +12,8 @@ interface QuizQuestion {
     correct_index: number
 }
 
+const QUIZ_QUESTIONS = 10
+
 interface QuizRoundProps {
     domain: string
     resumeText: string
@@ -24,15 +26,19 @@ export default function QuizRound({ domain, resumeText, onComplete }: QuizRoundP
     const [selectedAnswers, setSelectedAnswers] = useState<number[]>([])
     const [loading, setLoading] = useState(true)
     const [showResults, setShowResults] = useState(false)
+    const [streaming, setStreaming] = useState(true) // more questions still arriving
 
     useEffect(() => {
         fetchQuiz()
     }, [])
 
+    // Questions stream in one by one (SSE); the quiz starts as soon as the first arrives
     const fetchQuiz = async () => {
+        let received = 0
         try {
             setLoading(true)
-            const res = await fetch("http://localhost:8000/api/generate-quiz", {
+            setStreaming(true)
+            const res = await fetch("http://localhost:8000/api/generate-quiz/stream", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({
@@ -40,16 +46,47 @@ export default function QuizRound({ domain, resumeText, onComplete }: QuizRoundP
                     resume_text: resumeText
                 })
             })
-
-            if (!res.ok) throw new Error("Failed to generate quiz")
-
-            const data = await res.json()
-            setQuestions(data.questions)
-            setSelectedAnswers(new Array(data.questions.length).fill(-1))
+            if (!res.ok || !res.body) throw new Error(`Server responded with ${res.status}`)
+
+            const reader = res.body.getReader()
+            const decoder = new TextDecoder()
+            let buffer = ""
+            let finished = false
+
+            while (!finished) {
+                const { value, done } = await reader.read()
+                if (done) break
+                buffer += decoder.decode(value, { stream: true })
+
+                let boundary: number
+                while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+                    const rawEvent = buffer.slice(0, boundary)
+                    buffer = buffer.slice(boundary + 2)
+
+                    const eventName = rawEvent.match(/^event: (.*)$/m)?.[1]
+                    const dataLine = rawEvent.match(/^data: (.*)$/m)?.[1]
+                    if (!eventName || dataLine === undefined) continue
+                    const data = JSON.parse(dataLine)
+
+                    if (eventName === "question") {
+                        received++
+                        setQuestions(prev => [...prev, data])
+                        setSelectedAnswers(prev => [...prev, -1])
+                        setLoading(false)
+                    } else if (eventName === "done") {
+                        finished = true
+                    } else if (eventName === "error") {
+                        finished = true
+                        if (received === 0) throw new Error(data)
+                    }
+                }
+            }
+            if (received === 0) throw new Error("No questions received")
         } catch (err) {
             console.error("Quiz generation error:", err)
             alert("Failed to generate quiz. Please try again.")
         } finally {
+            setStreaming(false)
             setLoading(false)
         }
     }
@@ -63,7 +100,7 @@ export default function QuizRound({ domain, resumeText, onComplete }: QuizRoundP
     const handleNext = () => {
         if (currentQuestion < questions.length - 1) {
             setCurrentQuestion(currentQuestion + 1)
-        } else {
+        } else if (!streaming) {
             calculateResults()
         }
     }
@@ -144,7 +181,10 @@ export default function QuizRound({ domain, resumeText, onComplete }: QuizRoundP
     }
 
     const currentQ = questions[currentQuestion]
-    const progress = ((currentQuestion + 1) / questions.length) * 100
+    if (!currentQ) return null
+    const totalQuestions = streaming ? Math.max(QUIZ_QUESTIONS, questions.length) : questions.length
+    const waitingForNext = streaming && currentQuestion === questions.length - 1
+    const progress = ((currentQuestion + 1) / totalQuestions) * 100
 
     return (
         <div className="min-h-screen bg-zinc-950 text-white flex flex-col">
@@ -158,7 +198,7 @@ export default function QuizRound({ domain, resumeText, onComplete }: QuizRoundP
                 <div className="flex items-center gap-2">
                     <Clock className="h-4 w-4 text-zinc-400" />
                     <span className="text-sm text-zinc-400">
-                        Question {currentQuestion + 1} of {questions.length}
+                        Question {currentQuestion + 1} of {totalQuestions}
                     </span>
                 </div>
             </header>
@@ -191,11 +231,11 @@ export default function QuizRound({ domain, resumeText, onComplete }: QuizRoundP
 
                         <Button
                             onClick={handleNext}
-                            disabled={selectedAnswers[currentQuestion] === -1}
+                            disabled={selectedAnswers[currentQuestion] === -1 || waitingForNext}
                             className="w-full mt-6"
                             size="lg"
                         >
-                            {currentQuestion < questions.length - 1 ? "Next Question" : "Submit Quiz"}
+                            {waitingForNext ? "Loading next question..." : currentQuestion < questions.length - 1 ? "Next Question" : "Submit Quiz"}
                         </Button>
                     </CardContent>
                 </Card>
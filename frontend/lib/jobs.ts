@@ -0,0 +1,26 @@
+const API_BASE = "http://localhost:8000"
+
+type JobStatus = {
+    job_id: string
+    status: "queued" | "running" | "succeeded" | "failed"
+    result?: any
+    error?: string
+}
+
+// Submits a background job and polls /api/jobs/{id} until it finishes.
+export async function runJob(path: string, init: RequestInit = {}, intervalMs = 1000, timeoutMs = 120000) {
+    const res = await fetch(`${API_BASE}${path}`, { method: "POST", ...init })
+    if (!res.ok) throw new Error(`Job submission failed (${res.status})`)
+    const { job_id } = await res.json()
+
+    const deadline = Date.now() + timeoutMs
+    while (Date.now() < deadline) {
+        const poll = await fetch(`${API_BASE}/api/jobs/${job_id}`)
+        if (!poll.ok) throw new Error(`Job lookup failed (${poll.status})`)
+        const job: JobStatus = await poll.json()
+        if (job.status === "succeeded") return job.result
+        if (job.status === "failed") throw new Error(job.error || "Job failed")
+        await new Promise(resolve => setTimeout(resolve, intervalMs))
+    }
+    throw new Error("Timed out waiting for job")
+}
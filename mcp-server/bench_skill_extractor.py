@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: skill extraction cost vs taxonomy size and resume length.
+
+Compares the old approach (lowercase the text and substring-check once per
+skill) with the Aho-Corasick SkillTaxonomy. The naive cost grows with the
+number of skills; the automaton stays flat and grows only with text length.
+
+    python bench_skill_extractor.py
+"""
+import random
+import string
+import time
+
+from tools.skill_taxonomy import SkillTaxonomy, default_taxonomy
+
+
+def naive_extract(skills: list, text: str) -> list:
+    return [skill for skill in skills if skill.lower() in text.lower()]
+
+
+def synthetic_taxonomy(size: int, rng: random.Random) -> dict:
+    real = dict(default_taxonomy().skills)
+    while len(real) < size:
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))).capitalize()
+        real[name] = [name.lower() + "js"]
+    return dict(list(real.items())[:size])
+
+
+def synthetic_resume(chars: int, skills: list, rng: random.Random) -> str:
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(skills) if rng.random() < 0.05 else "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def timeit(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'skills':>8} {'text chars':>10} {'naive ms':>10} {'automaton ms':>13} {'build ms':>9}")
+    for size in (100, 1000, 5000):
+        skills = synthetic_taxonomy(size, rng)
+        names = list(skills)
+        started = time.perf_counter()
+        taxonomy = SkillTaxonomy(skills)
+        build_ms = (time.perf_counter() - started) * 1000
+        for chars in (2000, 8000, 32000):
+            text = synthetic_resume(chars, names, rng)
+            naive_ms = timeit(lambda: naive_extract(names, text))
+            automaton_ms = timeit(lambda: taxonomy.extract(text))
+            print(f"{size:>8} {chars:>10} {naive_ms:>10.2f} {automaton_ms:>13.2f} {build_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
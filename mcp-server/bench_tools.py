@@ -0,0 +1,214 @@
+"""
+Offline benchmark for the MCP tools with tiny randomly initialised models.
+
+Builds small BERT stand-ins (NER head with the dslim/bert-base-NER labels,
+an NLI head for zero-shot classification, and a mean-pooled sentence
+embedder) in a temporary directory, so nothing is downloaded and runs are
+reproducible. Outputs are meaningless; the numbers measure our own code
+paths (chunking, batching, caching, post-processing) plus a small forward
+pass. Use --real to benchmark the production checkpoints instead.
+
+Benchmarks ResumeParser.parse, SkillMatcher.match (cold and cached) and
+ProficiencyScorer.assess (nli and embedding modes), and writes the results
+as JSON. Compare two runs with --baseline:
+
+    python bench_tools.py
+    python bench_tools.py --backend torch-int8 --iterations 50
+    python bench_tools.py --baseline bench_results/tools-1a2b3c4.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import tools.inference_backend as inference_backend
+from tools.inference_backend import BACKENDS
+
+RESUME = """Jane Doe
+Senior Backend Engineer, Berlin, Germany
+
+Experience
+Google, Munich - Staff Engineer (2019-2024)
+Led the migration of payment services to Kubernetes and Go; cut p99 latency by 40%.
+Built data pipelines with Apache Spark, Airflow and PostgreSQL.
+
+Amazon, Seattle - Software Engineer (2015-2019)
+Designed a distributed cache on Redis and mentored five engineers.
+
+Skills: Python, Go, Java, React, TypeScript, Docker, Terraform, AWS, GCP, machine learning.
+"""
+JOB = "Backend engineer with Python, Kubernetes and PostgreSQL experience to scale our payments platform."
+ANSWER = "I profiled the hot path, removed allocations and cut p99 latency by sixty percent."
+
+NER_LABELS = ["O", "B-MISC", "I-MISC", "B-PER", "I-PER", "B-ORG", "I-ORG", "B-LOC", "I-LOC"]
+NLI_LABELS = ["contradiction", "neutral", "entailment"]
+
+
+def build_tiny_models(root: str) -> dict:
+    """Saves tiny random NER / NLI / embedding models under root; returns their paths."""
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertForTokenClassification, BertModel, BertTokenizerFast
+    from sentence_transformers import SentenceTransformer, models
+
+    torch.manual_seed(0)
+    words = set(re.findall(r"[a-z]+", " ".join([RESUME, JOB, ANSWER]).lower()))
+    words |= {"this", "example", "is", "about", "beginner", "intermediate", "advanced", "expert", "proficient", "elementary", "upper"}
+    pieces = [chr(c) for c in range(33, 127)] + [f"##{chr(c)}" for c in range(33, 127)]
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *sorted(words), *pieces]
+    vocab_file = os.path.join(root, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(dict.fromkeys(vocab)))
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file, do_lower_case=True)
+
+    def config(**kwargs):
+        return BertConfig(
+            vocab_size=tokenizer.vocab_size, hidden_size=64, num_hidden_layers=2, num_attention_heads=2,
+            intermediate_size=128, max_position_embeddings=512, **kwargs
+        )
+
+    paths = {name: os.path.join(root, name) for name in ("ner", "nli", "embedding")}
+    BertForTokenClassification(config(
+        id2label=dict(enumerate(NER_LABELS)), label2id={l: i for i, l in enumerate(NER_LABELS)}
+    )).save_pretrained(paths["ner"])
+    BertForSequenceClassification(config(
+        id2label=dict(enumerate(NLI_LABELS)), label2id={l: i for i, l in enumerate(NLI_LABELS)}
+    )).save_pretrained(paths["nli"])
+    BertModel(config()).save_pretrained(paths["embedding"])
+    for path in paths.values():
+        tokenizer.save_pretrained(path)
+
+    transformer = models.Transformer(paths["embedding"], max_seq_length=256)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode="mean")
+    SentenceTransformer(modules=[transformer, pooling, models.Normalize()]).save(paths["embedding"])
+    return paths
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+        "min_ms": round(ordered[0] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def timed(fn, iterations: int, make_args=lambda i: ()) -> dict:
+    fn(*make_args(-1))  # warm-up
+    samples = []
+    for i in range(iterations):
+        args = make_args(i)
+        started = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(baseline: dict, current: dict):
+    """Prints the change in mean latency per benchmark (positive = slower)."""
+    print(f"\nvs baseline {baseline.get('commit')} ({baseline.get('timestamp')})")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name, {}).get("mean_ms")
+        if before:
+            change = (result["mean_ms"] - before) / before * 100
+            print(f"  {name:<36} {before:9.2f} -> {result['mean_ms']:9.2f} ms ({change:+.1f}%)")
+
+
+def bench(args, paths: dict) -> dict:
+    from tools.embedding_cache import EmbeddingCache
+    from tools.proficiency_scorer import ProficiencyScorer
+    from tools.resume_parser import ResumeParser
+    from tools.skill_matcher import SkillMatcher
+
+    results = {}
+    load = {}
+
+    started = time.perf_counter()
+    parser = ResumeParser(model_name=paths["ner"], backend=args.backend)
+    load["resume_parser"] = time.perf_counter() - started
+    results["resume_parser.parse"] = timed(parser.parse, args.iterations, lambda i: (RESUME,))
+    long_resume = RESUME * 12  # several NER windows
+    results["resume_parser.parse_long"] = timed(parser.parse, args.iterations, lambda i: (long_resume,))
+
+    started = time.perf_counter()
+    matcher = SkillMatcher(
+        model_name=paths["embedding"], backend=args.backend,
+        cache=EmbeddingCache(paths["embedding"], cache_dir=None, max_memory_entries=4096),
+    )
+    load["skill_matcher"] = time.perf_counter() - started
+    # Unique texts per call miss the embedding cache; repeated ones hit it
+    results["skill_matcher.match_cold"] = timed(matcher.match, args.iterations, lambda i: (f"{RESUME} #{i}", f"{JOB} #{i}"))
+    results["skill_matcher.match_cached"] = timed(matcher.match, args.iterations, lambda i: (RESUME, JOB))
+
+    started = time.perf_counter()
+    scorer = ProficiencyScorer(nli_model=paths["nli"], embedding_model=paths["embedding"], backend=args.backend)
+    load["proficiency_scorer"] = time.perf_counter() - started
+    for mode in ("nli", "embedding"):
+        results[f"proficiency_scorer.assess_{mode}"] = timed(
+            scorer.assess, args.iterations, lambda i, mode=mode: (f"{ANSWER} #{i}", "general", mode)
+        )
+
+    results["load"] = {name: round(seconds, 2) for name, seconds in load.items()}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MCP tool benchmark with tiny random models.")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--real", action="store_true", help="use the production checkpoints (downloads them)")
+    parser.add_argument("--output", help="results file (default bench_results/tools-<commit>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="zara-bench-") as root:
+        if args.real:
+            paths = {"ner": "dslim/bert-base-NER", "nli": "facebook/bart-large-mnli", "embedding": "all-MiniLM-L6-v2"}
+        else:
+            print("Building tiny random models...")
+            paths = build_tiny_models(root)
+            # Keep ONNX exports of the throwaway models out of the shared export dir
+            inference_backend.ONNX_MODEL_DIR = os.path.join(root, "onnx")
+        results = bench(args, paths)
+
+    load = results.pop("load")
+    report = {
+        "suite": "tools",
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "load_s": load,
+        "results": results,
+    }
+    for name, result in results.items():
+        print(f"{name:<36} mean {result['mean_ms']:9.2f} ms | p95 {result['p95_ms']:9.2f} ms | n={result['n']}")
+
+    output = args.output or os.path.join("bench_results", f"tools-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Export the MCP tool models to the quantized / ONNX Runtime backends and
+check their outputs against the PyTorch fp32 reference.
+
+For every tool and backend this reports load time, resident memory added by
+the model, mean latency over the sample inputs, and parity:
+- resume_parser:      entity (label, span) F1 vs fp32
+- skill_matcher:      mean / min cosine similarity of embeddings vs fp32
+- proficiency_scorer: top-label agreement and max score difference vs fp32
+
+    python convert_models.py                       # all tools, all backends
+    python convert_models.py --tools skill_matcher --backends onnx-int8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tools.inference_backend import BACKENDS, load_pipeline, load_sentence_transformer
+
+SAMPLES = [
+    "Jane Doe is a senior engineer at Google in Mountain View, working on Kubernetes and Go services.",
+    "Built data pipelines with Apache Spark and Airflow at Amazon, Seattle. Mentored five engineers.",
+    "I just started learning Python last month and can write simple scripts.",
+    "Led the migration of a monolith to microservices at Microsoft Dublin, cutting p99 latency by 40%.",
+    "Frontend developer from Berlin, React and TypeScript, previously at Zalando.",
+    "Designed a distributed cache and contributed patches upstream to Redis.",
+]
+PROFICIENCY_LABELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+TOOLS = {
+    "resume_parser": ("ner", "dslim/bert-base-NER", {"aggregation_strategy": "simple"}),
+    "skill_matcher": ("sentence-embedding", "all-MiniLM-L6-v2", {}),
+    "proficiency_scorer": ("zero-shot-classification", "facebook/bart-large-mnli", {}),
+}
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096 / 2**20
+
+
+def load(tool: str, backend: str):
+    task, model_id, kwargs = TOOLS[tool]
+    if task == "sentence-embedding":
+        return load_sentence_transformer(model_id, backend)
+    return load_pipeline(task, model_id, backend, **kwargs)
+
+
+def run(tool: str, model):
+    if tool == "resume_parser":
+        return [model(text) for text in SAMPLES]
+    if tool == "skill_matcher":
+        return model.encode(SAMPLES, convert_to_numpy=True, normalize_embeddings=True)
+    return [model(text, PROFICIENCY_LABELS) for text in SAMPLES]
+
+
+def parity(tool: str, reference, candidate) -> str:
+    if tool == "resume_parser":
+        ref = {(e["entity_group"], e["start"], e["end"]) for out in reference for e in out}
+        got = {(e["entity_group"], e["start"], e["end"]) for out in candidate for e in out}
+        overlap = len(ref & got)
+        f1 = 2 * overlap / (len(ref) + len(got)) if ref or got else 1.0
+        return f"entity F1 {f1:.3f}"
+    if tool == "skill_matcher":
+        cosine = np.sum(reference * candidate, axis=1)
+        return f"cosine mean {cosine.mean():.4f} min {cosine.min():.4f}"
+    agree = sum(r["labels"][0] == c["labels"][0] for r, c in zip(reference, candidate))
+    diff = max(
+        abs(dict(zip(r["labels"], r["scores"]))[label] - dict(zip(c["labels"], c["scores"]))[label])
+        for r, c in zip(reference, candidate) for label in PROFICIENCY_LABELS
+    )
+    return f"top-label agreement {agree}/{len(SAMPLES)}, max score diff {diff:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and parity-check MCP tool inference backends.")
+    parser.add_argument("--tools", nargs="+", default=list(TOOLS), choices=list(TOOLS))
+    parser.add_argument("--backends", nargs="+", default=[b for b in BACKENDS if b != "torch"], choices=BACKENDS)
+    args = parser.parse_args()
+
+    for tool in args.tools:
+        print(f"\n== {tool} ==")
+        reference = None
+        for backend in ["torch", *[b for b in args.backends if b != "torch"]]:
+            before = rss_mb()
+            started = time.perf_counter()
+            model = load(tool, backend)
+            load_s = time.perf_counter() - started
+            memory = rss_mb() - before
+
+            run(tool, model)  # warm-up
+            started = time.perf_counter()
+            outputs = run(tool, model)
+            latency_ms = (time.perf_counter() - started) * 1000 / len(SAMPLES)
+
+            if backend == "torch":
+                reference = outputs
+                check = "reference"
+            else:
+                check = parity(tool, reference, outputs)
+            print(f"{backend:>11}: load {load_s:6.1f}s | +{memory:7.1f} MB RSS | {latency_ms:7.1f} ms/text | {check}")
+            del model
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,184 @@
+import os
 from mcp.server.fastmcp import FastMCP
-from tools.resume_parser import ResumeParser
-from tools.skill_matcher import SkillMatcher
-from tools.proficiency_scorer import ProficiencyScorer
+from tools.model_registry import ModelRegistry
+from tools.batch_scheduler import MicroBatcher
+from tools.metrics import start_metrics_server, track_tool
+
+# Tool modules are imported inside the factories so that transformers /
+# sentence-transformers are only paid for when a tool is first needed.
+def _load_resume_parser():
+    from tools.resume_parser import ResumeParser
+    return ResumeParser()
+
+def _load_skill_matcher():
+    from tools.skill_matcher import SkillMatcher
+    return SkillMatcher()
+
+def _load_proficiency_scorer():
+    from tools.proficiency_scorer import ProficiencyScorer
+    return ProficiencyScorer()
 
 class ZaraMCPServer:
-    def __init__(self, name: str = "Zara Interview Tools"):
+    def __init__(self, name: str = "Zara Interview Tools", warmup: list[str] = None):
         self.mcp = FastMCP(name)
         
-        # Initialize Tools
-        # We initialize them here so they persist across calls
-        print("Initializing Zara Tools...")
-        self.resume_parser = ResumeParser()
-        self.skill_matcher = SkillMatcher()
-        self.proficiency_scorer = ProficiencyScorer()
-        print("Zara Tools Initialized.")
+        # Tools load on first use and persist across calls.
+        # ZARA_WARMUP_MODELS (comma-separated names, or "all") loads a subset
+        # concurrently in the background at startup.
+        self.models = ModelRegistry()
+        self.models.register("resume_parser", _load_resume_parser)
+        self.models.register("skill_matcher", _load_skill_matcher)
+        self.models.register("proficiency_scorer", _load_proficiency_scorer)
+
+        if warmup is None:
+            warmup = [n.strip() for n in os.getenv("ZARA_WARMUP_MODELS", "").split(",") if n.strip()]
+        if "all" in warmup:
+            warmup = list(self.models.models)
+        print(f"Warming up Zara Tools: {warmup or 'none (lazy loading)'}")
+        self.models.warm_up(warmup)
+
+        # One micro-batching scheduler per model: concurrent tool calls are
+        # grouped into a single forward pass run off the event loop.
+        # Knobs: BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_MAX_QUEUE.
+        self.schedulers = {
+            "resume_parser": MicroBatcher("resume_parser", self._parse_batch),
+            "skill_matcher": MicroBatcher("skill_matcher", self._match_batch),
+            "proficiency_scorer": MicroBatcher("proficiency_scorer", self._assess_batch),
+        }
 
         self.register_tools()
 
+    @property
+    def resume_parser(self):
+        return self.models.get("resume_parser")
+
+    @property
+    def skill_matcher(self):
+        return self.models.get("skill_matcher")
+
+    @property
+    def proficiency_scorer(self):
+        return self.models.get("proficiency_scorer")
+
     def register_tools(self):
-        """Register all tool capabilities."""
-        self.mcp.tool()(self.parse_resume)
-        self.mcp.tool()(self.match_skills)
-        self.mcp.tool()(self.assess_proficiency)
+        """Register all tool capabilities (each call is timed for /metrics)."""
+        for tool in (
+            self.parse_resume,
+            self.parse_resumes,
+            self.match_skills,
+            self.assess_proficiency,
+            self.assess_proficiency_many,
+            self.rank_candidates,
+            self.model_status,
+        ):
+            self.mcp.tool()(track_tool(tool.__name__, tool))
+
+    # Batch functions run on each scheduler's worker thread
+
+    @staticmethod
+    def _isolate(fn, items: list) -> list:
+        """
+        fn(items), or if that raises, fn on each item alone, so one bad
+        input fails only its own caller (its slot holds the exception).
+        """
+        try:
+            return fn(items)
+        except Exception:
+            if len(items) == 1:
+                raise
+        results = []
+        for item in items:
+            try:
+                results.append(fn([item])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _parse_batch(self, texts: list[str]) -> list:
+        return self._isolate(self.resume_parser.parse_many, texts)
+
+    def _match_batch(self, pairs: list[tuple[str, str]]) -> list:
+        return self._isolate(self.skill_matcher.match_pairs, pairs)
 
-    def parse_resume(self, file_content: str) -> dict:
+    def _assess_batch(self, items: list[tuple[str, str, str]]) -> list:
+        # Labels depend on domain/mode, so score each group in its own batch
+        groups = {}
+        for i, (text, domain, mode) in enumerate(items):
+            groups.setdefault((domain, mode), []).append(i)
+        results = [None] * len(items)
+        for (domain, mode), indices in groups.items():
+            try:
+                scored = self._isolate(
+                    lambda texts: self.proficiency_scorer.assess_many(texts, domain, mode),
+                    [items[i][0] for i in indices],
+                )
+            except Exception as e:
+                scored = [e] * len(indices)
+            for i, result in zip(indices, scored):
+                results[i] = result
+        return results
+
+    @staticmethod
+    def _check_mode(mode: str):
+        from tools.proficiency_scorer import MODES
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"Unknown proficiency mode: {mode} (expected one of {', '.join(MODES)})")
+
+    async def parse_resume(self, file_content: str) -> dict:
         """
         Parses a resume text to extract skills and experience using BERT NER.
         """
-        return self.resume_parser.parse(file_content)
+        return await self.schedulers["resume_parser"].submit(file_content)
 
-    def match_skills(self, candidate_text: str, job_description: str) -> dict:
+    async def parse_resumes(self, file_contents: list[str]) -> list[dict]:
+        """
+        Parses many resume texts at once, sharing NER batches across them.
+        """
+        return await self.schedulers["resume_parser"].run_direct(self._parse_batch, file_contents)
+
+    async def match_skills(self, candidate_text: str, job_description: str) -> dict:
         """
         Calculates match percentage and feedback between candidate and job description.
         """
-        return self.skill_matcher.match(candidate_text, job_description)
+        return await self.schedulers["skill_matcher"].submit((candidate_text, job_description))
+
+    async def rank_candidates(self, job_description: str, candidate_texts: list[str], top_k: int = 10) -> list[dict]:
+        """
+        Ranks many candidate texts against one job description and returns the top-k matches.
+        """
+        return await self.schedulers["skill_matcher"].run_direct(
+            lambda: self.skill_matcher.rank(job_description, candidate_texts, top_k)
+        )
 
-    def assess_proficiency(self, text: str, domain: str = "general") -> dict:
+    async def assess_proficiency(self, text: str, domain: str = "general", mode: str = None) -> dict:
         """
         Assesses proficiency level (Language or Technical) from text using Zero-Shot Classification.
+        mode: "nli" (bart-large-mnli, default) or "embedding" (fast prototype similarity).
+        """
+        self._check_mode(mode)
+        return await self.schedulers["proficiency_scorer"].submit((text, domain, mode))
+
+    async def assess_proficiency_many(self, texts: list[str], domain: str = "general", mode: str = None) -> list[dict]:
+        """
+        Assesses proficiency for many texts in one batched call.
+        """
+        self._check_mode(mode)
+        return await self.schedulers["proficiency_scorer"].run_direct(
+            lambda: self.proficiency_scorer.assess_many(texts, domain, mode)
+        )
+
+    def model_status(self) -> dict:
+        """
+        Reports per-model load state (not_loaded / loading / ready / failed), load time
+        and micro-batching statistics.
         """
-        return self.proficiency_scorer.assess(text, domain)
+        status = self.models.status()
+        for name, scheduler in self.schedulers.items():
+            status[name]["batching"] = scheduler.stats()
+        return status
 
     def run(self):
+        start_metrics_server()
         self.mcp.run()
 
 if __name__ == "__main__":
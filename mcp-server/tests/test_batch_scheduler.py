@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from tools.batch_scheduler import MicroBatcher, QueueFullError
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_submits_share_one_batch():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher("test", double, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(*[batcher.submit(i) for i in range(5)])
+
+    assert run(main()) == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_batches_are_capped_at_max_batch_size():
+    batcher = MicroBatcher("test", lambda items: items, max_batch_size=2, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(*[batcher.submit(i) for i in range(5)])
+
+    assert run(main()) == [0, 1, 2, 3, 4]
+    assert batcher.batches == 3
+
+
+def test_exception_result_fails_only_its_caller():
+    def check(items):
+        return [ValueError(f"bad {item}") if item < 0 else item for item in items]
+
+    batcher = MicroBatcher("test", check, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(-1), return_exceptions=True)
+
+    ok, failed = run(main())
+    assert ok == 1
+    assert isinstance(failed, ValueError) and str(failed) == "bad -1"
+
+
+def test_batch_failure_fails_every_caller():
+    def broken(items):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher("test", broken, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in run(main()))
+
+
+def test_full_queue_is_rejected():
+    batcher = MicroBatcher("test", lambda items: items, max_queue=1)
+
+    async def main():
+        batcher._ensure_worker()
+        batcher._queue.put_nowait((0, asyncio.get_running_loop().create_future(), 0.0))
+        with pytest.raises(QueueFullError):
+            await batcher.submit(1)
+        batcher._worker.cancel()
+
+    run(main())
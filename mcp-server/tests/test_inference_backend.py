@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pytest
+
+from tools.inference_backend import load_sentence_transformer, resolve_backend
+
+# Parity of the ONNX exports against the PyTorch fp32 reference, on the skill
+# matcher's embedding model (PARITY_EMBEDDING_MODEL overrides it).
+PARITY_MODEL = os.getenv("PARITY_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+SAMPLES = [
+    "Senior engineer working on Kubernetes and Go services.",
+    "Built data pipelines with Apache Spark and Airflow.",
+    "I just started learning Python last month.",
+    "Frontend developer, React and TypeScript.",
+]
+MIN_COSINE = {"onnx": 0.999, "onnx-int8": 0.97, "torch-int8": 0.97}
+
+
+def test_onnx_backends_are_opt_in(monkeypatch):
+    monkeypatch.delenv("ALLOW_ONNX_BACKENDS", raising=False)
+    monkeypatch.delenv("SKILL_MATCHER_BACKEND", raising=False)
+    with pytest.raises(ValueError, match="opt-in"):
+        resolve_backend("onnx")
+    with pytest.raises(ValueError, match="opt-in"):
+        monkeypatch.setenv("SKILL_MATCHER_BACKEND", "onnx-int8")
+        resolve_backend(None, "SKILL_MATCHER_BACKEND")
+    assert resolve_backend("torch-int8") == "torch-int8"
+
+    monkeypatch.setenv("ALLOW_ONNX_BACKENDS", "1")
+    assert resolve_backend("ONNX") == "onnx"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown inference backend"):
+        resolve_backend("tensorrt")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    try:
+        model = load_sentence_transformer(PARITY_MODEL, "torch")
+    except OSError as e:
+        pytest.skip(f"{PARITY_MODEL} is not available: {e}")
+    return model.encode(SAMPLES, convert_to_numpy=True, normalize_embeddings=True)
+
+
+@pytest.mark.parametrize("backend", ["torch-int8", "onnx", "onnx-int8"])
+def test_embedding_parity(backend, reference, tmp_path, monkeypatch):
+    if backend.startswith("onnx"):
+        pytest.importorskip("optimum.onnxruntime")
+        monkeypatch.setattr("tools.inference_backend.ONNX_MODEL_DIR", str(tmp_path))
+    model = load_sentence_transformer(PARITY_MODEL, backend)
+    got = model.encode(SAMPLES, convert_to_numpy=True, normalize_embeddings=True)
+    cosine = np.sum(reference * got, axis=1)
+    assert cosine.min() >= MIN_COSINE[backend], f"{backend} cosine to fp32: {cosine}"
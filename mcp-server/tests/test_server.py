@@ -0,0 +1,31 @@
+import pytest
+
+from server import ZaraMCPServer
+
+
+def parse_many(texts):
+    if any(text == "bad" for text in texts):
+        raise ValueError("cannot parse")
+    return [text.upper() for text in texts]
+
+
+def test_isolate_runs_the_batch_once_when_it_succeeds():
+    calls = []
+
+    def fn(items):
+        calls.append(items)
+        return parse_many(items)
+
+    assert ZaraMCPServer._isolate(fn, ["a", "b"]) == ["A", "B"]
+    assert calls == [["a", "b"]]
+
+
+def test_isolate_retries_items_alone_after_a_batch_failure():
+    results = ZaraMCPServer._isolate(parse_many, ["a", "bad", "c"])
+    assert results[0] == "A" and results[2] == "C"
+    assert isinstance(results[1], ValueError)
+
+
+def test_isolate_raises_for_a_single_failing_item():
+    with pytest.raises(ValueError):
+        ZaraMCPServer._isolate(parse_many, ["bad"])
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.metrics import BATCH_SIZE, INFERENCE_LATENCY, QUEUE_WAIT, batch_bucket
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a scheduler's queue is full; callers should back off and retry."""
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for one model for up to `max_wait_ms` (or
+    until `max_batch_size` are waiting), runs them as a single batched call
+    on the model's own worker thread, and fans the results back out.
+
+    batch_fn receives a list of items and must return one result per item;
+    an Exception in place of a result fails only that item's caller.
+    """
+    def __init__(self, name: str, batch_fn, max_batch_size: int = None, max_wait_ms: float = None, max_queue: int = None):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size or int(os.getenv("BATCH_MAX_SIZE", "16"))
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else float(os.getenv("BATCH_MAX_WAIT_MS", "5"))) / 1000
+        self.max_queue = max_queue or int(os.getenv("BATCH_MAX_QUEUE", "1024"))
+        # One thread per model: forward passes for a model never overlap, but
+        # different models run in parallel and the event loop stays free.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batch-{name}")
+        self._queue = None
+        self._worker = None
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue(maxsize=self.max_queue)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item):
+        """Queues one item and waits for its result."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.name} queue is full ({self.max_queue} pending); retry later")
+        return await future
+
+    async def run_direct(self, fn, *args):
+        """Runs an already-batched call on this model's worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _timed_batch(self, items: list):
+        started = time.perf_counter()
+        results = self.batch_fn(items)
+        INFERENCE_LATENCY.labels(self.name, batch_bucket(len(items))).observe(time.perf_counter() - started)
+        return results
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _, _ in batch]
+            dispatched = time.perf_counter()
+            for _, _, queued_at in batch:
+                QUEUE_WAIT.labels(self.name).observe(dispatched - queued_at)
+            BATCH_SIZE.labels(self.name).observe(len(items))
+            try:
+                results = await self.run_direct(self._timed_batch, items)
+                self.batches += 1
+                self.items += len(items)
+                for (_, future, _), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Embedding cache keyed by sha256(model name + normalized text).
+
+    Two tiers: an in-process LRU, and an optional on-disk store made of an
+    append-only float matrix (read through a memory map) plus an index file
+    with one key per row. The disk tier survives restarts of the MCP server.
+    Only one process should write to a given cache directory.
+    """
+    def __init__(self, model_name: str, cache_dir: str = None, max_memory_entries: int = 4096, dtype: str = "float32"):
+        self.model_name = model_name
+        self.max_memory_entries = max_memory_entries
+        self.dtype = np.dtype(dtype)
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.dir = None
+        self._rows = {}
+        self._dim = None
+        self._mmap = None
+        self._mapped_rows = 0
+        if cache_dir:
+            slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+            self.dir = os.path.join(os.path.expanduser(cache_dir), f"{slug}-{self.dtype.name}")
+            os.makedirs(self.dir, exist_ok=True)
+            self._load_index()
+
+    @classmethod
+    def from_env(cls, model_name: str):
+        return cls(
+            model_name,
+            cache_dir=os.getenv("EMBEDDING_CACHE_DIR", "~/.cache/zara/embeddings") or None,
+            max_memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "4096")),
+            dtype=os.getenv("EMBEDDING_CACHE_DTYPE", "float32"),
+        )
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.dir, "vectors.bin")
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.dir, "index.txt")
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.dir, "meta.json")
+
+    def key(self, text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{self.model_name}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        return max(len(self._rows), len(self._memory))
+
+    # --- Disk tier -----------------------------------------------------------
+
+    def _reset(self):
+        """Starts the disk tier over (unusable files would misnumber appended rows)."""
+        for path in (self._meta_path, self._index_path, self._vectors_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _load_index(self):
+        if not os.path.exists(self._meta_path):
+            return
+        try:
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+        except ValueError:
+            print(f"Embedding cache at {self.dir} has an unreadable meta.json; starting it over.")
+            self._reset()
+            return
+        if meta.get("model") != self.model_name or meta.get("dtype") != self.dtype.name:
+            print(f"Embedding cache at {self.dir} does not match {self.model_name}; starting it over.")
+            self._reset()
+            return
+        self._dim = meta["dim"]
+
+        # Either file may be missing or short after a partial write or a manual cleanup
+        keys = []
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                keys = f.read().split()
+        row_bytes = self._dim * self.dtype.itemsize
+        stored_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        # A crash between the two appends can leave them out of step; keep the common prefix
+        rows = min(len(keys), stored_rows)
+        if rows < len(keys) or rows < stored_rows or not os.path.exists(self._vectors_path):
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(rows * row_bytes)
+            with open(self._index_path, "w") as f:
+                f.write("".join(k + "\n" for k in keys[:rows]))
+        self._rows = {k: i for i, k in enumerate(keys[:rows])}
+        print(f"Embedding cache loaded {rows} vectors from {self.dir}")
+
+    def _read_row(self, row: int) -> np.ndarray:
+        if self._mmap is None or row >= self._mapped_rows:
+            # The file has grown since it was last mapped
+            self._mapped_rows = len(self._rows)
+            self._mmap = np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(self._mapped_rows, self._dim))
+        return np.asarray(self._mmap[row], dtype=np.float32)
+
+    def _append_rows(self, keys: list, vectors: np.ndarray):
+        if self._dim is None:
+            self._dim = int(vectors.shape[1])
+            with open(self._meta_path, "w") as f:
+                json.dump({"model": self.model_name, "dim": self._dim, "dtype": self.dtype.name}, f)
+        # Vectors first, then the index: a row only counts once its key is written
+        with open(self._vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        with open(self._index_path, "a") as f:
+            f.write("".join(k + "\n" for k in keys))
+        start = len(self._rows)
+        for offset, k in enumerate(keys):
+            self._rows[k] = start + offset
+
+    # --- Public API ----------------------------------------------------------
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            return vector
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        vector = self._read_row(row)
+        self._remember(key, vector)
+        return vector
+
+    def put_many(self, keys: list, vectors: np.ndarray):
+        new_keys, new_rows = [], []
+        for i, k in enumerate(keys):
+            self._remember(k, np.asarray(vectors[i], dtype=np.float32))
+            if self.dir and k not in self._rows and k not in new_keys:
+                new_keys.append(k)
+                new_rows.append(i)
+        if new_keys:
+            self._append_rows(new_keys, np.asarray(vectors)[new_rows])
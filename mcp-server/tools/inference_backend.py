@@ -0,0 +1,116 @@
+"""
+CPU inference backends shared by the MCP tools.
+
+- "torch":      PyTorch fp32 (original behaviour)
+- "torch-int8": PyTorch with dynamic int8 quantization of Linear layers
+- "onnx":       ONNX Runtime, exported from the Hugging Face checkpoint
+- "onnx-int8":  ONNX Runtime with a dynamically int8-quantized graph
+
+ONNX exports are written once to ONNX_MODEL_DIR and reused afterwards;
+`python convert_models.py` pre-builds them and checks parity against fp32.
+The ONNX backends are opt-in (ALLOW_ONNX_BACKENDS=1) until that check has
+been run on the deployment's models; tests/test_inference_backend.py runs
+the embedding parity check when optimum is installed.
+"""
+import os
+import re
+import shutil
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+ONNX_BACKENDS = ("onnx", "onnx-int8")
+
+ONNX_MODEL_DIR = os.path.expanduser(os.getenv("ONNX_MODEL_DIR", "~/.cache/zara/onnx"))
+
+_ORT_MODEL_CLASSES = {
+    "ner": "ORTModelForTokenClassification",
+    "zero-shot-classification": "ORTModelForSequenceClassification",
+}
+
+
+def resolve_backend(backend: str = None, env_var: str = None) -> str:
+    """Per-call value, then the tool's own env var, then INFERENCE_BACKEND."""
+    backend = (backend or (env_var and os.getenv(env_var)) or os.getenv("INFERENCE_BACKEND", "torch")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+    if backend in ONNX_BACKENDS and os.getenv("ALLOW_ONNX_BACKENDS", "0") != "1":
+        raise ValueError(f"Inference backend '{backend}' is opt-in: check parity with convert_models.py, "
+                         f"then set ALLOW_ONNX_BACKENDS=1")
+    return backend
+
+
+def export_dir(model_id: str, backend: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id)
+    return os.path.join(ONNX_MODEL_DIR, f"{slug}-{backend}")
+
+
+def quantize_torch(model):
+    """Dynamic int8 quantization of every nn.Linear (weights int8, activations quantized on the fly)."""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(task: str, model_id: str, backend: str) -> str:
+    """Exports (and for onnx-int8, quantizes) a transformers checkpoint; returns its directory."""
+    import optimum.onnxruntime as ort
+    from transformers import AutoTokenizer
+
+    target = export_dir(model_id, backend)
+    if os.path.exists(os.path.join(target, "config.json")):
+        return target
+
+    print(f"Exporting {model_id} to ONNX ({backend})...")
+    model = getattr(ort, _ORT_MODEL_CLASSES[task]).from_pretrained(model_id, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    if backend == "onnx-int8":
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        fp32_dir = export_dir(model_id, "onnx") + "-tmp"
+        model.save_pretrained(fp32_dir)
+        quantizer = ort.ORTQuantizer.from_pretrained(fp32_dir)
+        quantizer.quantize(save_dir=target, quantization_config=AutoQuantizationConfig.avx2(is_static=False))
+        shutil.rmtree(fp32_dir, ignore_errors=True)
+    else:
+        model.save_pretrained(target)
+    tokenizer.save_pretrained(target)
+    return target
+
+
+def load_pipeline(task: str, model_id: str, backend: str = "torch", **kwargs):
+    """Builds a transformers pipeline on the requested backend."""
+    from transformers import pipeline
+
+    if backend in ("torch", "torch-int8"):
+        pipe = pipeline(task, model=model_id, **kwargs)
+        if backend == "torch-int8":
+            pipe.model = quantize_torch(pipe.model)
+        return pipe
+
+    import optimum.onnxruntime as ort
+    from transformers import AutoTokenizer
+
+    path = export_onnx(task, model_id, backend)
+    file_name = "model_quantized.onnx" if backend == "onnx-int8" else "model.onnx"
+    model = getattr(ort, _ORT_MODEL_CLASSES[task]).from_pretrained(path, file_name=file_name)
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(path), **kwargs)
+
+
+def load_sentence_transformer(model_id: str, backend: str = "torch"):
+    """Builds a SentenceTransformer on the requested backend."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_id)
+    if backend == "torch-int8":
+        model = SentenceTransformer(model_id, device="cpu")
+        model[0].auto_model = quantize_torch(model[0].auto_model)
+        return model
+
+    target = export_dir(model_id, backend)
+    if not os.path.exists(os.path.join(target, "onnx", "model.onnx")):
+        print(f"Exporting {model_id} to ONNX ({backend})...")
+        model = SentenceTransformer(model_id, backend="onnx")
+        model.save_pretrained(target)
+        if backend == "onnx-int8":
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            export_dynamic_quantized_onnx_model(model, "avx2", target)
+    file_name = "onnx/model_qint8_avx2.onnx" if backend == "onnx-int8" else "onnx/model.onnx"
+    return SentenceTransformer(target, backend="onnx", model_kwargs={"file_name": file_name})
@@ -0,0 +1,69 @@
+"""
+Prometheus metrics for the MCP tools.
+
+The MCP transport is stdio, so metrics are served from a small side HTTP
+server when MCP_METRICS_PORT is set (e.g. 9464); otherwise they are only
+collected in-process.
+"""
+import functools
+import inspect
+import os
+import time
+
+from prometheus_client import Counter, Histogram, start_http_server
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+TOOL_CALLS = Counter("zara_mcp_tool_calls_total", "MCP tool calls", ["tool", "status"])
+TOOL_LATENCY = Histogram("zara_mcp_tool_seconds", "MCP tool call latency (including queueing)", ["tool"], buckets=LATENCY_BUCKETS)
+QUEUE_WAIT = Histogram("zara_mcp_queue_wait_seconds", "Time a request waited for its micro-batch", ["model"], buckets=LATENCY_BUCKETS)
+BATCH_SIZE = Histogram("zara_mcp_batch_size", "Items per model forward batch", ["model"], buckets=BATCH_BUCKETS)
+INFERENCE_LATENCY = Histogram("zara_mcp_inference_seconds", "Model inference time per batch",
+                              ["model", "batch_size"], buckets=LATENCY_BUCKETS)
+
+
+def batch_bucket(size: int) -> str:
+    """Coarse batch-size label, keeps the inference histogram's cardinality small."""
+    for limit in (1, 4, 16, 64):
+        if size <= limit:
+            return str(limit) if limit == 1 else f"<={limit}"
+    return ">64"
+
+
+def track_tool(name: str, fn):
+    """Wraps a tool (sync or async) to record its call count and latency."""
+    def record(started: float, status: str):
+        TOOL_LATENCY.labels(name).observe(time.perf_counter() - started)
+        TOOL_CALLS.labels(name, status).inc()
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception:
+                record(started, "error")
+                raise
+            record(started, "ok")
+            return result
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                record(started, "error")
+                raise
+            record(started, "ok")
+            return result
+    return wrapper
+
+
+def start_metrics_server(port: int = None):
+    port = port or int(os.getenv("MCP_METRICS_PORT", "0"))
+    if port:
+        start_http_server(port)
+        print(f"Metrics served on :{port}/metrics")
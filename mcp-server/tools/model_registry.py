@@ -0,0 +1,82 @@
+import threading
+import time
+
+
+class LazyModel:
+    """
+    A model (or tool wrapping one) that is built on first use.
+
+    Callers that arrive while the model is loading, whether in the background
+    or on another request, wait for that load instead of starting a second one.
+    """
+    def __init__(self, name: str, factory):
+        self.name = name
+        self.factory = factory
+        self.state = "not_loaded"
+        self.load_seconds = None
+        self.error = None
+        self._instance = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def _load(self):
+        started = time.perf_counter()
+        print(f"Loading {self.name}...")
+        try:
+            self._instance = self.factory()
+            self.state = "ready"
+            print(f"{self.name} ready in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            print(f"Failed to load {self.name}: {e}")
+        finally:
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            self._ready.set()
+
+    def _claim(self) -> bool:
+        """Marks the model as loading; returns False if someone else already did."""
+        with self._lock:
+            if self.state in ("not_loaded", "failed"):
+                self.state = "loading"
+                self.error = None
+                self._ready.clear()
+                return True
+            return False
+
+    def start_background(self):
+        if self._claim():
+            threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True).start()
+
+    def get(self, timeout: float = None):
+        if self._claim():
+            self._load()
+        elif not self._ready.wait(timeout):
+            raise TimeoutError(f"{self.name} is still loading")
+        if self.state != "ready":
+            raise RuntimeError(f"{self.name} failed to load: {self.error}")
+        return self._instance
+
+    def status(self) -> dict:
+        return {"state": self.state, "load_seconds": self.load_seconds, "error": self.error}
+
+
+class ModelRegistry:
+    """Named LazyModels with concurrent background warm-up and a status report."""
+    def __init__(self):
+        self.models = {}
+
+    def register(self, name: str, factory) -> LazyModel:
+        self.models[name] = LazyModel(name, factory)
+        return self.models[name]
+
+    def get(self, name: str, timeout: float = None):
+        return self.models[name].get(timeout)
+
+    def warm_up(self, names):
+        """Starts loading the given models concurrently without waiting for them."""
+        for name in names:
+            self.models[name].start_background()
+
+    def status(self) -> dict:
+        return {name: model.status() for name, model in self.models.items()}
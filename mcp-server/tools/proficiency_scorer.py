@@ -1,32 +1,167 @@
-from transformers import pipeline
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+from tools.inference_backend import load_pipeline, load_sentence_transformer, resolve_backend
+
+LANGUAGE_LABELS = ["A1 - Beginner", "A2 - Elementary", "B1 - Intermediate", "B2 - Upper Intermediate", "C1 - Advanced", "C2 - Proficient"]
+GENERAL_LABELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+MODES = ("nli", "embedding")
+
+# Prototype descriptions per level for the embedding mode. Each label is
+# represented by the mean embedding of its descriptions.
+LABEL_PROTOTYPES = {
+    "A1 - Beginner": ["I know a few words and very simple phrases.", "Me like go. I not understand much."],
+    "A2 - Elementary": ["I can talk about simple everyday things in short sentences.", "I go to work by bus every day and I like my job."],
+    "B1 - Intermediate": ["I can describe my experiences and give brief reasons for my opinions.", "Last year I worked on a project where we had to change our plans several times."],
+    "B2 - Upper Intermediate": ["I can discuss abstract topics fluently and explain the advantages and disadvantages of different options.", "Although the deadline was tight, we managed to deliver by reprioritising the backlog."],
+    "C1 - Advanced": ["I express ideas fluently and spontaneously, using language flexibly for professional purposes.", "Notwithstanding the initial setbacks, the initiative ultimately yielded considerable gains in efficiency."],
+    "C2 - Proficient": ["I understand virtually everything and express myself with precision and subtle nuance.", "The proposal's ostensible elegance belies a raft of latent trade-offs that merit scrutiny."],
+    "Beginner": ["I have just started learning this and only know the basics.", "I followed a tutorial once but I need help to build anything on my own."],
+    "Intermediate": ["I can build working features independently and understand the common tools.", "I have used this in a couple of projects and can debug typical problems."],
+    "Advanced": ["I design non-trivial systems, optimise performance and mentor others.", "I led the migration, profiled the hot paths and cut latency in half."],
+    "Expert": ["I have deep mastery, contribute to the ecosystem and make architecture decisions at scale.", "I authored the internals, reviewed the design across teams and spoke about it at conferences."],
+}
+
 
 class ProficiencyScorer:
     """
-    A class-based tool for assessing language or technical proficiency 
+    A class-based tool for assessing language or technical proficiency
     using Zero-Shot Classification.
+
+    Two modes, selectable per call:
+    - "nli": facebook/bart-large-mnli zero-shot (accurate, one forward pass per label)
+    - "embedding": cosine similarity to precomputed label prototypes with a
+      small sentence-embedding model (tens of milliseconds on CPU)
     """
-    def __init__(self):
-        print("Loading Zero-Shot Classification model...")
-        self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-        print("Classification model loaded.")
+    def __init__(self, mode: str = None, embedding_model: str = "all-MiniLM-L6-v2", cache_size: int = 4096, backend: str = None,
+                 nli_model: str = "facebook/bart-large-mnli"):
+        self.backend = resolve_backend(backend, "PROFICIENCY_BACKEND")
+        self.default_mode = mode or os.getenv("PROFICIENCY_MODE", "nli")
+        self.nli_model_name = nli_model
+        self.embedding_model_name = embedding_model
+        self._classifier = None
+        self._embedder = None
+        self._prototypes = {}
+
+        # Memoized results keyed by (mode, domain, text hash)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+
+        # Only the default mode's model is loaded up front; the other one on first use
+        if self.default_mode == "embedding":
+            self.embedder
+        else:
+            self.classifier
+
+    @staticmethod
+    def _labels(domain: str) -> list[str]:
+        return LANGUAGE_LABELS if domain == "language" else GENERAL_LABELS
+
+    @property
+    def classifier(self):
+        if self._classifier is None:
+            print(f"Loading Zero-Shot Classification model ({self.backend})...")
+            self._classifier = load_pipeline("zero-shot-classification", self.nli_model_name, self.backend)
+            print("Classification model loaded.")
+        return self._classifier
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            print("Loading proficiency embedding model...")
+            self._embedder = load_sentence_transformer(self.embedding_model_name, self.backend)
+        return self._embedder
+
+    def _label_prototypes(self, domain: str) -> np.ndarray:
+        """Unit-length prototype matrix (labels x dim), computed once per domain."""
+        labels = tuple(self._labels(domain))
+        if labels not in self._prototypes:
+            rows = []
+            for label in labels:
+                vectors = self.embedder.encode(LABEL_PROTOTYPES[label], convert_to_numpy=True, normalize_embeddings=True)
+                mean = vectors.mean(axis=0)
+                rows.append(mean / np.linalg.norm(mean))
+            self._prototypes[labels] = np.vstack(rows)
+        return self._prototypes[labels]
 
-    def assess(self, text: str, domain: str = "general") -> dict:
+    def _cache_key(self, text: str, domain: str, mode: str) -> str:
+        return f"{mode}:{domain}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def assess(self, text: str, domain: str = "general", mode: str = None) -> dict:
         """
         Classifies the text into proficiency levels.
         """
-        if domain == "language":
-            labels = ["A1 - Beginner", "A2 - Elementary", "B1 - Intermediate", "B2 - Upper Intermediate", "C1 - Advanced", "C2 - Proficient"]
-        else:
-            labels = ["Beginner", "Intermediate", "Advanced", "Expert"]
+        return self.assess_many([text], domain, mode)[0]
+
+    def assess_many(self, texts: list[str], domain: str = "general", mode: str = None, batch_size: int = 8) -> list[dict]:
+        """
+        Classifies many texts in one batched call, reusing memoized results.
+        """
+        mode = mode or self.default_mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown proficiency mode: {mode}")
+
+        keys = [self._cache_key(t, domain, mode) for t in texts]
+        results = [self._cache.get(k) for k in keys]
+        todo = {}
+        for i, result in enumerate(results):
+            if result is None:
+                todo.setdefault(keys[i], texts[i])
 
-        result = self.classifier(text, labels)
-        
+        if todo:
+            if mode == "embedding":
+                fresh = self._assess_embedding(list(todo.values()), domain, batch_size)
+            else:
+                fresh = self._assess_nli(list(todo.values()), domain, batch_size)
+            for key, result in zip(todo, fresh):
+                self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            by_key = dict(zip(todo, fresh))
+            results = [r if r is not None else by_key[k] for k, r in zip(keys, results)]
+
+        for key in keys:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+        # Callers get their own copies so mutating a result cannot corrupt the memo
+        return [self._copy(r) for r in results]
+
+    @staticmethod
+    def _copy(result: dict) -> dict:
+        return {**result, "all_scores": dict(result["all_scores"])}
+
+    def _assess_nli(self, texts: list[str], domain: str, batch_size: int) -> list[dict]:
+        labels = self._labels(domain)
+        outputs = self.classifier(texts, labels, batch_size=batch_size)
+        if isinstance(outputs, dict):
+            outputs = [outputs]
         # The result returns labels and scores sorted by confidence
-        top_label = result['labels'][0]
-        confidence = result['scores'][0]
+        return [self._format(result["labels"], result["scores"], "nli") for result in outputs]
+
+    def _assess_embedding(self, texts: list[str], domain: str, batch_size: int) -> list[dict]:
+        labels = self._labels(domain)
+        prototypes = self._label_prototypes(domain)
+        vectors = self.embedder.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+        # Softmax over scaled cosine similarities gives NLI-like confidences
+        logits = (vectors @ prototypes.T) * 20.0
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+        results = []
+        for row in probs:
+            order = np.argsort(-row)
+            results.append(self._format([labels[i] for i in order], [float(row[i]) for i in order], "embedding"))
+        return results
+
+    @staticmethod
+    def _format(labels: list[str], scores: list[float], mode: str) -> dict:
+        top_label = labels[0]
+        confidence = scores[0]
 
         return {
             "proficiency_level": top_label,
-            "confidence": round(confidence, 4),
-            "all_scores": dict(zip(result['labels'], result['scores']))
+            "confidence": round(float(confidence), 4),
+            "all_scores": {label: float(score) for label, score in zip(labels, scores)},
+            "mode": mode
         }
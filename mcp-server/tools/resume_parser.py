@@ -1,23 +1,100 @@
-from transformers import pipeline
+from tools.inference_backend import load_pipeline, resolve_backend
+from tools.skill_taxonomy import default_taxonomy
 
 class ResumeParser:
     """
     A class-based tool for parsing resumes using Hugging Face NER.
     """
-    def __init__(self):
+    def __init__(self, model_name: str = "dslim/bert-base-NER", max_chunk_tokens: int = 448, stride: int = 64, batch_size: int = 8, backend: str = None):
         # Initialize the NER pipeline
         # using a lightweight NER model for demonstration speed
         # For production, we would use a fine-tuned model on resumes
-        print("Loading NER model...")
-        self.ner_pipeline = pipeline("ner", model="dslim/bert-base-NER", aggregation_strategy="simple")
+        self.backend = resolve_backend(backend, "RESUME_PARSER_BACKEND")
+        print(f"Loading NER model ({self.backend})...")
+        self.ner_pipeline = load_pipeline("ner", model_name, self.backend, aggregation_strategy="simple")
         print("NER model loaded.")
+        # Skill taxonomy automaton is built once and shared
+        self.skill_taxonomy = default_taxonomy()
+
+        # Long resumes are split into overlapping token windows that fit BERT's
+        # 512-token limit (with headroom for re-tokenization at chunk edges)
+        self.max_chunk_tokens = max_chunk_tokens
+        self.stride = stride
+        self.batch_size = batch_size
 
     def parse(self, text: str) -> dict:
         """
         Extracts entities from the resume text.
         """
-        entities = self.ner_pipeline(text)
-        
+        return self.parse_many([text])[0]
+
+    def parse_many(self, texts: list[str]) -> list[dict]:
+        """
+        Parses many resumes, packing the chunks of all of them into shared
+        NER batches (useful for bulk imports).
+        """
+        return [self._structure(text, entities) for text, entities in zip(texts, self._extract_entities(texts))]
+
+    def _chunk(self, text: str) -> list[tuple[int, int, int, int]]:
+        """
+        Splits text into overlapping token windows.
+        Returns (char_start, char_end, own_start, own_end) per chunk, where the
+        "own" range is the part of the text this chunk is responsible for:
+        neighbouring chunks hand over in the middle of their overlap.
+        """
+        offsets = self.ner_pipeline.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+        )["offset_mapping"]
+        if len(offsets) <= self.max_chunk_tokens:
+            return [(0, len(text), 0, len(text))]
+
+        step = self.max_chunk_tokens - self.stride
+        windows = []
+        start = 0
+        while True:
+            end = min(start + self.max_chunk_tokens, len(offsets))
+            windows.append((start, end))
+            if end == len(offsets):
+                break
+            start += step
+
+        chunks = []
+        for i, (tok_start, tok_end) in enumerate(windows):
+            char_start = offsets[tok_start][0]
+            char_end = offsets[tok_end - 1][1]
+            own_start = 0 if i == 0 else offsets[(tok_start + windows[i - 1][1]) // 2][0]
+            own_end = len(text) if i == len(windows) - 1 else offsets[(windows[i + 1][0] + tok_end) // 2][0]
+            chunks.append((char_start, char_end, own_start, own_end))
+        return chunks
+
+    def _extract_entities(self, texts: list[str]) -> list[list[dict]]:
+        """
+        Runs NER over all chunks of all texts in batches and maps entity
+        offsets back onto the original texts.
+        """
+        jobs = []
+        for text_index, text in enumerate(texts):
+            for chunk in self._chunk(text):
+                jobs.append((text_index, chunk))
+
+        chunk_texts = [texts[i][start:end] for i, (start, end, _, _) in jobs]
+        outputs = self.ner_pipeline(chunk_texts, batch_size=self.batch_size) if chunk_texts else []
+
+        results = [[] for _ in texts]
+        for (text_index, (char_start, _, own_start, own_end)), entities in zip(jobs, outputs):
+            for entity in entities:
+                entity = dict(entity)
+                entity["start"] += char_start
+                entity["end"] += char_start
+                # Drop the copy of a seam entity that belongs to the neighbouring chunk
+                if own_start <= entity["start"] < own_end:
+                    results[text_index].append(entity)
+
+        for entities in results:
+            entities.sort(key=lambda e: e["start"])
+        return results
+
+    def _structure(self, text: str, entities: list[dict]) -> dict:
         # Structure the output
         structured_data = {
             "skills": [],
@@ -47,13 +124,8 @@ class ResumeParser:
         return structured_data
 
     def _extract_keyword_skills(self, text: str) -> list[str]:
-        # A basic list of tech keywords to look for
-        common_skills = [
-            "Python", "JavaScript", "React", "Next.js", "FastAPI", "PostgreSQL",
-            "Docker", "Kubernetes", "AWS", "TypeScript", "Java", "C++", "Machine Learning"
-        ]
-        found_skills = [skill for skill in common_skills if skill.lower() in text.lower()]
-        return list(set(found_skills))
+        # Single pass over the text, independent of taxonomy size; aliases map to canonical names
+        return self.skill_taxonomy.extract(text)
 
 def flow_entity(entity):
     # Helper to clean up numpy types for JSON serialization if needed
@@ -1,35 +1,107 @@
-from sentence_transformers import SentenceTransformer, util
-import torch
+import numpy as np
+from tools.embedding_cache import EmbeddingCache
+from tools.inference_backend import load_sentence_transformer, resolve_backend
 
 class SkillMatcher:
     """
-    A class-based tool for semantically matching candidate skills/resumes 
+    A class-based tool for semantically matching candidate skills/resumes
     against job descriptions using Sentence Transformers.
     """
-    def __init__(self):
-        print("Loading Embedding model...")
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', cache: EmbeddingCache = None, backend: str = None):
+        self.backend = resolve_backend(backend, "SKILL_MATCHER_BACKEND")
+        print(f"Loading Embedding model ({self.backend})...")
         # 'all-MiniLM-L6-v2' is fast and efficient for this
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model_name = model_name
+        self.model = load_sentence_transformer(model_name, self.backend)
+        # Quantized backends produce slightly different vectors, so they get their own cache entries
+        cache_name = model_name if self.backend == "torch" else f"{model_name}@{self.backend}"
+        self.cache = cache if cache is not None else EmbeddingCache.from_env(cache_name)
         print("Embedding model loaded.")
 
+    def embed(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Returns unit-length embeddings for texts, encoding only cache misses.
+        """
+        keys = [self.cache.key(t) for t in texts]
+        vectors = [self.cache.get(k) for k in keys]
+
+        # Encode each distinct missing text once, in batches
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], texts[i])
+        if missing:
+            encoded = self.model.encode(
+                list(missing.values()), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+            )
+            self.cache.put_many(list(missing.keys()), encoded)
+            fresh = dict(zip(missing.keys(), encoded))
+            vectors = [v if v is not None else fresh[k] for k, v in zip(keys, vectors)]
+
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
     def match(self, candidate_text: str, job_description: str) -> dict:
         """
         Computes the semantic similarity score between candidate and job.
         """
         # Compute embeddings
-        embeddings1 = self.model.encode(candidate_text, convert_to_tensor=True)
-        embeddings2 = self.model.encode(job_description, convert_to_tensor=True)
-
-        # Compute cosine-similarity
-        cosine_score = util.cos_sim(embeddings1, embeddings2)
-        
-        score = cosine_score.item() * 100 # Convert to percentage
-        
+        candidate_embedding, job_embedding = self.embed([candidate_text, job_description])
+
+        # Compute cosine-similarity (embeddings are unit-length)
+        score = float(candidate_embedding @ job_embedding) * 100 # Convert to percentage
+
         return {
             "match_percentage": round(score, 2),
             "feedback": self._generate_feedback(score)
         }
 
+    def match_pairs(self, pairs: list[tuple[str, str]], batch_size: int = 64) -> list[dict]:
+        """
+        Scores many (candidate_text, job_description) pairs with one embedding pass.
+        """
+        if not pairs:
+            return []
+        embeddings = self.embed([text for pair in pairs for text in pair], batch_size=batch_size)
+        scores = np.sum(embeddings[0::2] * embeddings[1::2], axis=1) * 100
+        return [
+            {"match_percentage": round(float(score), 2), "feedback": self._generate_feedback(float(score))}
+            for score in scores
+        ]
+
+    def rank(self, job_description: str, candidate_texts: list[str], top_k: int = 10, batch_size: int = 64) -> list[dict]:
+        """
+        Ranks many candidates against one job description.
+        The job is encoded once, candidates are encoded in batches, and all
+        scores come from a single cosine-similarity matrix multiply.
+        """
+        if not candidate_texts:
+            return []
+
+        job_embedding = self.embed([job_description])[0]
+        candidate_embeddings = self.embed(candidate_texts, batch_size=batch_size)
+
+        # Embeddings are unit-length, so the dot product is the cosine similarity
+        scores = (candidate_embeddings @ job_embedding) * 100
+        k = min(top_k, len(scores)) if top_k else len(scores)
+        top_indices = np.argpartition(-scores, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+
+        return [
+            {
+                "index": int(index),
+                "match_percentage": round(float(scores[index]), 2),
+                "feedback": self._generate_feedback(float(scores[index]))
+            }
+            for index in top_indices
+        ]
+
+    def match_many(self, candidate_texts: list[str], job_description: str, batch_size: int = 64) -> list[dict]:
+        """
+        Scores every candidate against the job, in input order.
+        """
+        ranked = self.rank(job_description, candidate_texts, top_k=None, batch_size=batch_size)
+        return sorted(ranked, key=lambda r: r["index"])
+
     def _generate_feedback(self, score: float) -> str:
         if score > 80:
             return "Excellent Match: Candidate profile strongly aligns with job requirements."